@@ -1,16 +1,287 @@
+from diskinfo.startup import StartupTimer
+
+startup_timer = StartupTimer()  # Created before the imports below so they are included
+
 import customtkinter as ctk
-import win32com.client
-import psutil
 import os
 import json
 import time
-from PIL import Image
+import queue
+from functools import partial
+
+# Only what the first page needs is imported here; the benchmark, batch,
+# history and psutil imports happen on first use.
+from diskinfo.cache import TOPOLOGY, USAGE, DataCache, MountWatcher
+from diskinfo.collector import DRIVES, HEALTH, PARTITIONS, Collector, collect_health
+from diskinfo.smart import KEY_ATTRIBUTES
+from diskinfo.smarthistory import SMART_HISTORY_FILE_NAME, SmartHistory
+from diskinfo.table import Column, TableModel, at_least, contains, equals
+from diskinfo.iomonitor import (
+    BUSY_PCT,
+    LATENCY_MS,
+    READ_IOPS,
+    READ_MB_S,
+    WRITE_IOPS,
+    WRITE_MB_S,
+)
+
+startup_timer.mark("imports")
 
 # Set appearance mode and default theme
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
 CONFIG_FILE = "diskinfo_config.json"
+HISTORY_DIR = os.path.dirname(os.path.abspath(CONFIG_FILE))
+HISTORY_CHART_RUNS = 30
+MOUNT_POLL_MS = 2000
+COLLECTOR_POLL_MS = 100
+BENCHMARK_POLL_MS = 100
+ALERT_START_MS = 10000  # Let startup finish before the alert monitor's first checks
+ALERT_POLL_MS = 1000
+ALERT_TOAST_MS = 8000
+ALERT_LOG_FILE = "diskinfo_alerts.ndjson"
+FLEET_POLL_MS = 200
+SPACE_POLL_MS = 500
+SPACE_TREEMAP_ITEMS = 40
+DUPLICATES_POLL_MS = 200
+SPACE_COLORS = ["#3498db", "#e67e22", "#2ecc71", "#9b59b6", "#e74c3c", "#1abc9c", "#f1c40f", "#34495e"]
+FLEET_TRANSPORTS = {"HTTP agents": "http", "Remote WMI": "wmi"}
+FLEET_SORTS = {"Fullest volume": "fullest", "Worst health": "health", "Slowest benchmark": "slowest"}
+EXPORT_PAGES = {  # Page -> (diskinfo.export kind, collector snapshot it is built from)
+    "drive_info": ("volumes", DRIVES),
+    "health": ("health", HEALTH),
+    "partitions": ("partitions", PARTITIONS),
+}
+ALERT_COLORS = {"ok": "#2ecc71", "warning": "#e67e22", "critical": "#e74c3c"}
+MONITOR_INTERVALS = {"100 ms": 0.1, "250 ms": 0.25, "500 ms": 0.5, "1 s": 1.0, "2 s": 2.0}
+MONITOR_CHARTS = [
+    ("Throughput (MB/s)", (READ_MB_S, WRITE_MB_S)),
+    ("IOPS", (READ_IOPS, WRITE_IOPS)),
+    ("Average latency (ms)", (LATENCY_MS,)),
+    ("Busy time (%)", (BUSY_PCT,)),
+]
+MONITOR_COLORS = {
+    READ_MB_S: "#3498db", WRITE_MB_S: "#e67e22",
+    READ_IOPS: "#3498db", WRITE_IOPS: "#e67e22",
+    LATENCY_MS: "#9b59b6", BUSY_PCT: "#2ecc71",
+}
+BENCHMARK_FILE_SIZES_MB = {"64 MB": 64, "256 MB": 256, "1 GB": 1024, "4 GB": 4096}
+BENCHMARK_ITERATIONS = ["1", "3", "5"]
+ALL_PROFILES = "All profiles"
+BENCHMARK_MODES = {  # Label -> diskinfo.benchmark.IO_PRESETS key
+    "Direct I/O": "direct",
+    "Buffered, drop cache": "buffered",
+    "Buffered, file > RAM": "oversize",
+    "Buffered (cached)": "cached",
+}
+
+class InfoCard(ctk.CTkFrame):
+    """Title/content card with an optional usage bar, updated in place with show()."""
+
+    def __init__(self, parent):
+        super().__init__(parent, corner_radius=6)
+        self.title_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=16, weight="bold"))
+        self.title_label.pack(padx=15, pady=(15, 5), anchor="w")
+        self.content_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=13))
+        self.content_label.pack(padx=15, pady=(0, 15), anchor="w")
+        self.progress = None
+        self.action_button = None
+        self._state = None
+
+    def show(self, title, content, progress_value=None, action=None):
+        """`action` is an optional (label, command) button shown beside the title."""
+        state = (title, content, progress_value, action[0] if action else None)
+        if state == self._state:
+            return
+        self._state = state
+        self.title_label.configure(text=title)
+        self.content_label.configure(text=content)
+        if action is not None:
+            if self.action_button is None:
+                self.action_button = ctk.CTkButton(self, width=120, height=26)
+                self.action_button.place(relx=1.0, x=-15, y=15, anchor="ne")
+            self.action_button.configure(text=action[0], command=action[1])
+        elif self.action_button is not None:
+            self.action_button.destroy()
+            self.action_button = None
+        if progress_value is None:
+            if self.progress is not None:
+                self.progress.pack_forget()
+            return
+        if self.progress is None:
+            self.progress = ctk.CTkProgressBar(self, height=10)
+        if not self.progress.winfo_manager():
+            self.progress.pack(padx=15, pady=(0, 15), fill="x")
+        self.progress.set(progress_value / 100)
+
+
+class CardPage:
+    """Header, status line and keyed InfoCards of one page, built once.
+
+    sync() takes the full list of (key, title, content, progress[, action]) items:
+    cards are created only for new keys, destroyed only for vanished ones
+    and otherwise reconfigured, so a refresh touches only what changed.
+    """
+
+    def __init__(self, frame, title):
+        self.frame = frame
+        self.header = ctk.CTkLabel(frame, text=title, font=ctk.CTkFont(size=24, weight="bold"))
+        self.header.pack(pady=20)
+        self.status_label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=14))
+        self._status_color = self.status_label.cget("text_color")
+        self.cards = {}
+        self._order = []
+
+    def set_status(self, text, error=False):
+        self.status_label.configure(text=text, text_color="red" if error else self._status_color)
+        if not self.status_label.winfo_manager():
+            self.status_label.pack(pady=20, after=self.header)
+
+    def clear_status(self):
+        self.status_label.pack_forget()
+
+    def sync(self, items):
+        keys = [item[0] for item in items]
+        for key in set(self.cards) - set(keys):
+            self.cards.pop(key).destroy()
+        for key, title, content, progress_value, *action in items:
+            card = self.cards.get(key)
+            if card is None:
+                card = self.cards[key] = InfoCard(self.frame)
+            card.show(title, content, progress_value, *action)
+        if keys != self._order:
+            for key in keys:
+                self.cards[key].pack_forget()
+            for key in keys:
+                self.cards[key].pack(fill="x", padx=20, pady=10)
+            self._order = keys
+
+
+class VirtualTable(ctk.CTkFrame):
+    """Table over a TableModel that only creates widgets for the rows on screen.
+
+    A pool of row widgets, one per visible line, is reused while scrolling:
+    moving the view just reconfigures the pooled labels with the rows now in
+    view. Clicking a column header sorts the model.
+    """
+
+    def __init__(self, parent, model, row_height=28, **kwargs):
+        super().__init__(parent, corner_radius=0, fg_color=("white", "gray10"), **kwargs)
+        self.model = model
+        self.row_height = row_height
+        self.top = 0
+        self._visible = 0
+        self._pool = []  # (frame, labels) per visible line
+        self._shown = []  # Texts each pooled row currently displays
+
+        header = ctk.CTkFrame(self, corner_radius=0, fg_color=("gray90", "gray20"))
+        header.pack(fill="x")
+        self.header_buttons = {}
+        for column in model.columns:
+            button = ctk.CTkButton(
+                header,
+                text=column.title,
+                width=column.width,
+                fg_color="transparent",
+                hover_color=("gray80", "gray30"),
+                text_color=("gray10", "gray90"),
+                font=ctk.CTkFont(size=12, weight="bold"),
+                command=lambda key=column.key: self.sort(key)
+            )
+            button.pack(side="left", padx=5, pady=5)
+            self.header_buttons[column.key] = button
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+    def sort(self, key):
+        self.model.sort(key)
+        for column in self.model.columns:
+            arrow = ""
+            if column.key == self.model.sort_key:
+                arrow = " ▼" if self.model.descending else " ▲"
+            self.header_buttons[column.key].configure(text=column.title + arrow)
+        self.refresh()
+
+    def refresh(self):
+        """Redraw after the model's rows, sort order or filters changed."""
+        self.top = max(0, min(self.top, len(self.model) - self._visible))
+        self._render()
+
+    def _make_row(self):
+        frame = ctk.CTkFrame(self.body, corner_radius=0, height=self.row_height, fg_color="transparent")
+        frame.pack_propagate(False)
+        labels = []
+        for column in self.model.columns:
+            label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=12), width=column.width)
+            label.pack(side="left", padx=5)
+            self._bind_wheel(label)
+            labels.append(label)
+        self._bind_wheel(frame)
+        self._pool.append((frame, labels))
+        self._shown.append(None)
+
+    def _render(self):
+        total = len(self.model)
+        for slot, (frame, labels) in enumerate(self._pool):
+            index = self.top + slot
+            if slot >= self._visible or index >= total:
+                if self._shown[slot] is not None:
+                    frame.place_forget()
+                    self._shown[slot] = None
+                continue
+            row = self.model[index]
+            texts = tuple(
+                column.format(row.get(column.key)) if row.get(column.key) is not None else ""
+                for column in self.model.columns
+            )
+            if texts != self._shown[slot]:
+                for label, text in zip(labels, texts):
+                    label.configure(text=text)
+                if self._shown[slot] is None:
+                    frame.place(x=0, y=slot * self.row_height, relwidth=1)
+                self._shown[slot] = texts
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self._visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, len(self.model) - self._visible))
+        if top != self.top:
+            self.top = top
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.model)))
+        else:
+            step = self._visible if unit == "pages" else 1
+            self._scroll_to(self.top + int(float(amount)) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self._scroll_to(self.top - 3)
+        else:
+            self._scroll_to(self.top + 3)
+
+    def _bind_wheel(self, widget):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            widget.bind(sequence, self._on_wheel)
+
+    def _on_resize(self, event):
+        # event.height is in screen pixels, row_height in unscaled CTk units
+        row_pixels = max(1, round(self.row_height * self._get_widget_scaling()))
+        self._visible = max(1, event.height // row_pixels)
+        while len(self._pool) < self._visible:
+            self._make_row()
+        self.refresh()
+
 
 class DiskInfoApp(ctk.CTk):
     def __init__(self):
@@ -19,9 +290,27 @@ class DiskInfoApp(ctk.CTk):
         self._init_variables()
         self._create_sidebar()
         self._create_main_frame()
-        self.show_drive_info()  # Show drive info by default
+        startup_timer.mark("window")
+        self.collector.start()
+        self.collector.request(DRIVES)  # Collect while the window shell paints
+        self.after_idle(self._first_paint)
+        self.after(COLLECTOR_POLL_MS, self._poll_collector)
+        self.after(MOUNT_POLL_MS, self._watch_mounts)
+        self.after(ALERT_START_MS, self._start_alerts)
 
     # Initialization methods
+    def _first_paint(self):
+        """Runs once the empty window has been drawn; fills in the default page."""
+        startup_timer.mark("first_paint")
+        self.show_drive_info()  # Show drive info by default
+
+    def _report_startup(self):
+        print(f"DEBUG: Startup timing: {startup_timer.report()}")
+        try:
+            startup_timer.save()
+        except OSError as e:
+            print(f"DEBUG: Error saving startup timing: {e}")
+
     def _init_window(self):
         self.title("💻 Drive Info Viewer")
         self.geometry("1200x800")
@@ -29,9 +318,33 @@ class DiskInfoApp(ctk.CTk):
 
     def _init_variables(self):
         self.drive_data = {}
-        self.partition_data_cache = None
-        self.partition_cache_time = 0
+        self.benchmark_worker = None
+        self.benchmark_history = None
+        self.io_monitor = None
+        self.monitor_tick = None
+        self.cache = DataCache()
+        self.mount_watcher = MountWatcher()
+        self.smart_history = SmartHistory(os.path.join(HISTORY_DIR, SMART_HISTORY_FILE_NAME))
+        self.collector = Collector(self.cache, sources={
+            HEALTH: partial(collect_health, history=self.smart_history),
+        })
+        self.snapshots = {}  # Last plain-data snapshot per collector kind
+        self.alert_monitor = None
+        self.alert_events = queue.Queue()
+        self.alert_toast = None
+        self.fleet = None
+        self.fleet_key = None  # (transport, hosts) the current Fleet was built for
+        self.fleet_results = None
+        self.fleet_events = queue.Queue()
+        self.duplicate_finder = None
+        self.duplicate_events = queue.Queue()
+        self.space_scanner = None
+        self.space_node = 0  # Directory the treemap shows
+        self.space_rects = []  # (x0, y0, x1, y1, node or None) of the drawn treemap
+        self.snapshot_errors = {}
+        self.current_page = None
         self.frames = {}
+        self.card_pages = {}  # Pages built once and updated in place
 
     def _create_sidebar(self):
         self.sidebar = ctk.CTkFrame(self, width=200, corner_radius=0)
@@ -52,7 +365,10 @@ class DiskInfoApp(ctk.CTk):
             ("🔄 Drive Info", self.show_drive_info),
             ("📊 Health Status", self.show_health),
             ("🗂️ Partitions", self.show_partitions),
+            ("🧬 Duplicates", self.show_duplicates),
             ("⚡ Benchmark", self.show_benchmark),
+            ("📈 Disk Activity", self.show_monitor),
+            ("🌐 Fleet", self.show_fleet),
             ("ℹ️ About", self.show_about)  # Add new About navigation item
         ]
 
@@ -71,6 +387,20 @@ class DiskInfoApp(ctk.CTk):
             btn.pack(pady=5, padx=20, fill="x")
             self.nav_buttons.append(btn)
 
+        # Exports whatever the current page shows; not a page of its own
+        self.export_button = ctk.CTkButton(
+            self.sidebar,
+            text="💾 Export Data",
+            command=self.export_snapshot,
+            height=40,
+            corner_radius=6,
+            fg_color="transparent",
+            text_color=("gray10", "gray90"),
+            hover_color=("gray70", "gray30"),
+            anchor="w"
+        )
+        self.export_button.pack(pady=(20, 5), padx=20, fill="x")
+
         # Theme switcher
         self._create_theme_switcher()
 
@@ -93,28 +423,32 @@ class DiskInfoApp(ctk.CTk):
         self.main_frame = ctk.CTkFrame(self, corner_radius=0)
         self.main_frame.pack(side="right", fill="both", expand=True)
 
-        # Create frames for different views
-        for frame_name in ["drive_info", "health", "partitions", "benchmark", "about"]:  # Add about frame
-            frame = ctk.CTkScrollableFrame(
+    def page_frame(self, frame_name):
+        """The frame of one page, created the first time the page is visited."""
+        frame = self.frames.get(frame_name)
+        if frame is None:
+            # These pages scroll (or don't) on their own instead of through the whole frame
+            frame_class = (ctk.CTkFrame if frame_name in ("partitions", "duplicates", "monitor", "fleet", "space")
+                           else ctk.CTkScrollableFrame)
+            frame = self.frames[frame_name] = frame_class(
                 self.main_frame,
                 corner_radius=0
             )
-            frame.pack(fill="both", expand=True)
-            frame.pack_forget()  # Hide initially
-            self.frames[frame_name] = frame
+        return frame
 
     # Add new method for About page
     def show_about(self):
         """Show about page with app information."""
         print("DEBUG: Showing about page")
-        self.clear_frame("about")
-        self.update_about_info()
+        if "about" not in self.card_pages:  # Static content, built on first visit only
+            self.update_about_info()
+            self.card_pages["about"] = None
         self.show_frame("about")
-        self.highlight_nav_button(4)  # Update index for the new button
+        self.highlight_nav_button(7)
 
     def update_about_info(self):
         """Update about page information."""
-        frame = self.frames["about"]
+        frame = self.page_frame("about")
 
         # App title and version
         header = ctk.CTkLabel(
@@ -249,10 +583,11 @@ class DiskInfoApp(ctk.CTk):
     def show_frame(self, frame_name):
         for frame in self.frames.values():
             frame.pack_forget()
-        self.frames[frame_name].pack(fill="both", expand=True)
+        self.page_frame(frame_name).pack(fill="both", expand=True)
+        self.current_page = frame_name
 
     def clear_frame(self, frame_name):
-        for widget in self.frames[frame_name].winfo_children():
+        for widget in self.page_frame(frame_name).winfo_children():
             widget.destroy()
 
     def highlight_nav_button(self, index):
@@ -265,171 +600,951 @@ class DiskInfoApp(ctk.CTk):
     # UI Page methods
     def show_drive_info(self):
         print("DEBUG: Showing drive info page")
-        self.clear_frame("drive_info")
         self.update_drive_info()
         self.show_frame("drive_info")
         self.highlight_nav_button(0)
+        self.collector.request(DRIVES)
 
     def show_health(self):
         print("DEBUG: Showing health status page")
-        self.clear_frame("health")
         self.update_health_info()
         self.show_frame("health")
         self.highlight_nav_button(1)
+        self.collector.request(HEALTH)
 
     def show_partitions(self):
         print("DEBUG: Showing partitions page")
-        self.clear_frame("partitions")
-        
-        current_time = time.time()
-        if self.partition_data_cache and current_time - self.partition_cache_time < 30:
-            print("DEBUG: Using cached partition data")
-            self.update_partition_info(use_cache=True)
-        else:
-            print("DEBUG: Fetching fresh partition data")
-            self.update_partition_info(use_cache=False)
-                
+        self.update_partition_info()
         self.show_frame("partitions")
         self.highlight_nav_button(2)
+        self.collector.request(PARTITIONS)
+
+    def show_duplicates(self):
+        print("DEBUG: Showing duplicates page")
+        if "duplicates" not in self.card_pages:
+            self._build_duplicates_page()
+            self.card_pages["duplicates"] = None
+        self.show_frame("duplicates")
+        self.highlight_nav_button(3)
 
     def show_benchmark(self):
         print("DEBUG: Showing benchmark page")
         self.clear_frame("benchmark")
         self.update_benchmark_info()
         self.show_frame("benchmark")
-        self.highlight_nav_button(3)
+        self.highlight_nav_button(4)
+        self.collector.request(DRIVES)  # Keeps the drive list fresh for the next visit
+
+    def show_monitor(self):
+        print("DEBUG: Showing disk activity page")
+        if "monitor" not in self.card_pages:
+            from diskinfo.iomonitor import IoMonitor
+            self.io_monitor = IoMonitor(interval=MONITOR_INTERVALS["1 s"])
+            self.io_monitor.start()  # Keeps sampling in the background so history survives page switches
+            self._build_monitor_page()
+            self.card_pages["monitor"] = None
+        self.show_frame("monitor")
+        self.highlight_nav_button(5)
+        if self.monitor_tick is None:
+            self._tick_monitor()
+
+    def show_fleet(self):
+        print("DEBUG: Showing fleet page")
+        if "fleet" not in self.card_pages:
+            self._build_fleet_page()
+            self.card_pages["fleet"] = None
+        self.show_frame("fleet")
+        self.highlight_nav_button(6)
+
+    def refresh_partitions(self):
+        """Drop cached topology and usage so the Disk Management view reloads."""
+        self.cache.invalidate(TOPOLOGY, USAGE)
+        self.collector.request(PARTITIONS, DRIVES)
+
+    def _watch_mounts(self):
+        """Invalidate cached data when a volume is mounted or unmounted."""
+        try:
+            changed = self.mount_watcher.changed()
+        except Exception as e:
+            print(f"DEBUG: Error checking mounted volumes: {e}")
+            changed = set()
+        if changed:
+            print(f"DEBUG: Volumes changed: {changed}")
+            self.cache.invalidate()
+            self.collector.request(DRIVES, PARTITIONS)
+        self.after(MOUNT_POLL_MS, self._watch_mounts)
+
+    # Space analysis
+    def show_space(self, path):
+        """Scan `path` (reusing its saved index) and show where the space went."""
+        print(f"DEBUG: Showing space analysis for {path}")
+        if "space" not in self.card_pages:
+            self._build_space_page()
+            self.card_pages["space"] = None
+        self.show_frame("space")
+        self.highlight_nav_button(0)  # Reached from a Drive Info card
+        if self.space_scanner is None or self.space_scanner.root != os.path.abspath(path):
+            self._start_space_scan(path)
+
+    def _build_space_page(self):
+        frame = self.page_frame("space")
+
+        header_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        header_frame.pack(fill="x", padx=20, pady=(20, 10))
+        ctk.CTkLabel(header_frame, text="Space Analysis", font=ctk.CTkFont(size=24, weight="bold")).pack(
+            side="left", pady=5)
+        ctk.CTkButton(header_frame, text="🔄 Rescan", width=100,
+                      command=lambda: self._start_space_scan(self.space_scanner.root)).pack(side="right", padx=(10, 20))
+        ctk.CTkButton(header_frame, text="⬆ Up", width=80, command=self._space_up).pack(side="right")
+
+        self.space_path_label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=14, weight="bold"), anchor="w")
+        self.space_path_label.pack(fill="x", padx=20)
+        self.space_status_label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=12), anchor="w")
+        self.space_status_label.pack(fill="x", padx=20, pady=(0, 5))
+
+        self.space_canvas = ctk.CTkCanvas(frame, highlightthickness=0, bg="white")
+        self.space_canvas.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        self.space_canvas.bind("<Configure>", lambda _: self._draw_space())
+        self.space_canvas.bind("<Button-1>", self._space_click)
+
+    def _start_space_scan(self, path):
+        from diskinfo.spacescan import SpaceScanner, index_path
+        if self.space_scanner is not None:
+            self.space_scanner.cancel()
+        # The scanner loads the saved index on its own thread; a big one would otherwise freeze the UI
+        self.space_scanner = SpaceScanner(path, index=index_path(HISTORY_DIR, path)).start()
+        self.space_node = 0
+        self._poll_space(self.space_scanner)
+
+    def _poll_space(self, scanner):
+        """Redraw from the live tree until `scanner` finishes; totals grow as directories complete."""
+        if scanner is not self.space_scanner:
+            return  # Superseded by a rescan
+        self._draw_space()
+        if not scanner.finished.is_set():
+            self.after(SPACE_POLL_MS, lambda: self._poll_space(scanner))
+        elif scanner.index_error is not None:
+            print(f"DEBUG: Ignored scan index {scanner.index}: {scanner.index_error}")
+
+    def _draw_space(self):
+        scanner = self.space_scanner
+        if scanner is None or not len(scanner.tree):
+            return
+        from diskinfo.spacescan import squarify
+        tree, node = scanner.tree, self.space_node
+        elapsed = (scanner.finished_at or time.monotonic()) - scanner.started_at
+        state = "Scanned" if scanner.finished.is_set() else "Scanning..."
+        self.space_path_label.configure(text=tree.path(node))
+        self.space_status_label.configure(
+            text=f"{state} {len(tree):,} folders, {tree.total_files[0]:,} files, "
+                 f"{self.bytes_to_gb(tree.total_size[0])} GB in {elapsed:.1f} s"
+                 + (f" ({scanner.reused:,} unchanged folders reused)" if scanner.reused else "")
+                 + (f", {tree.errors} unreadable" if tree.errors else "")
+        )
+
+        canvas = self.space_canvas
+        canvas.delete("all")
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        entries = tree.largest_children(node, SPACE_TREEMAP_ITEMS)
+        entries.append((None, tree.own_size[node]))  # Files directly in this folder
+        entries.sort(key=lambda entry: entry[1], reverse=True)
+        self.space_rects = []
+        for index, x, y, w, h in squarify([size for _, size in entries], 0, 0, width, height):
+            child, size = entries[index]
+            color = "#bdc3c7" if child is None else SPACE_COLORS[index % len(SPACE_COLORS)]
+            canvas.create_rectangle(x, y, x + w, y + h, fill=color, outline="white", width=2)
+            if w > 60 and h > 30:
+                name = "(files)" if child is None else tree.names[child]
+                canvas.create_text(x + 6, y + 6, anchor="nw", fill="white", width=w - 12,
+                                   text=f"{name}\n{self.bytes_to_gb(size)} GB")
+            self.space_rects.append((x, y, x + w, y + h, child))
+
+    def _space_click(self, event):
+        for x0, y0, x1, y1, child in self.space_rects:
+            if child is not None and x0 <= event.x < x1 and y0 <= event.y < y1:
+                self.space_node = child
+                self._draw_space()
+                return
+
+    def _space_up(self):
+        if self.space_scanner is not None and self.space_node > 0:
+            self.space_node = self.space_scanner.tree.parent[self.space_node]
+            self._draw_space()
+
+    # Duplicate files
+    def _build_duplicates_page(self):
+        frame = self.page_frame("duplicates")
+
+        header_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        header_frame.pack(fill="x", padx=20, pady=(20, 10))
+        ctk.CTkLabel(header_frame, text="Duplicate Files", font=ctk.CTkFont(size=24, weight="bold")).pack(
+            side="left", pady=5)
+        self.duplicates_cancel_button = ctk.CTkButton(
+            header_frame, text="⏹ Cancel", command=self.cancel_duplicates, width=100, state="disabled"
+        )
+        self.duplicates_cancel_button.pack(side="right", padx=(10, 20))
+        self.duplicates_button = ctk.CTkButton(header_frame, text="🔍 Find", command=self.find_duplicates, width=100)
+        self.duplicates_button.pack(side="right")
+
+        self.duplicates_path_entry = ctk.CTkEntry(frame, placeholder_text="Folder to search, e.g. C:\\Users")
+        self.duplicates_path_entry.pack(fill="x", padx=20, pady=(0, 5))
+        self.duplicates_path_entry.bind("<Return>", lambda _: self.find_duplicates())
+        self.duplicates_status_label = ctk.CTkLabel(frame, text="Enter a folder and press Find.",
+                                                    font=ctk.CTkFont(size=12), anchor="w")
+        self.duplicates_status_label.pack(fill="x", padx=20, pady=(0, 5))
+
+        columns = [
+            Column("group", "Group", 70),
+            Column("wasted", "Wasted (MB)", 110, format=lambda size: f"{self.bytes_to_mb(size):,}"),
+            Column("size", "Size (MB)", 100, format=lambda size: f"{self.bytes_to_mb(size):,}"),
+            Column("copies", "Copies", 70),
+            Column("path", "Path", 600),
+        ]
+        self.duplicates_table = VirtualTable(frame, TableModel(columns))
+        self.duplicates_table.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+    def find_duplicates(self):
+        """Search the entered folder on a background thread; hashing itself runs in worker processes."""
+        import threading
+        from diskinfo.duplicates import DIGEST_CACHE_FILE_NAME, DigestCache, DuplicateFinder
+
+        path = self.duplicates_path_entry.get().strip()
+        if not path or not os.path.isdir(path):
+            self.duplicates_status_label.configure(text="Enter an existing folder.")
+            return
+        events = self.duplicate_events
+
+        def run(finder):
+            cache = None
+            try:
+                cache = finder.cache = DigestCache(os.path.join(HISTORY_DIR, DIGEST_CACHE_FILE_NAME))
+                events.put(("done", finder, finder.find()))
+            except Exception as e:
+                events.put(("error", finder, str(e)))
+            finally:
+                if cache is not None:
+                    cache.close()
+
+        finder = DuplicateFinder(
+            [path], progress=lambda stage, done, total: events.put(("progress", None, (stage, done, total)))
+        )
+        self.duplicate_finder = finder
+        self.duplicates_button.configure(state="disabled")
+        self.duplicates_cancel_button.configure(state="normal")
+        self.duplicates_status_label.configure(text=f"Listing {path}...")
+        threading.Thread(target=run, args=(finder,), name="diskinfo-duplicates", daemon=True).start()
+        self.after(DUPLICATES_POLL_MS, self._poll_duplicates)
+
+    def cancel_duplicates(self):
+        if self.duplicate_finder is not None:
+            self.duplicate_finder.cancel()
+            self.duplicates_status_label.configure(text="Cancelling...")
+
+    def _poll_duplicates(self):
+        progress = None
+        while True:
+            try:
+                kind, finder, payload = self.duplicate_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                progress = payload  # Only the newest one is worth drawing
+                continue
+            if finder is not self.duplicate_finder:
+                continue
+            self.duplicates_button.configure(state="normal")
+            self.duplicates_cancel_button.configure(state="disabled")
+            if kind == "error":
+                print(f"DEBUG: Error finding duplicates: {payload}")
+                self.duplicates_status_label.configure(text=f"Search failed: {payload}")
+            else:
+                self._show_duplicates(finder, payload)
+            return
+        if progress is not None:
+            stage, done, total = progress
+            self.duplicates_status_label.configure(
+                text=f"Listing files... {done:,} found" if not total or stage == "size"
+                else f"Hashing ({stage})... {done:,} of {total:,} files"
+            )
+        self.after(DUPLICATES_POLL_MS, self._poll_duplicates)
+
+    def _show_duplicates(self, finder, groups):
+        rows = [
+            {"group": number, "wasted": group.wasted, "size": group.size, "copies": len(group.paths), "path": path}
+            for number, group in enumerate(groups, 1) for path in group.paths
+        ]
+        self.duplicates_table.model.set_rows(rows)
+        self.duplicates_table.refresh()
+        stats = finder.stats
+        if finder.cancelled:
+            text = "Cancelled."
+        else:
+            text = (f"{len(groups):,} groups of duplicates, {self.bytes_to_mb(sum(g.wasted for g in groups))} MB "
+                    f"wasted, among {stats['files']:,} files ({stats['hashed']:,} hashed, "
+                    f"{stats['cached']:,} digests reused)")
+        self.duplicates_status_label.configure(text=text)
+
+    # Fleet
+    def _build_fleet_page(self):
+        from diskinfo.fleet import SORT_KEYS
+        frame = self.page_frame("fleet")
+
+        header_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        header_frame.pack(fill="x", padx=20, pady=(20, 10))
+        ctk.CTkLabel(header_frame, text="Fleet", font=ctk.CTkFont(size=24, weight="bold")).pack(side="left", pady=5)
+        self.fleet_export_button = ctk.CTkButton(
+            header_frame, text="💾 Export JSON", command=self.export_fleet, width=120, state="disabled"
+        )
+        self.fleet_export_button.pack(side="right", padx=(10, 20))
+        self.fleet_button = ctk.CTkButton(header_frame, text="🔄 Collect", command=self.collect_fleet, width=100)
+        self.fleet_button.pack(side="right")
+
+        controls = ctk.CTkFrame(frame, fg_color="transparent")
+        controls.pack(fill="x", padx=20, pady=(0, 5))
+        self.fleet_hosts_entry = ctk.CTkEntry(controls, placeholder_text="host1 host2:9819 ...")
+        self.fleet_hosts_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        self.fleet_hosts_entry.bind("<Return>", lambda _: self.collect_fleet())
+        self.fleet_transport_menu = ctk.CTkOptionMenu(controls, values=list(FLEET_TRANSPORTS), width=140)
+        self.fleet_transport_menu.pack(side="left", padx=(0, 10))
+        self.fleet_sort_menu = ctk.CTkOptionMenu(
+            controls, values=list(FLEET_SORTS), command=lambda _: self._sort_fleet(), width=160
+        )
+        self.fleet_sort_menu.pack(side="left")
+        self.fleet_status_label = ctk.CTkLabel(frame, text="Enter host names and press Collect.",
+                                               font=ctk.CTkFont(size=12), anchor="w")
+        self.fleet_status_label.pack(fill="x", padx=20, pady=(0, 5))
+
+        self.fleet_sort_fields = SORT_KEYS
+        columns = [
+            Column("host", "Host", 160),
+            Column("fullest_volume", "Fullest volume", 140),
+            Column("fullest_percent", "% Used", 80, format=lambda percent: f"{percent}%"),
+            Column("worst_disk", "Worst disk", 200),
+            Column("worst_health", "Health", 80, format=lambda health: f"{health}%"),
+            Column("predicted_failures", "Failing", 70),
+            Column("slowest_mb_per_s", "Slowest MB/s", 110, format=lambda mb_s: f"{mb_s:.1f}"),
+            Column("error", "Error", 200),
+        ]
+        self.fleet_table = VirtualTable(frame, TableModel(columns))
+        self.fleet_table.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+    def collect_fleet(self):
+        """Ask every listed host on a background thread; the pool and connections are kept between rounds."""
+        import threading
+        from diskinfo.fleet import Fleet, HttpTransport, WmiTransport
+
+        hosts = self.fleet_hosts_entry.get().replace(",", " ").split()
+        if not hosts:
+            self.fleet_status_label.configure(text="Enter at least one host name.")
+            return
+        transport = FLEET_TRANSPORTS[self.fleet_transport_menu.get()]
+        if self.fleet_key != (transport, tuple(hosts)):
+            if self.fleet is not None:
+                self.fleet.close()
+            self.fleet = Fleet(WmiTransport() if transport == "wmi" else HttpTransport(), hosts)
+            self.fleet_key = (transport, tuple(hosts))
+        self.fleet_button.configure(state="disabled")
+        self.fleet_status_label.configure(text=f"Collecting from {len(hosts)} host(s)...")
+        fleet = self.fleet
+        threading.Thread(target=lambda: self.fleet_events.put(fleet.collect()), daemon=True).start()
+        self.after(FLEET_POLL_MS, self._poll_fleet)
+
+    def _poll_fleet(self):
+        try:
+            results = self.fleet_events.get_nowait()
+        except queue.Empty:
+            self.after(FLEET_POLL_MS, self._poll_fleet)
+            return
+        from diskinfo.fleet import summarize
+        self.fleet_results = results
+        self.fleet_table.model.set_rows([summarize(result) for result in results])
+        self._sort_fleet()
+        failed = sum(1 for result in results if result.error is not None)
+        self.fleet_status_label.configure(
+            text=f"{len(results) - failed} of {len(results)} host(s) answered at {time.strftime('%H:%M:%S')}"
+        )
+        self.fleet_button.configure(state="normal")
+        self.fleet_export_button.configure(state="normal")
+
+    def _sort_fleet(self):
+        field, descending = self.fleet_sort_fields[FLEET_SORTS[self.fleet_sort_menu.get()]]
+        self.fleet_table.model.sort(field, descending)
+        self.fleet_table.refresh()
+
+    def export_fleet(self):
+        """Save the last round as one JSON document, or its volumes as CSV, JSON lines or columnar records."""
+        from tkinter import filedialog
+        from diskinfo.export import EXTENSIONS, VOLUMES, VolumeRecord, export_records, open_output, report_records
+        from diskinfo.fleet import fleet_document
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("Volumes as CSV", "*.csv"), ("Volumes as JSON lines", "*.ndjson"),
+                       ("Volumes as columnar", "*.dcol")],
+            initialfile="fleet.json",
+        )
+        if not path:
+            return
+        fmt = next((fmt for fmt, extension in EXTENSIONS.items() if path.lower().endswith(extension)), None)
+        try:
+            if fmt is None:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(fleet_document(self.fleet_results, FLEET_SORTS[self.fleet_sort_menu.get()]), f,
+                              indent=2)
+            else:
+                reports = (result.report for result in self.fleet_results if result.report is not None)
+                with open_output(path, fmt) as stream:
+                    export_records(report_records(VOLUMES, reports), VolumeRecord, stream, fmt)
+        except OSError as e:
+            print(f"DEBUG: Error exporting fleet report: {e}")
+            self.fleet_status_label.configure(text=f"Export failed: {e}")
+
+    # Export
+    def export_snapshot(self):
+        """Save the current page's latest snapshot as NDJSON, CSV or columnar records."""
+        import socket
+        from tkinter import filedialog, messagebox
+        from diskinfo.export import EXTENSIONS, RECORD_TYPES, REPORT_SOURCES, export_records, open_output
+
+        kind, source = EXPORT_PAGES.get(self.current_page, (None, None))
+        snapshot = self.snapshots.get(source)
+        if snapshot is None:
+            messagebox.showinfo("Export Data", "Open Drive Info, Health Status or Partitions and wait for "
+                                               "its data to load, then export.")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=EXTENSIONS["csv"],
+            filetypes=[("CSV", "*.csv"), ("JSON lines", "*.ndjson"), ("Columnar", "*.dcol")],
+            initialfile=f"diskinfo_{kind}{EXTENSIONS['csv']}",
+        )
+        if not path:
+            return
+        fmt = next((fmt for fmt, extension in EXTENSIONS.items() if path.lower().endswith(extension)), "csv")
+        _, records = REPORT_SOURCES[kind]
+        try:
+            with open_output(path, fmt) as stream:
+                rows = export_records(records(snapshot, socket.gethostname(), time.time()),
+                                      RECORD_TYPES[kind], stream, fmt)
+        except OSError as e:
+            print(f"DEBUG: Error exporting {kind}: {e}")
+            messagebox.showerror("Export Data", f"Export failed: {e}")
+            return
+        print(f"DEBUG: Exported {rows} {kind} rows to {path}")
+
+    # Background alerts
+    def _start_alerts(self):
+        """Start the usage/health alert monitor; alerts pop up as toasts and go to a log file."""
+        from diskinfo.alerts import AlertEngine, AlertMonitor, CallbackSink, LogFileSink
+        engine = AlertEngine(sinks=[
+            CallbackSink(self.alert_events.put),
+            LogFileSink(os.path.join(HISTORY_DIR, ALERT_LOG_FILE)),
+        ])
+        self.alert_monitor = AlertMonitor(engine, cache=self.cache, history=self.smart_history)
+        self.alert_monitor.start()
+        self.after(ALERT_POLL_MS, self._poll_alerts)
+
+    def _poll_alerts(self):
+        try:
+            while True:
+                alert = self.alert_events.get_nowait()
+                print(f"DEBUG: Alert {alert.to_dict()}")
+                self._show_toast(alert)
+        except queue.Empty:
+            pass
+        self.after(ALERT_POLL_MS, self._poll_alerts)
+
+    def _show_toast(self, alert):
+        """Show `alert` in the bottom-right corner, replacing any toast still on screen."""
+        if self.alert_toast is not None:
+            self.alert_toast.destroy()
+        severity = alert.to_dict()["severity"]
+        toast = self.alert_toast = ctk.CTkFrame(self, corner_radius=8, border_width=2,
+                                                border_color=ALERT_COLORS[severity])
+        heading = "Resolved" if alert.resolved else severity.capitalize()
+        ctk.CTkLabel(toast, text=heading, font=ctk.CTkFont(weight="bold"),
+                     text_color=ALERT_COLORS[severity]).pack(anchor="w", padx=12, pady=(8, 0))
+        ctk.CTkLabel(toast, text=alert.message, wraplength=320, justify="left").pack(anchor="w", padx=12, pady=(0, 8))
+        toast.place(relx=1.0, rely=1.0, x=-16, y=-16, anchor="se")
+        toast.lift()
+        self.after(ALERT_TOAST_MS, lambda: self._hide_toast(toast))
+
+    def _hide_toast(self, toast):
+        if toast is self.alert_toast:  # Replaced toasts were destroyed already
+            self.alert_toast = None
+            toast.destroy()
+
+    # Snapshots from the collector thread
+    def _poll_collector(self):
+        """Apply finished snapshots and redraw the visible page if its data changed."""
+        try:
+            while True:
+                kind, snapshot, error = self.collector.events.get_nowait()
+                if error is not None:
+                    print(f"DEBUG: Error collecting {kind}: {error}")
+                    if kind in self.snapshots or self.snapshot_errors.get(kind) == error:
+                        continue  # Keep showing the last good data
+                    self.snapshot_errors[kind] = error
+                elif snapshot == self.snapshots.get(kind):
+                    continue
+                else:
+                    self.snapshots[kind] = snapshot
+                    self.snapshot_errors.pop(kind, None)
+                    if kind == DRIVES:
+                        self.drive_data = snapshot
+                self._redraw(kind)
+                if not startup_timer.reached("first_data"):
+                    startup_timer.mark("first_data")
+                    self._report_startup()
+        except queue.Empty:
+            pass
+        self.after(COLLECTOR_POLL_MS, self._poll_collector)
+
+    def _redraw(self, kind):
+        pages = {
+            DRIVES: ("drive_info", self.update_drive_info),
+            HEALTH: ("health", self.update_health_info),
+            PARTITIONS: ("partitions", self.update_partition_info),
+        }
+        page, render = pages[kind]
+        if self.current_page == page:
+            render()
 
     # Helper methods
     def bytes_to_gb(self, bytes_val):
         return round(bytes_val / (1024 ** 3), 2)
 
+    def bytes_to_mb(self, bytes_val):
+        return round(bytes_val / (1024 ** 2), 1)
+
+    def format_speed(self, speed):
+        # Format speeds to show GB/s if speed exceeds 1000 MB/s
+        if speed >= 1000:
+            return f"{speed/1000:.2f} GB/s"
+        return f"{speed:.2f} MB/s"
+
+    def format_latency(self, microseconds):
+        if microseconds is None:
+            return "-"
+        if microseconds >= 1000:
+            return f"{microseconds/1000:.2f} ms"
+        if microseconds >= 10:
+            return f"{microseconds:.0f} µs"
+        return f"{microseconds:.1f} µs"
+
     def change_appearance_mode(self, new_appearance_mode):
         ctk.set_appearance_mode(new_appearance_mode)
 
     def create_info_card(self, parent, title, content, progress_value=None):
-        card = ctk.CTkFrame(parent, corner_radius=6)
+        card = InfoCard(parent)
         card.pack(fill="x", padx=20, pady=10)
+        card.show(title, content, progress_value)
+        return card
 
-        title_label = ctk.CTkLabel(
-            card,
-            text=title,
-            font=ctk.CTkFont(size=16, weight="bold")
-        )
-        title_label.pack(padx=15, pady=(15, 5), anchor="w")
+    def run_benchmark(self, drive, frame):
+        """Start a background benchmark for the selected drive."""
+        print(f"DEBUG: Running benchmark for drive {drive}")
+        if self.benchmark_worker is not None and self.benchmark_worker.is_alive():
+            print("DEBUG: Benchmark already running")
+            return
 
-        content_label = ctk.CTkLabel(
-            card,
-            text=content,
-            font=ctk.CTkFont(size=13)
+        self._clear_benchmark_results()
+        self.benchmark_status_label = ctk.CTkLabel(
+            self.benchmark_results_frame,
+            text="Running benchmark...",
+            font=ctk.CTkFont(size=14)
         )
-        content_label.pack(padx=15, pady=(0, 15), anchor="w")
+        self.benchmark_status_label.pack(pady=(10, 5))
 
-        if progress_value is not None:
-            progress = ctk.CTkProgressBar(card, height=10)
-            progress.pack(padx=15, pady=(0, 15), fill="x")
-            progress.set(progress_value / 100)
+        self.benchmark_progress = ctk.CTkProgressBar(self.benchmark_results_frame, height=10)
+        self.benchmark_progress.pack(padx=15, pady=(0, 10), fill="x")
+        self.benchmark_progress.set(0)
 
-    def get_drive_mappings(self):
-        """Get drive mappings and information."""
-        print("DEBUG: Starting get_drive_mappings")
-        drive_data = {}
-        try:
-            print("DEBUG: Getting basic disk information using psutil")
-            for partition in psutil.disk_partitions():
-                try:
-                    print(f"DEBUG: Processing partition {partition.mountpoint}")
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    drive_letter = partition.mountpoint.rstrip('\\')
-                    
-                    if drive_letter not in drive_data:
-                        print(f"DEBUG: Adding new drive {drive_letter}")
-                        drive_data[drive_letter] = {
-                            "model": partition.device,
-                            "interface": "Storage Device",
-                            "size": usage.total,
-                            "partitions": []
-                        }
-                    
-                    print(f"DEBUG: Adding partition info for {partition.mountpoint}")
-                    drive_data[drive_letter]["partitions"].append({
-                        "mountpoint": partition.mountpoint,
-                        "used": usage.used,
-                        "total": usage.total,
-                        "percent": usage.percent
-                    })
-                except (PermissionError, FileNotFoundError) as e:
-                    print(f"DEBUG: Error processing partition {partition.mountpoint}: {e}")
-                    continue
+        from diskinfo.benchmark import IO_PRESETS, BenchmarkWorker
 
-            print("DEBUG: Scheduling WMI update")
-            self.after(100, self.update_drive_details, drive_data)
-            return drive_data
+        self.benchmark_worker = BenchmarkWorker(
+            drive,
+            self._selected_benchmark_profiles(),
+            **IO_PRESETS[BENCHMARK_MODES[self.benchmark_mode_var.get()]]
+        )
+        self.benchmark_worker.start()
+        self._set_benchmark_running(True)
+        self.after(BENCHMARK_POLL_MS, self._poll_benchmark)
+
+    def _selected_benchmark_profiles(self):
+        """Build the profile list from the Benchmark page settings."""
+        from diskinfo.benchmark import DEFAULT_PROFILES, MB, PROFILES, configure_profiles
+
+        choice = self.benchmark_profile_var.get()
+        profiles = DEFAULT_PROFILES if choice == ALL_PROFILES else [PROFILES[choice]]
+        return configure_profiles(
+            profiles,
+            file_size=BENCHMARK_FILE_SIZES_MB[self.benchmark_size_var.get()] * MB,
+            iterations=int(self.benchmark_iterations_var.get())
+        )
 
-        except Exception as e:
-            print(f"DEBUG: Error in get_drive_mappings: {e}")
-            return {}
+    def cancel_benchmark(self):
+        """Ask the running benchmark to stop; cleanup happens in the worker."""
+        if self.benchmark_worker is not None and self.benchmark_worker.is_alive():
+            print("DEBUG: Cancelling benchmark")
+            self.benchmark_worker.cancel()
+            self.benchmark_cancel_button.configure(state="disabled")
+
+    def _poll_benchmark(self):
+        """Drain worker events on the Tk thread and reschedule while running."""
+        worker = self.benchmark_worker
+        if worker is None:
+            return
 
-    def run_benchmark(self, drive, frame):
-        """Run benchmark for selected drive and update results."""
-        print(f"DEBUG: Running benchmark for drive {drive}")
-        
-        # Find and clear previous results
-        for widget in frame.winfo_children():
-            if hasattr(widget, '_name') and widget._name == "benchmark_results":
-                for child in widget.winfo_children():
-                    child.destroy()
-                results_frame = widget
+        finished = False
+        from diskinfo.batch import BatchBenchmark
+
+        while True:
+            try:
+                event = worker.events.get_nowait()
+            except queue.Empty:
                 break
-        
-        # Add loading indicator
-        loading_label = ctk.CTkLabel(
-            results_frame,
-            text="Running benchmark...",
+            if self._benchmark_widgets_alive():
+                if isinstance(worker, BatchBenchmark):
+                    finished = self._handle_batch_event(event) or finished
+                else:
+                    finished = self._handle_benchmark_event(event) or finished
+            elif event[0] != "progress":
+                finished = True
+
+        if finished or not worker.is_alive() and worker.events.empty():
+            self.benchmark_worker = None
+            if self._benchmark_widgets_alive():
+                self._set_benchmark_running(False)
+            return
+        self.after(BENCHMARK_POLL_MS, self._poll_benchmark)
+
+    def _handle_benchmark_event(self, event):
+        """Apply a single worker event to the results area. Returns True when final."""
+        kind = event[0]
+        if kind == "progress":
+            _, phase, done, total, speed = event
+            self.benchmark_progress.set(done / total if total else 0)
+            self.benchmark_status_label.configure(
+                text=f"{phase}: {self.format_speed(speed)} "
+                     f"({self.bytes_to_mb(done)} of {self.bytes_to_mb(total)} MB)"
+            )
+            return False
+
+        self.benchmark_progress.destroy()
+        if kind == "done":
+            results = event[1]
+            io_mode = results[0].io_mode if results else "-"
+            self.benchmark_status_label.configure(text=f"Benchmark complete. Mode: {io_mode}")
+            self._show_benchmark_table(results)
+            self._record_benchmark(self.benchmark_worker.mountpoint, results)
+        elif kind == "cancelled":
+            self.benchmark_status_label.configure(text="Benchmark cancelled.")
+        else:
+            self.benchmark_status_label.configure(text=event[1], text_color="red")
+        return True
+
+    def run_batch_benchmark(self):
+        """Benchmark every checked drive; one physical disk at a time per disk."""
+        if self.benchmark_worker is not None and self.benchmark_worker.is_alive():
+            print("DEBUG: Benchmark already running")
+            return
+        selected = [drive for drive, var in self.batch_drive_vars.items() if var.get()]
+        if not selected:
+            return
+        print(f"DEBUG: Running batch benchmark for {selected}")
+        import psutil
+        from diskinfo.batch import BatchBenchmark, BatchJob
+        from diskinfo.benchmark import IO_PRESETS
+
+        devices = {}
+        for partition in psutil.disk_partitions():
+            devices[partition.mountpoint.rstrip('\\')] = partition.device
+        jobs = [BatchJob(drive, devices.get(drive)) for drive in selected]
+
+        self._clear_benchmark_results()
+        self.benchmark_status_label = ctk.CTkLabel(
+            self.benchmark_results_frame,
+            text=f"Benchmarking {len(jobs)} drives...",
             font=ctk.CTkFont(size=14)
         )
-        loading_label.pack(pady=10)
-        
-        # Update UI to show progress
-        self.update()
-        
-        # Run benchmark
-        write_speed, read_speed = self.benchmark_drive(drive)
-        
-        # Remove loading indicator
-        loading_label.destroy()
-        
-        if write_speed is not None and read_speed is not None:
-            # Format speeds to show GB/s if speed exceeds 1000 MB/s
-            def format_speed(speed):
-                if speed >= 1000:
-                    return f"{speed/1000:.2f} GB/s"
-                return f"{speed:.2f} MB/s"
-            
-            write_speed_text = format_speed(write_speed)
-            read_speed_text = format_speed(read_speed)
-            
-            results_text = (
-                f"Write Speed: {write_speed_text}\n"
-                f"Read Speed: {read_speed_text}"
+        self.benchmark_status_label.pack(pady=(10, 5))
+        self.benchmark_progress = ctk.CTkProgressBar(self.benchmark_results_frame, height=10)
+        self.benchmark_progress.pack(padx=15, pady=(0, 10), fill="x")
+        self.benchmark_progress.set(0)
+        self.batch_progress = {}
+
+        self.benchmark_worker = BatchBenchmark(
+            jobs,
+            self._selected_benchmark_profiles(),
+            **IO_PRESETS[BENCHMARK_MODES[self.benchmark_mode_var.get()]]
+        )
+        self.benchmark_worker.start()
+        self._set_benchmark_running(True)
+        self.after(BENCHMARK_POLL_MS, self._poll_benchmark)
+
+    def _handle_batch_event(self, event):
+        """Apply a batch worker event to the results area. Returns True when final."""
+        kind = event[0]
+        if kind == "progress":
+            _, drive, phase, done, total, speed = event
+            self.batch_progress[drive] = f"{drive} {phase}: {self.format_speed(speed)}"
+            self.benchmark_status_label.configure(text="\n".join(self.batch_progress.values()))
+            return False
+        if kind == "result":
+            result = event[1]
+            self.batch_progress.pop(result.mountpoint, None)
+            completed = len(self.benchmark_worker.results)
+            self.benchmark_progress.set(completed / len(self.benchmark_worker.jobs))
+            if not result.error:
+                self._record_benchmark(result.mountpoint, result.results)
+            return False
+
+        self.benchmark_progress.destroy()
+        batch_results = event[1]
+        if kind == "cancelled":
+            self.benchmark_status_label.configure(text="Batch benchmark cancelled.")
+        else:
+            io_modes = {result.io_mode for batch in batch_results for result in batch.results}
+            self.benchmark_status_label.configure(
+                text=f"Batch benchmark complete. Mode: {', '.join(sorted(io_modes)) or '-'}"
             )
-            result_label = ctk.CTkLabel(
-                results_frame,
-                text=results_text,
-                font=ctk.CTkFont(size=14)
+        if batch_results:
+            self._show_batch_comparison(batch_results)
+        return True
+
+    def _show_batch_comparison(self, batch_results):
+        """Rank drives by the first profile's read speed, as a table and a bar chart."""
+        from diskinfo.batch import rank
+        from diskinfo.benchmark import DEFAULT_PROFILES
+
+        profiles = []
+        for batch in batch_results:
+            for result in batch.results:
+                if result.profile not in profiles:
+                    profiles.append(result.profile)
+        if not profiles:
+            profiles = [DEFAULT_PROFILES[0].name]
+        ranked = rank(batch_results, profiles[0])
+        failed = [batch for batch in batch_results if batch.error]
+
+        table = ctk.CTkFrame(self.benchmark_results_frame, fg_color="transparent")
+        table.pack(fill="x", padx=15, pady=(0, 10))
+        headers = ["#", "Drive", "Disk"] + [f"{profile} R/W" for profile in profiles]
+        for column, header in enumerate(headers):
+            ctk.CTkLabel(
+                table,
+                text=header,
+                font=ctk.CTkFont(size=12, weight="bold")
+            ).grid(row=0, column=column, padx=8, pady=4, sticky="w")
+
+        for row, batch in enumerate(ranked + failed, start=1):
+            speeds = {(result.profile, result.mode): result.mb_per_s for result in batch.results}
+            values = [str(row) if not batch.error else "-", batch.mountpoint, batch.disk]
+            for profile in profiles:
+                if batch.error:
+                    values.append("failed")
+                    continue
+                read, write = speeds.get((profile, "read")), speeds.get((profile, "write"))
+                values.append(
+                    f"{self.format_speed(read) if read is not None else '-'} / "
+                    f"{self.format_speed(write) if write is not None else '-'}"
+                )
+            for column, value in enumerate(values):
+                ctk.CTkLabel(
+                    table,
+                    text=value,
+                    text_color="red" if batch.error and column > 2 else None,
+                    font=ctk.CTkFont(size=12)
+                ).grid(row=row, column=column, padx=8, pady=2, sticky="w")
+
+        if ranked:
+            self._draw_comparison_chart(
+                self.benchmark_results_frame,
+                f"{profiles[0]} read (MB/s)",
+                [(batch.mountpoint, next(
+                    (result.mb_per_s for result in batch.results
+                     if result.profile == profiles[0] and result.mode == "read"), 0.0
+                )) for batch in ranked]
             )
-            result_label.pack(pady=10)
-        else:
-            error_label = ctk.CTkLabel(
-                results_frame,
-                text="Benchmark failed. Please check drive permissions.",
+
+    def _draw_comparison_chart(self, parent, title, bars, width=700, bar_height=22):
+        """Horizontal bar chart of (label, value) pairs on a single canvas."""
+        dark = ctk.get_appearance_mode() == "Dark"
+        height = 30 + len(bars) * (bar_height + 6)
+        canvas = ctk.CTkCanvas(
+            parent, width=width, height=height, highlightthickness=0,
+            bg="gray15" if dark else "white"
+        )
+        canvas.pack(padx=15, pady=(0, 15))
+        text_color = "gray80" if dark else "gray20"
+        label_width = 120
+        top = max(value for _, value in bars) or 1
+        canvas.create_text(10, 12, text=title, anchor="w", fill=text_color)
+        for index, (label, value) in enumerate(bars):
+            y = 30 + index * (bar_height + 6)
+            length = (value / top) * (width - label_width - 90)
+            canvas.create_text(label_width - 8, y + bar_height / 2, text=label, anchor="e", fill=text_color)
+            canvas.create_rectangle(label_width, y, label_width + length, y + bar_height,
+                                    fill="#3498db", outline="")
+            canvas.create_text(label_width + length + 6, y + bar_height / 2,
+                               text=self.format_speed(value), anchor="w", fill=text_color)
+
+    def _show_benchmark_table(self, results):
+        """Render engine results as one row per profile and direction with latency percentiles."""
+        table = ctk.CTkFrame(self.benchmark_results_frame, fg_color="transparent")
+        table.pack(fill="x", padx=15, pady=(0, 15))
+
+        latency_columns = ["p50", "p90", "p99", "p99.9", "max"]
+        headers = ["Profile", "Mode", "Speed", "IOPS"] + latency_columns
+        for column, header in enumerate(headers):
+            ctk.CTkLabel(
+                table,
+                text=header,
+                font=ctk.CTkFont(size=12, weight="bold")
+            ).grid(row=0, column=column, padx=8, pady=4, sticky="w")
+
+        for row, result in enumerate(results, start=1):
+            values = [
+                result.profile,
+                result.mode.capitalize(),
+                self.format_speed(result.mb_per_s),
+                f"{result.iops:,.0f}",
+            ] + [self.format_latency(result.latency_us.get(key)) for key in latency_columns]
+            for column, value in enumerate(values):
+                ctk.CTkLabel(
+                    table,
+                    text=value,
+                    font=ctk.CTkFont(size=12, weight="bold" if column == 0 else "normal")
+                ).grid(row=row, column=column, padx=8, pady=2, sticky="w")
+
+    def get_benchmark_history(self):
+        """Open the benchmark history store on first use."""
+        if self.benchmark_history is None:
+            from diskinfo.history import HISTORY_FILE_NAME, BenchmarkHistory
+            try:
+                self.benchmark_history = BenchmarkHistory(os.path.join(HISTORY_DIR, HISTORY_FILE_NAME))
+            except Exception as e:
+                print(f"DEBUG: Error opening benchmark history: {e}")
+        return self.benchmark_history
+
+    def _record_benchmark(self, drive, results):
+        history = self.get_benchmark_history()
+        if history is None:
+            return
+        try:
+            history.record(drive, results)
+        except Exception as e:
+            print(f"DEBUG: Error saving benchmark history: {e}")
+        self._show_benchmark_history(drive)
+
+    def _show_benchmark_history(self, drive):
+        """Draw the throughput trend for `drive` and flag regressions against the baseline."""
+        frame = getattr(self, "benchmark_history_frame", None)
+        if frame is None or not frame.winfo_exists():
+            return
+        for child in frame.winfo_children():
+            child.destroy()
+
+        ctk.CTkLabel(
+            frame,
+            text=f"History for {drive}",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(pady=10)
+
+        from diskinfo.benchmark import DEFAULT_PROFILES
+
+        history = self.get_benchmark_history()
+        choice = self.benchmark_profile_var.get()
+        profile = DEFAULT_PROFILES[0].name if choice == ALL_PROFILES else choice
+        series = {}
+        if history is not None:
+            for mode in ("read", "write"):
+                series[mode] = history.series(drive, profile, mode, HISTORY_CHART_RUNS)
+        if not any(series.values()):
+            ctk.CTkLabel(
+                frame,
+                text="No previous runs recorded for this drive",
+                font=ctk.CTkFont(size=12)
+            ).pack(pady=(0, 10))
+            return
+
+        self._draw_trend_chart(frame, f"{profile} throughput (MB/s)", series)
+
+        regressions = history.regressions(drive)
+        if not regressions:
+            ctk.CTkLabel(
+                frame,
+                text="No regressions against the rolling baseline",
+                font=ctk.CTkFont(size=12)
+            ).pack(pady=(0, 10))
+        for regression in regressions:
+            record = regression.record
+            ctk.CTkLabel(
+                frame,
+                text=(
+                    f"⚠ {record.profile} {record.mode}: {regression.metric} "
+                    f"{regression.change:+.0%} vs baseline"
+                ),
                 text_color="red",
-                font=ctk.CTkFont(size=14)
+                font=ctk.CTkFont(size=12)
+            ).pack(pady=(0, 5))
+
+    def _draw_trend_chart(self, parent, title, series, width=700, height=200):
+        """Line chart of MB/s per run, one line per series, on a single canvas."""
+        dark = ctk.get_appearance_mode() == "Dark"
+        canvas = ctk.CTkCanvas(
+            parent, width=width, height=height, highlightthickness=0,
+            bg="gray15" if dark else "white"
+        )
+        canvas.pack(padx=15, pady=(0, 10))
+        text_color = "gray80" if dark else "gray20"
+        colors = {"read": "#3498db", "write": "#e67e22"}
+        margin = 40
+
+        values = [record.mb_per_s for records in series.values() for record in records]
+        top = max(values) * 1.1 or 1
+        runs = max(len(records) for records in series.values())
+        canvas.create_text(margin, 12, text=title, anchor="w", fill=text_color)
+        canvas.create_text(margin - 5, margin, text=f"{top:.0f}", anchor="e", fill=text_color)
+        canvas.create_text(margin - 5, height - margin, text="0", anchor="e", fill=text_color)
+        canvas.create_line(margin, height - margin, width - 10, height - margin, fill=text_color)
+
+        for index, (mode, records) in enumerate(series.items()):
+            if not records:
+                continue
+            step = (width - margin - 10) / max(runs - 1, 1)
+            points = []
+            for position, record in enumerate(records):
+                x = margin + position * step
+                y = height - margin - (record.mb_per_s / top) * (height - 2 * margin)
+                points.extend((x, y))
+                canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill=colors[mode], outline="")
+            if len(points) >= 4:
+                canvas.create_line(*points, fill=colors[mode], width=2)
+            canvas.create_text(
+                width - 10, 12 + index * 14, text=mode.capitalize(),
+                anchor="e", fill=colors[mode]
             )
-            error_label.pack(pady=10)
-            
+
+    def _clear_benchmark_results(self):
+        for child in self.benchmark_results_frame.winfo_children():
+            child.destroy()
+
+    def _benchmark_widgets_alive(self):
+        frame = getattr(self, "benchmark_results_frame", None)
+        label = getattr(self, "benchmark_status_label", None)
+        return (frame is not None and frame.winfo_exists()
+                and label is not None and label.winfo_exists())
+
+    def _set_benchmark_running(self, running):
+        self.benchmark_button.configure(state="disabled" if running else "normal")
+        self.batch_button.configure(state="disabled" if running else "normal")
+        self.benchmark_cancel_button.configure(state="normal" if running else "disabled")
+
     def update_benchmark_info(self):
         """Update benchmark information display."""
-        frame = self.frames["benchmark"]
+        from diskinfo.benchmark import PROFILES
+
+        frame = self.page_frame("benchmark")
         
         header = ctk.CTkLabel(
             frame,
@@ -465,24 +1580,94 @@ class DiskInfoApp(ctk.CTk):
         drive_menu = ctk.CTkOptionMenu(
             frame,
             values=drives,
-            variable=drive_var
+            variable=drive_var,
+            command=self._show_benchmark_history
         )
-        drive_menu.pack(pady=(0, 20))
+        drive_menu.pack(pady=(0, 10))
+
+        # Profile, test file size and iteration count
+        settings_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        settings_frame.pack(pady=(0, 20))
+
+        self.benchmark_profile_var = ctk.StringVar(value=ALL_PROFILES)
+        ctk.CTkOptionMenu(
+            settings_frame,
+            values=[ALL_PROFILES] + list(PROFILES),
+            variable=self.benchmark_profile_var
+        ).pack(side="left", padx=5)
+
+        self.benchmark_size_var = ctk.StringVar(value="256 MB")
+        ctk.CTkOptionMenu(
+            settings_frame,
+            values=list(BENCHMARK_FILE_SIZES_MB),
+            variable=self.benchmark_size_var,
+            width=100
+        ).pack(side="left", padx=5)
+
+        self.benchmark_mode_var = ctk.StringVar(value=next(iter(BENCHMARK_MODES)))
+        ctk.CTkOptionMenu(
+            settings_frame,
+            values=list(BENCHMARK_MODES),
+            variable=self.benchmark_mode_var
+        ).pack(side="left", padx=5)
+
+        self.benchmark_iterations_var = ctk.StringVar(value=BENCHMARK_ITERATIONS[0])
+        ctk.CTkLabel(settings_frame, text="Iterations:").pack(side="left", padx=(10, 5))
+        ctk.CTkOptionMenu(
+            settings_frame,
+            values=BENCHMARK_ITERATIONS,
+            variable=self.benchmark_iterations_var,
+            width=70
+        ).pack(side="left", padx=5)
         
-        # Benchmark button
-        benchmark_button = ctk.CTkButton(
-            frame,
+        # Benchmark and cancel buttons
+        button_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        button_frame.pack(pady=(0, 20))
+
+        self.benchmark_button = ctk.CTkButton(
+            button_frame,
             text="Run Benchmark",
             command=lambda: self.run_benchmark(drive_var.get(), frame)
         )
-        benchmark_button.pack(pady=(0, 20))
+        self.benchmark_button.pack(side="left", padx=5)
+
+        self.benchmark_cancel_button = ctk.CTkButton(
+            button_frame,
+            text="Cancel",
+            command=self.cancel_benchmark,
+            state="disabled"
+        )
+        self.benchmark_cancel_button.pack(side="left", padx=5)
+
+        # Batch mode: pick several drives and compare them in one pass
+        batch_frame = ctk.CTkFrame(frame)
+        batch_frame.pack(fill="x", padx=20, pady=(0, 10))
+        ctk.CTkLabel(
+            batch_frame,
+            text="Batch benchmark",
+            font=ctk.CTkFont(size=14, weight="bold")
+        ).pack(side="left", padx=10, pady=10)
+        self.batch_drive_vars = {}
+        for drive in drives:
+            var = ctk.BooleanVar(value=True)
+            ctk.CTkCheckBox(batch_frame, text=drive, variable=var, width=60).pack(side="left", padx=5)
+            self.batch_drive_vars[drive] = var
+        self.batch_button = ctk.CTkButton(
+            batch_frame,
+            text="Benchmark Selected",
+            command=self.run_batch_benchmark
+        )
+        self.batch_button.pack(side="right", padx=10, pady=10)
         
         # Results area
         results_frame = ctk.CTkFrame(frame)
         results_frame.pack(fill="x", padx=20, pady=10)
-        
-        # Add a tag to identify this frame
-        results_frame._name = "benchmark_results"
+        self.benchmark_results_frame = results_frame
+
+        # History area: trend chart and regression flags for the selected drive
+        self.benchmark_history_frame = ctk.CTkFrame(frame)
+        self.benchmark_history_frame.pack(fill="x", padx=20, pady=10)
+        self._show_benchmark_history(drive_var.get())
         
         results_label = ctk.CTkLabel(
             results_frame,
@@ -491,6 +1676,20 @@ class DiskInfoApp(ctk.CTk):
         )
         results_label.pack(pady=10)
         
+        if self.benchmark_worker is not None and self.benchmark_worker.is_alive():
+            # Page was rebuilt while a run is in flight; reattach the live widgets
+            self.benchmark_status_label = ctk.CTkLabel(
+                results_frame,
+                text="Running benchmark...",
+                font=ctk.CTkFont(size=14)
+            )
+            self.benchmark_status_label.pack(pady=(10, 5))
+            self.benchmark_progress = ctk.CTkProgressBar(results_frame, height=10)
+            self.benchmark_progress.pack(padx=15, pady=(0, 10), fill="x")
+            self.benchmark_progress.set(0)
+            self._set_benchmark_running(True)
+            return
+
         info_text = ctk.CTkLabel(
             results_frame,
             text="Click 'Run Benchmark' to test drive performance",
@@ -498,148 +1697,228 @@ class DiskInfoApp(ctk.CTk):
         )
         info_text.pack(pady=(0, 10))
 
-    # Data retrieval methods
-    def update_drive_info(self):
-        self.drive_data = self.get_drive_mappings()
-        frame = self.frames["drive_info"]
-        
+    # Disk activity page
+    def _build_monitor_page(self):
+        frame = self.page_frame("monitor")
+
         header = ctk.CTkLabel(
             frame,
-            text="Drive Information",
+            text="Disk Activity",
             font=ctk.CTkFont(size=24, weight="bold")
         )
         header.pack(pady=20)
 
-        for info in self.drive_data.values():
-            drive_title = f"📀 {info['model']}"
-            drive_content = f"Interface: {info['interface']}\nCapacity: {self.bytes_to_gb(info['size'])} GB"
-            self.create_info_card(frame, drive_title, drive_content)
-
-            for part in info["partitions"]:
-                part_title = f"💾 {part['mountpoint']}"
-                part_content = f"Used: {self.bytes_to_gb(part['used'])} GB of {self.bytes_to_gb(part['total'])} GB"
-                self.create_info_card(frame, part_title, part_content, part['percent'])
-
-    def get_drive_health(self):
-        """Get drive health information using WMI."""
-        print("DEBUG: Starting get_drive_health")
-        health_data = {}
-        try:
-            print("DEBUG: Connecting to WMI for health info")
-            wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-            service = wmi.ConnectServer(".", "root\\cimv2")
-            
-            print("DEBUG: Querying disk drives for health")
-            for disk in service.ExecQuery("SELECT * FROM Win32_DiskDrive"):
-                print(f"DEBUG: Processing health for disk {disk.DeviceID}")
-                health_data[disk.DeviceID] = {
-                    "model": disk.Model,
-                    "status": disk.Status if hasattr(disk, "Status") else "OK",
-                    "predicted_failure": False,
-                    "reason": "No issues detected",
-                    "health_percentage": 100
-                }
-                
-                try:
-                    print("DEBUG: Attempting to get SMART status")
-                    smart_service = wmi.ConnectServer(".", "root\\wmi")
-                    for smart in smart_service.ExecQuery("SELECT * FROM MSStorageDriver_FailurePredictStatus"):
-                        if disk.DeviceID in smart.InstanceName:
-                            print(f"DEBUG: Found SMART data for {disk.DeviceID}")
-                            health_data[disk.DeviceID].update({
-                                "predicted_failure": smart.PredictFailure,
-                                "reason": smart.Reason if hasattr(smart, "Reason") else "Unknown",
-                                "health_percentage": 50 if smart.PredictFailure else 100
-                            })
-                except Exception as e:
-                    print(f"DEBUG: Error getting SMART status: {e}")
-
-        except Exception as e:
-            print(f"DEBUG: Error in get_drive_health: {e}")
-            
-        return health_data
-
-    def benchmark_drive(self, mountpoint):
-        """Run read/write benchmark on specified drive."""
-        print(f"DEBUG: Starting benchmark for {mountpoint}")
-        try:
-            test_file = os.path.join(mountpoint, "benchmark_test_file")
-            data = b"0" * (1024 * 1024 * 10)  # 10 MB of data
-
-            print("DEBUG: Starting write speed test")
-            start_time = time.time()
-            with open(test_file, "wb") as f:
-                f.write(data)
-            write_time = time.time() - start_time
-            write_speed = 10 / write_time
-            print(f"DEBUG: Write speed: {write_speed:.2f} MB/s")
-
-            print("DEBUG: Starting read speed test")
-            start_time = time.time()
-            with open(test_file, "rb") as f:
-                f.read()
-            read_time = time.time() - start_time
-            read_speed = 10 / read_time
-            print(f"DEBUG: Read speed: {read_speed:.2f} MB/s")
-
-            print("DEBUG: Cleaning up test file")
-            os.remove(test_file)
-            return write_speed, read_speed
-
-        except Exception as e:
-            print(f"DEBUG: Benchmark error: {e}")
-            return None, None
+        controls = ctk.CTkFrame(frame, fg_color="transparent")
+        controls.pack(fill="x", padx=20)
+        ctk.CTkLabel(controls, text="Disk:", font=ctk.CTkFont(size=12)).pack(side="left", padx=(0, 5))
+        self.monitor_disk_menu = ctk.CTkOptionMenu(
+            controls,
+            values=["-"],
+            command=lambda _: self._draw_monitor(),
+            width=160
+        )
+        self.monitor_disk_menu.pack(side="left", padx=(0, 15))
+        ctk.CTkLabel(controls, text="Interval:", font=ctk.CTkFont(size=12)).pack(side="left", padx=(0, 5))
+        self.monitor_interval_menu = ctk.CTkOptionMenu(
+            controls,
+            values=list(MONITOR_INTERVALS),
+            command=lambda label: self.io_monitor.set_interval(MONITOR_INTERVALS[label]),
+            width=100
+        )
+        self.monitor_interval_menu.set("1 s")
+        self.monitor_interval_menu.pack(side="left")
+
+        self.monitor_stats_label = ctk.CTkLabel(frame, text="Collecting samples...", font=ctk.CTkFont(size=13))
+        self.monitor_stats_label.pack(padx=20, pady=10, anchor="w")
+
+        # All charts share one canvas; each series is a single line item whose coords are replaced per redraw
+        dark = ctk.get_appearance_mode() == "Dark"
+        text_color = "gray80" if dark else "gray20"
+        self.monitor_canvas = ctk.CTkCanvas(frame, highlightthickness=0, bg="gray15" if dark else "white")
+        self.monitor_canvas.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        self.monitor_items = []
+        for title, metrics in MONITOR_CHARTS:
+            self.monitor_items.append({
+                "title": self.monitor_canvas.create_text(0, 0, text=title, anchor="w", fill=text_color),
+                "top": self.monitor_canvas.create_text(0, 0, text="", anchor="e", fill=text_color),
+                "axis": self.monitor_canvas.create_line(0, 0, 0, 0, fill=text_color),
+                "lines": {
+                    metric: self.monitor_canvas.create_line(0, 0, 0, 0, fill=MONITOR_COLORS[metric], width=2)
+                    for metric in metrics
+                },
+                "legend": self.monitor_canvas.create_text(
+                    0, 0, anchor="e", fill=text_color,
+                    text=" / ".join("Read" if "read" in metric else "Write" for metric in metrics)
+                    if len(metrics) > 1 else ""
+                ),
+            })
+
+    def _tick_monitor(self):
+        if self.current_page != "monitor":
+            self.monitor_tick = None
+            return
+        self._draw_monitor()
+        self.monitor_tick = self.after(int(self.io_monitor.interval * 1000), self._tick_monitor)
+
+    def _draw_monitor(self):
+        """Redraw the activity charts of the selected disk from its ring buffers."""
+        disks = self.io_monitor.disks()
+        if disks:
+            self.monitor_disk_menu.configure(values=disks)
+            if self.monitor_disk_menu.get() not in disks:
+                self.monitor_disk_menu.set(disks[0])
+        disk = self.monitor_disk_menu.get()
+        latest = self.io_monitor.latest(disk)
+        if latest:
+            self.monitor_stats_label.configure(text=(
+                f"Read {self.format_speed(latest[READ_MB_S])} ({latest[READ_IOPS]:.0f} IOPS) · "
+                f"Write {self.format_speed(latest[WRITE_MB_S])} ({latest[WRITE_IOPS]:.0f} IOPS) · "
+                f"Latency {self._format_sample(latest[LATENCY_MS], ' ms')} · "
+                f"Busy {self._format_sample(latest[BUSY_PCT], '%')}"
+            ))
+
+        canvas = self.monitor_canvas
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return
+        margin, panel_height = 50, height / len(MONITOR_CHARTS)
+        capacity = self.io_monitor.capacity
+        step = (width - margin - 10) / max(capacity - 1, 1)
+
+        for index, ((title, metrics), items) in enumerate(zip(MONITOR_CHARTS, self.monitor_items)):
+            panel_top = index * panel_height
+            bottom = panel_top + panel_height - 10
+            chart_height = panel_height - 35
+            raw = {metric: self.io_monitor.series(disk, metric) for metric in metrics}
+            reported = any(value == value for values in raw.values() for value in values)
+            # NaN marks intervals without a measurement; draw them on the baseline
+            series = {metric: [0.0 if value != value else value for value in values] for metric, values in raw.items()}
+            top = max((max(values) for values in series.values() if values), default=0) * 1.1 or 1
+
+            canvas.coords(items["title"], margin, panel_top + 12)
+            canvas.itemconfigure(items["title"], text=title if reported or not latest else f"{title} - not reported")
+            canvas.coords(items["top"], margin - 5, bottom - chart_height)
+            canvas.itemconfigure(items["top"], text=f"{top:.0f}" if top >= 10 else f"{top:.1f}")
+            canvas.coords(items["axis"], margin, bottom, width - 10, bottom)
+            canvas.coords(items["legend"], width - 10, panel_top + 12)
+            for metric, values in series.items():
+                # Newest sample at the right edge
+                offset = margin + (capacity - len(values)) * step
+                points = []
+                for position, value in enumerate(values):
+                    points.extend((offset + position * step, bottom - (value / top) * chart_height))
+                canvas.coords(items["lines"][metric], *(points if len(points) >= 4 else (0, 0, 0, 0)))
+
+    def _format_sample(self, value, unit):
+        return "-" if value != value else f"{value:.1f}{unit}"  # NaN when not measured
 
     # UI update methods
+    def _snapshot_status(self, kind, loading_text):
+        """(text, is_error) while a page has no snapshot to show yet, else None."""
+        if kind in self.snapshots:
+            return None
+        error = self.snapshot_errors.get(kind)
+        if error:
+            return f"Error loading data: {error}", True
+        return loading_text, False
+
+    def _card_page(self, page, title):
+        if page not in self.card_pages:
+            self.card_pages[page] = CardPage(self.page_frame(page), title)
+        return self.card_pages[page]
+
+    def _sync_card_page(self, view, kind, loading_text, items):
+        status = self._snapshot_status(kind, loading_text)
+        if status is not None:
+            view.set_status(*status)
+        else:
+            view.clear_status()
+            view.sync(items())
+
     def update_drive_info(self):
-        self.drive_data = self.get_drive_mappings()
-        frame = self.frames["drive_info"]
-        
-        header = ctk.CTkLabel(
-            frame,
-            text="Drive Information",
-            font=ctk.CTkFont(size=24, weight="bold")
-        )
-        header.pack(pady=20)
+        view = self._card_page("drive_info", "Drive Information")
+        self._sync_card_page(view, DRIVES, "Loading drive information...", self._drive_cards)
 
-        for info in self.drive_data.values():
+    def _drive_cards(self):
+        items = []
+        for letter, info in self.snapshots[DRIVES].items():
             drive_title = f"📀 {info['model']}"
             drive_content = f"Interface: {info['interface']}\nCapacity: {self.bytes_to_gb(info['size'])} GB"
-            self.create_info_card(frame, drive_title, drive_content)
+            items.append((letter, drive_title, drive_content, None))
 
             for part in info["partitions"]:
                 part_title = f"💾 {part['mountpoint']}"
                 part_content = f"Used: {self.bytes_to_gb(part['used'])} GB of {self.bytes_to_gb(part['total'])} GB"
-                self.create_info_card(frame, part_title, part_content, part['percent'])
+                items.append(((letter, part['mountpoint']), part_title, part_content, part['percent'],
+                              ("🔍 Analyze space", lambda path=part['mountpoint']: self.show_space(path))))
+        return items
 
     def update_health_info(self):
         """Update health information display."""
-        frame = self.frames["health"]
-        health_data = self.get_drive_health()
-        
-        header = ctk.CTkLabel(
-            frame,
-            text="Drive Health Status",
-            font=ctk.CTkFont(size=24, weight="bold")
-        )
-        header.pack(pady=20)
+        view = self._card_page("health", "Drive Health Status")
+        self._sync_card_page(view, HEALTH, "Loading health information...", self._health_cards)
 
-        for drive_id, health in health_data.items():
+    def _health_cards(self):
+        items = []
+        for drive_id, health in self.snapshots[HEALTH].items():
             title = f"💿 Drive {drive_id}"
             content = f"Health Status: {'Healthy' if not health['predicted_failure'] else 'Warning'}\n"
             content += f"Reason: {health['reason']}"
-            self.create_info_card(frame, title, content, health['health_percentage'])
-
-    def update_partition_info(self, use_cache=False):
+            if health["temperature"] is not None:
+                content += f"\nTemperature: {health['temperature']} °C"
+            for attribute in health["attributes"]:
+                if attribute["key"] in KEY_ATTRIBUTES:
+                    content += "\n" + self._attribute_line(attribute)
+            items.append((drive_id, title, content, health['health_percentage']))
+        return items
+
+    def _attribute_line(self, attribute):
+        """One SMART attribute: raw value, normalized value against threshold, trend."""
+        line = f"{'⚠ ' if attribute['failing'] else ''}{attribute['name']}: {attribute['raw']:g}"
+        if attribute["threshold"] is not None:
+            line += f" (value {attribute['value']:g}, threshold {attribute['threshold']:g})"
+        if attribute["raw_per_day"]:
+            line += f" · {attribute['raw_per_day']:+.2f}/day"
+        if attribute["days_to_threshold"] is not None:
+            line += f" · threshold in ~{attribute['days_to_threshold']:.0f} days"
+        return line
+
+    def update_partition_info(self):
         """Update partition information display to emulate Windows Disk Management."""
-        frame = self.frames["partitions"]
-        
-        # Clear existing content
-        for widget in frame.winfo_children():
-            widget.destroy()
-        
+        if "partitions" not in self.card_pages:
+            self._build_partition_page()
+            self.card_pages["partitions"] = None
+
+        status = self._snapshot_status(PARTITIONS, "Loading partition information...")
+        if status is not None:
+            text, error = status
+            self.partition_status_label.configure(text=text, text_color="red" if error else self.partition_status_color)
+            if not self.partition_status_label.winfo_manager():
+                self.partition_status_label.pack(pady=10, after=self.partition_header)
+            return
+        self.partition_status_label.pack_forget()
+
+        disks = self.snapshots[PARTITIONS]
+        self.partition_disks = {
+            f"Disk {disk['number'].replace('PHYSICALDRIVE', '')} - {disk['model']}": disk for disk in disks
+        }
+        names = list(self.partition_disks) or ["-"]
+        self.partition_disk_menu.configure(values=names)
+        if self.partition_disk_menu.get() not in names:
+            self.partition_disk_menu.set(names[0])
+        self._draw_disk_layout()
+
+        model = self.partition_table.model
+        model.set_rows(self._partition_rows(disks))
+        self.partition_fs_menu.configure(values=["All"] + model.values("filesystem"))
+        self._apply_partition_filters()
+
+    def _build_partition_page(self):
+        frame = self.page_frame("partitions")
+
         header_frame = ctk.CTkFrame(frame, fg_color="transparent")
         header_frame.pack(fill="x", padx=20, pady=(20, 10))
+        self.partition_header = header_frame
         
         header = ctk.CTkLabel(
             header_frame,
@@ -652,362 +1931,165 @@ class DiskInfoApp(ctk.CTk):
         refresh_button = ctk.CTkButton(
             header_frame,
             text="🔄 Refresh",
-            command=lambda: self.show_partitions(),
+            command=self.refresh_partitions,
             width=100
         )
-
         refresh_button.pack(side="right", padx=20)
 
-        # Add loading indicator
-        loading_label = ctk.CTkLabel(
-            frame,
-            text="Loading partition information...",
-            font=ctk.CTkFont(size=14)
+        self.partition_status_label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=14))
+        self.partition_status_color = self.partition_status_label.cget("text_color")
+
+        # Layout of one disk at a time, like the graphical half of Disk Management
+        disk_frame = ctk.CTkFrame(frame, corner_radius=0, fg_color=("gray90", "gray20"))
+        disk_frame.pack(fill="x", padx=20)
+        self.partition_disks = {}
+        self.partition_disk_menu = ctk.CTkOptionMenu(
+            disk_frame,
+            values=["-"],
+            command=lambda _: self._draw_disk_layout(),
+            width=300
         )
-        loading_label.pack(pady=20)
-
-        # Use after method to allow UI to update before heavy processing
-        self.after(100, lambda: self._load_partition_data(frame, loading_label))
-
-    def _load_partition_data(self, frame, loading_label):
-        """Load partition data in background thread."""
+        self.partition_disk_menu.pack(side="left", padx=10, pady=5)
+        self.partition_disk_label = ctk.CTkLabel(disk_frame, text="", font=ctk.CTkFont(size=12), anchor="e")
+        self.partition_disk_label.pack(side="right", padx=10, pady=5)
+
+        self.partition_bar = ctk.CTkFrame(frame, corner_radius=0, height=60, fg_color=("gray95", "gray15"))
+        self.partition_bar.pack(fill="x", padx=20, pady=(0, 10))
+
+        # Filters apply to the table's data, not its widgets
+        filter_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        filter_frame.pack(fill="x", padx=20, pady=(0, 5))
+        ctk.CTkLabel(filter_frame, text="File system:", font=ctk.CTkFont(size=12)).pack(side="left", padx=(0, 5))
+        self.partition_fs_menu = ctk.CTkOptionMenu(
+            filter_frame,
+            values=["All"],
+            command=lambda _: self._apply_partition_filters(),
+            width=110
+        )
+        self.partition_fs_menu.pack(side="left", padx=(0, 15))
+        self.partition_letter_entry = ctk.CTkEntry(filter_frame, placeholder_text="Partition", width=110)
+        self.partition_letter_entry.pack(side="left", padx=(0, 15))
+        self.partition_used_entry = ctk.CTkEntry(filter_frame, placeholder_text="Min % used", width=110)
+        self.partition_used_entry.pack(side="left", padx=(0, 15))
+        for entry in (self.partition_letter_entry, self.partition_used_entry):
+            entry.bind("<KeyRelease>", lambda _: self._apply_partition_filters())
+        self.partition_count_label = ctk.CTkLabel(filter_frame, text="", font=ctk.CTkFont(size=12))
+        self.partition_count_label.pack(side="right")
+
+        columns = [
+            Column("disk", "Disk", 90),
+            Column("letter", "Partition", 150),
+            Column("kind", "Type"),
+            Column("filesystem", "File System"),
+            Column("status", "Status"),
+            Column("size", "Capacity", format=lambda size: f"{self.bytes_to_gb(size)} GB"),
+            Column("percent", "% Used", format=lambda percent: f"{percent}%"),
+        ]
+        self.partition_table = VirtualTable(frame, TableModel(columns))
+        self.partition_table.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+    def _partition_rows(self, disks):
+        rows = []
+        for disk in disks:
+            for part in disk['partitions']:
+                if part['is_unallocated']:
+                    continue
+                if part['kind'] == "reserved":
+                    kind = "Reserved"
+                else:
+                    kind = "Primary" if part['primary'] else "Logical"
+                rows.append({
+                    "disk": f"Disk {disk['number'].replace('PHYSICALDRIVE', '')}",
+                    "letter": part['label'],
+                    "kind": kind,
+                    "filesystem": part['filesystem'] or "Unknown",
+                    "status": "Healthy",
+                    "size": part['size'],
+                    # Of the file system, which may be smaller than the partition holding it
+                    "percent": round(part['used'] / part['capacity'] * 100, 1) if part['capacity'] else None,
+                })
+        return rows
+
+    def _apply_partition_filters(self):
+        model = self.partition_table.model
+        filesystem = self.partition_fs_menu.get()
+        model.set_filter("filesystem", equals(None if filesystem == "All" else filesystem))
+        model.set_filter("letter", contains(self.partition_letter_entry.get()))
         try:
-            wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-            service = wmi.ConnectServer(".", "root\\cimv2")
+            minimum = float(self.partition_used_entry.get())
+        except ValueError:
+            minimum = None
+        model.set_filter("percent", at_least(minimum))
+        self.partition_count_label.configure(text=f"{len(model)} of {len(model.rows)} partitions")
+        self.partition_table.refresh()
+
+    def _draw_disk_layout(self):
+        """Draw the partition bar of the disk selected in the disk menu."""
+        for widget in self.partition_bar.winfo_children():
+            widget.destroy()
+        disk = self.partition_disks.get(self.partition_disk_menu.get())
+        if disk is None:
+            self.partition_disk_label.configure(text="")
+            return
+        self.partition_disk_label.configure(
+            text=f"Basic · Online · {self.bytes_to_gb(disk['size'])} GB · "
+                 f"Unallocated: {self.bytes_to_gb(disk['unallocated'])} GB"
+        )
 
-            # Remove loading indicator when done
-            loading_label.destroy()
+        # Calculate total width
+        total_width = self.partition_bar.winfo_width() if self.partition_bar.winfo_width() > 1 else 800
+        
+        # Create partition blocks
+        for part in disk['partitions']:
+            part_width = max(int((part['size'] / disk['size']) * total_width), 50) if disk['size'] else 50
             
-            # Get physical disk information first
-            for disk in service.ExecQuery("SELECT * FROM Win32_DiskDrive"):
-                # Create a container for this disk
-                disk_container = ctk.CTkFrame(frame, corner_radius=0, fg_color="transparent")
-                disk_container.pack(fill="x", padx=20, pady=(0, 30), anchor="n")
-                
-                # Disk header with model and size
-                disk_id = disk.DeviceID.split('\\')[-1]
-                total_size_gb = round(int(disk.Size) / (1024**3), 2)
-                
-                disk_header_frame = ctk.CTkFrame(disk_container, corner_radius=0, fg_color=("gray90", "gray20"))
-                disk_header_frame.pack(fill="x", pady=(0, 1))
-                
-                disk_header = ctk.CTkLabel(
-                    disk_header_frame,
-                    text=f"{disk_id} {disk.Model}",
-                    font=ctk.CTkFont(size=14, weight="bold"),
-                    anchor="w"
-                )
-                disk_header.pack(side="left", padx=10, pady=5)
-                
-                disk_size = ctk.CTkLabel(
-                    disk_header_frame,
-                    text=f"Total size: {total_size_gb} GB",
-                    font=ctk.CTkFont(size=12),
-                    anchor="e"
-                )
-                disk_size.pack(side="right", padx=10, pady=5)
-                
-                # Create disk info section (similar to Windows Disk Management)
-                disk_info_frame = ctk.CTkFrame(disk_container, corner_radius=0, height=120, fg_color=("gray95", "gray15"))
-                disk_info_frame.pack(fill="x")
-                disk_info_frame.pack_propagate(False)
-                
-                # Left side - Basic disk info
-                basic_info_frame = ctk.CTkFrame(disk_info_frame, corner_radius=0, width=200, fg_color="transparent")
-                basic_info_frame.pack(side="left", fill="y", padx=10, pady=10)
-                
-                # Disk number
-                disk_num_label = ctk.CTkLabel(
-                    basic_info_frame,
-                    text=f"Disk {disk_id.replace('PHYSICALDRIVE', '')}",
-                    font=ctk.CTkFont(size=14, weight="bold"),
-                    anchor="w"
+            if part.get('is_unallocated', False):
+                # Unallocated space - black hatched pattern
+                part_frame = ctk.CTkFrame(
+                    self.partition_bar, 
+                    width=part_width, 
+                    height=60, 
+                    corner_radius=0,
+                    fg_color=("gray80", "gray30"),
+                    border_width=1,
+                    border_color=("gray60", "gray40")
                 )
-                disk_num_label.pack(anchor="w", pady=(5, 2))
+                part_frame.pack(side="left", padx=1)
+                part_frame.pack_propagate(False)
                 
-                # Basic disk status
-                status_label = ctk.CTkLabel(
-                    basic_info_frame,
-                    text="Basic",
-                    font=ctk.CTkFont(size=12),
-                    anchor="w"
+                label = ctk.CTkLabel(
+                    part_frame,
+                    text=f"Unallocated\n{self.bytes_to_gb(part['size'])} GB",
+                    font=ctk.CTkFont(size=11),
+                    text_color=("gray20", "gray90")
                 )
-                status_label.pack(anchor="w", pady=2)
-                
-                # Online status
-                online_label = ctk.CTkLabel(
-                    basic_info_frame,
-                    text="Online",
-                    font=ctk.CTkFont(size=12),
-                    anchor="w"
+                label.pack(expand=True)
+            else:
+                # Partition - blue when it holds a mounted volume, slate for EFI, recovery and reserved areas
+                mounted = part['letter'] is not None
+                part_frame = ctk.CTkFrame(
+                    self.partition_bar, 
+                    width=part_width, 
+                    height=60, 
+                    corner_radius=0,
+                    fg_color=("#3498db", "#2980b9") if mounted else ("#7f8c8d", "#5d6d7e"),
+                    border_width=1,
+                    border_color=("gray60", "gray40")
                 )
-                online_label.pack(anchor="w", pady=2)
-                
-                # Capacity
-                capacity_label = ctk.CTkLabel(
-                    basic_info_frame,
-                    text=f"{total_size_gb} GB",
-                    font=ctk.CTkFont(size=12),
-                    anchor="w"
+                part_frame.pack(side="left", padx=1)
+                part_frame.pack_propagate(False)
+
+                # Partition label with drive letter (or role) and size
+                label = ctk.CTkLabel(
+                    part_frame,
+                    text=f"{part['label']}\n{self.bytes_to_gb(part['size'])} GB\n{part['filesystem'] or ''}",
+                    font=ctk.CTkFont(size=11, weight="bold"),
+                    text_color=("white", "white")
                 )
-                capacity_label.pack(anchor="w", pady=2)
-                
-                # Unallocated space
-                unallocated_label = ctk.CTkLabel(
-                    basic_info_frame,
-                    text="Calculating...",
-                    font=ctk.CTkFont(size=12),
-                    anchor="w"
-                )
-                unallocated_label.pack(anchor="w", pady=2)
-                
-                # Right side - Partition layout
-                partition_layout = ctk.CTkFrame(disk_info_frame, corner_radius=0, fg_color="transparent")
-                partition_layout.pack(side="right", fill="both", expand=True, padx=10, pady=10)
-                
-                # Get all partitions for this disk
-                partitions = []
-                unallocated_start = 0
-                for partition in service.ExecQuery(f"ASSOCIATORS OF {{Win32_DiskDrive.DeviceID='{disk.DeviceID}'}} WHERE AssocClass = Win32_DiskDriveToDiskPartition"):
-                    for logical_disk in service.ExecQuery(f"ASSOCIATORS OF {{Win32_DiskPartition.DeviceID='{partition.DeviceID}'}} WHERE AssocClass = Win32_LogicalDiskToPartition"):
-                        try:
-                            usage = psutil.disk_usage(logical_disk.DeviceID)
-                            start_offset = int(partition.StartingOffset) if hasattr(partition, 'StartingOffset') else unallocated_start
-                            
-                            # Check for unallocated space before this partition
-                            if start_offset > unallocated_start:
-                                unallocated_size = start_offset - unallocated_start
-                                partitions.append({
-                                    'start': unallocated_start,
-                                    'size': unallocated_size,
-                                    'is_unallocated': True
-                                })
-                            
-                            partitions.append({
-                                'start': start_offset,
-                                'size': usage.total,
-                                'used': usage.used,
-                                'letter': logical_disk.DeviceID,
-                                'filesystem': logical_disk.FileSystem,
-                                'type': partition.Type,
-                                'bootable': partition.Bootable,
-                                'primary': partition.PrimaryPartition,
-                                'is_unallocated': False
-                            })
-                            unallocated_start = start_offset + usage.total
-                        except (PermissionError, FileNotFoundError):
-                            continue
-
-                # Add final unallocated space if any
-                if unallocated_start < int(disk.Size):
-                    partitions.append({
-                        'start': unallocated_start,
-                        'size': int(disk.Size) - unallocated_start,
-                        'is_unallocated': True
-                    })
-
-                # Sort partitions by start position
-                partitions.sort(key=lambda x: x['start'])
-                
-                # Calculate total unallocated space
-                unallocated_space = sum(part['size'] for part in partitions if part.get('is_unallocated', False))
-                unallocated_label.configure(text=f"Unallocated: {self.bytes_to_gb(unallocated_space)} GB")
-
-                # Create visual representation of partitions
-                partition_bar = ctk.CTkFrame(partition_layout, corner_radius=0, height=60, fg_color="transparent")
-                partition_bar.pack(fill="x")
-                
-                # Calculate total width
-                total_width = partition_layout.winfo_width() if partition_layout.winfo_width() > 1 else 800
-                
-                # Create partition blocks
-                for part in partitions:
-                    part_width = max(int((part['size'] / int(disk.Size)) * total_width), 50)
-                    
-                    if part.get('is_unallocated', False):
-                        # Unallocated space - black hatched pattern
-                        part_frame = ctk.CTkFrame(
-                            partition_bar, 
-                            width=part_width, 
-                            height=60, 
-                            corner_radius=0,
-                            fg_color=("gray80", "gray30"),
-                            border_width=1,
-                            border_color=("gray60", "gray40")
-                        )
-                        part_frame.pack(side="left", padx=1)
-                        part_frame.pack_propagate(False)
-                        
-                        label = ctk.CTkLabel(
-                            part_frame,
-                            text=f"Unallocated\n{self.bytes_to_gb(part['size'])} GB",
-                            font=ctk.CTkFont(size=11),
-                            text_color=("gray20", "gray90")
-                        )
-                        label.pack(expand=True)
-                    else:
-                        # Regular partition - blue for primary
-                        part_frame = ctk.CTkFrame(
-                            partition_bar, 
-                            width=part_width, 
-                            height=60, 
-                            corner_radius=0,
-                            fg_color=("#3498db", "#2980b9"),
-                            border_width=1,
-                            border_color=("gray60", "gray40")
-                        )
-                        part_frame.pack(side="left", padx=1)
-                        part_frame.pack_propagate(False)
-
-                        # Partition label with drive letter and size
-                        label = ctk.CTkLabel(
-                            part_frame,
-                            text=f"{part['letter']}\n{self.bytes_to_gb(part['size'])} GB\n{part['filesystem']}",
-                            font=ctk.CTkFont(size=11, weight="bold"),
-                            text_color=("white", "white")
-                        )
-                        label.pack(expand=True)
-                
-                # Create partition details table
-                details_frame = ctk.CTkFrame(disk_container, corner_radius=0, fg_color=("white", "gray10"))
-                details_frame.pack(fill="x")
-                
-                # Table headers
-                headers = ["Partition", "Type", "File System", "Status", "Capacity", "% Used"]
-                header_frame = ctk.CTkFrame(details_frame, corner_radius=0, fg_color=("gray90", "gray20"))
-                header_frame.pack(fill="x")
-                
-                for i, header in enumerate(headers):
-                    header_label = ctk.CTkLabel(
-                        header_frame,
-                        text=header,
-                        font=ctk.CTkFont(size=12, weight="bold"),
-                        width=120 if i > 0 else 150
-                    )
-                    header_label.pack(side="left", padx=5, pady=5)
-                
-                # Table rows for each partition
-                for part in partitions:
-                    if not part.get('is_unallocated', False):
-                        row_frame = ctk.CTkFrame(details_frame, corner_radius=0, fg_color="transparent")
-                        row_frame.pack(fill="x", pady=1)
-                        
-                        # Partition letter
-                        part_label = ctk.CTkLabel(
-                            row_frame,
-                            text=part['letter'],
-                            font=ctk.CTkFont(size=12),
-                            width=150
-                        )
-                        part_label.pack(side="left", padx=5, pady=5)
-                        
-                        # Type
-                        type_label = ctk.CTkLabel(
-                            row_frame,
-                            text="Primary" if part.get('primary', True) else "Logical",
-                            font=ctk.CTkFont(size=12),
-                            width=120
-                        )
-                        type_label.pack(side="left", padx=5, pady=5)
-                        
-                        # File System
-                        fs_label = ctk.CTkLabel(
-                            row_frame,
-                            text=part.get('filesystem', 'Unknown'),
-                            font=ctk.CTkFont(size=12),
-                            width=120
-                        )
-                        fs_label.pack(side="left", padx=5, pady=5)
-                        
-                        # Status
-                        status_label = ctk.CTkLabel(
-                            row_frame,
-                            text="Healthy",
-                            font=ctk.CTkFont(size=12),
-                            width=120
-                        )
-                        status_label.pack(side="left", padx=5, pady=5)
-                        
-                        # Capacity
-                        capacity_label = ctk.CTkLabel(
-                            row_frame,
-                            text=f"{self.bytes_to_gb(part['size'])} GB",
-                            font=ctk.CTkFont(size=12),
-                            width=120
-                        )
-                        capacity_label.pack(side="left", padx=5, pady=5)
-                        
-                        # % Used
-                        percent_used = round((part['used'] / part['size']) * 100, 1) if 'used' in part else 0
-                        percent_label = ctk.CTkLabel(
-                            row_frame,
-                            text=f"{percent_used}%",
-                            font=ctk.CTkFont(size=12),
-                            width=120
-                        )
-                        percent_label.pack(side="left", padx=5, pady=5)
-
-        except Exception as e:
-            print(f"Error updating partition info: {e}")
-            error_label = ctk.CTkLabel(
-                frame,
-                text=f"Error loading partition information: {str(e)}",
-                text_color="red"
-            )
-            error_label.pack(pady=20)
-
-    def update_drive_details(self, drive_data):
-        """Update drive details with WMI information in background."""
-        print("DEBUG: Starting update_drive_details")
-        try:
-            print("DEBUG: Connecting to WMI")
-            # In your _load_partition_data method, wrap the WMI queries in try-except blocks:
-            try:
-                wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-                service = wmi.ConnectServer(".", "root\\cimv2")
-                
-                print("DEBUG: Querying disk drives")
-                for disk in service.ExecQuery("SELECT * FROM Win32_DiskDrive"):
-                    print(f"DEBUG: Processing disk {disk.DeviceID}")
-                    for partition in service.ExecQuery(f"ASSOCIATORS OF {{Win32_DiskDrive.DeviceID='{disk.DeviceID}'}} WHERE AssocClass = Win32_DiskDriveToDiskPartition"):
-                        print(f"DEBUG: Found partition {partition.DeviceID}")
-                        for logical_disk in service.ExecQuery(f"ASSOCIATORS OF {{Win32_DiskPartition.DeviceID='{partition.DeviceID}'}} WHERE AssocClass = Win32_LogicalDiskToPartition"):
-                            drive_letter = logical_disk.DeviceID.rstrip('\\')
-                            print(f"DEBUG: Updating info for drive {drive_letter}")
-                            if drive_letter in drive_data:
-                                drive_data[drive_letter]["model"] = disk.Model
-                                drive_data[drive_letter]["interface"] = disk.InterfaceType
-                    
-                print("DEBUG: Updating display with new information")
-                self.drive_data = drive_data
-                # Instead of calling update_drive_info which would start the cycle again,
-                # we'll update the display directly
-                frame = self.frames["drive_info"]
-                self.clear_frame("drive_info")
-                
-                header = ctk.CTkLabel(
-                    frame,
-                    text="Drive Information",
-                    font=ctk.CTkFont(size=24, weight="bold")
-                )
-                header.pack(pady=20)
-
-                for info in self.drive_data.values():
-                    drive_title = f"📀 {info['model']}"
-                    drive_content = f"Interface: {info['interface']}\nCapacity: {self.bytes_to_gb(info['size'])} GB"
-                    self.create_info_card(frame, drive_title, drive_content)
-
-                    for part in info["partitions"]:
-                        part_title = f"💾 {part['mountpoint']}"
-                        part_content = f"Used: {self.bytes_to_gb(part['used'])} GB of {self.bytes_to_gb(part['total'])} GB"
-                        self.create_info_card(frame, part_title, part_content, part['percent'])    
-
-            except Exception as e:
-                print(f"DEBUG: Error in update_drive_details: {e}")
-                
-        except Exception as e:
-                print(f"DEBUG: Error in update_drive_details: {e}")
+                label.pack(expand=True)
 
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # Duplicate hashing starts worker processes from a frozen build
     app = DiskInfoApp()
     app.mainloop()
\ No newline at end of file
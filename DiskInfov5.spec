@@ -10,7 +10,8 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Never imported by the app; keeping them out shrinks what the one-file exe unpacks on every launch
+    excludes=['numpy', 'pandas', 'matplotlib', 'scipy', 'IPython', 'pytest', 'tkinter.test', 'lib2to3', 'pydoc_data'],
     noarchive=False,
     optimize=0,
 )
@@ -26,7 +27,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,  # UPX-packed DLLs are decompressed (and often virus-scanned) on each start
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,
@@ -0,0 +1,5 @@
+"""Reusable, UI-independent building blocks for Disk Info.
+
+Nothing in this package imports Tk, so it can be used from scripts and
+headless tools as well as from the DiskInfov5 window.
+"""
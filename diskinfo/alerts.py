@@ -0,0 +1,414 @@
+"""Background health and capacity alerts.
+
+An `AlertMonitor` polls volume usage (psutil.disk_usage) and drive health
+(`collector.collect_health`) on a `Scheduler` whose intervals are jittered,
+so several monitors, or a monitor and the GUI, don't query WMI in lockstep.
+Each snapshot goes through the `AlertEngine`'s rules:
+
+    PercentFullRule   volume % full
+    TimeToFullRule    hours until a volume fills at its recent fill rate
+    SmartRule         predicted failure, failing or trending SMART attributes
+    TemperatureRule   drive temperature
+
+A rule measures one value per subject (volume or disk); its `Limits` turn
+the value into OK, WARNING or CRITICAL with hysteresis, so a volume
+hovering around 85% doesn't flap. The engine only notifies when a
+subject's level changes (including recovery) or an active alert is older
+than `repeat`, and a token bucket caps notifications per hour across all
+rules. Sinks receive `Alert`s: stdout, an NDJSON log file, a webhook
+(JSON POST), a desktop toast or any callback.
+"""
+
+import heapq
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+log = logging.getLogger(__name__)
+
+OK = 0
+WARNING = 1
+CRITICAL = 2
+SEVERITY_NAMES = {OK: "ok", WARNING: "warning", CRITICAL: "critical"}
+
+USAGE_SOURCE = "usage"
+HEALTH_SOURCE = "health"
+
+REPEAT_INTERVAL = 6 * 3600  # Re-send a still-active alert this often
+MAX_PER_HOUR = 30
+USAGE_INTERVAL = 60
+HEALTH_INTERVAL = 600  # Matches the SMART cache TTL
+JITTER = 0.1  # Each interval is stretched or shrunk by up to this fraction
+
+
+@dataclass(frozen=True)
+class Alert:
+    rule: str
+    subject: str  # Mountpoint or disk DeviceID
+    severity: int
+    message: str
+    value: float
+    timestamp: float
+
+    @property
+    def resolved(self):
+        return self.severity == OK
+
+    def to_dict(self):
+        return dict(asdict(self), severity=SEVERITY_NAMES[self.severity], resolved=self.resolved)
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Warning/critical thresholds with hysteresis.
+
+    When `critical` is below `warning`, lower values are worse (e.g. hours
+    to full). A level is only left once the value is `hysteresis` past the
+    threshold that raised it.
+    """
+    warning: float
+    critical: float
+    hysteresis: float = 0
+
+    def level(self, value, previous=OK):
+        if value is None:
+            return OK
+        higher_is_worse = self.critical >= self.warning
+        for level, threshold in ((CRITICAL, self.critical), (WARNING, self.warning)):
+            if level <= previous:
+                threshold += -self.hysteresis if higher_is_worse else self.hysteresis
+            if value >= threshold if higher_is_worse else value <= threshold:
+                return level
+        return OK
+
+
+class Rule:
+    """Turns a snapshot into (subject, value, message) measurements judged by `limits`."""
+    name = None
+    source = None
+
+    def __init__(self, limits):
+        self.limits = limits
+
+    def measure(self, snapshot, now):
+        raise NotImplementedError
+
+
+class PercentFullRule(Rule):
+    name = "percent_full"
+    source = USAGE_SOURCE
+
+    def __init__(self, limits=Limits(warning=85, critical=95, hysteresis=2)):
+        super().__init__(limits)
+
+    def measure(self, snapshot, now):
+        for mountpoint, usage in snapshot.items():
+            yield mountpoint, usage.percent, f"{mountpoint} is {usage.percent:.0f}% full"
+
+
+class TimeToFullRule(Rule):
+    """Hours until a volume is full, from its growth over the last `window` seconds."""
+    name = "time_to_full"
+    source = USAGE_SOURCE
+
+    def __init__(self, limits=Limits(warning=72, critical=24, hysteresis=6), window=6 * 3600, min_span=900):
+        super().__init__(limits)
+        self.window = window
+        self.min_span = min_span  # Shorter histories say more about noise than about fill rate
+        self._samples = {}  # mountpoint -> deque of (timestamp, used)
+
+    def measure(self, snapshot, now):
+        for mountpoint, usage in snapshot.items():
+            samples = self._samples.setdefault(mountpoint, deque())
+            samples.append((now, usage.used))
+            while samples and now - samples[0][0] > self.window:
+                samples.popleft()
+            span = now - samples[0][0]
+            growth = usage.used - samples[0][1]
+            if span < self.min_span or growth <= 0:
+                yield mountpoint, None, f"{mountpoint} is not filling up"
+                continue
+            hours = usage.free / (growth / span) / 3600
+            yield mountpoint, hours, (f"{mountpoint} is filling at {growth / span * 3600 / 1024 ** 3:.2f} GB/h "
+                                      f"and will be full in ~{hours:.0f} h")
+
+
+class SmartRule(Rule):
+    """Predicted failure or an attribute past its threshold is critical; wear or a trend toward one warns."""
+    name = "smart"
+    source = HEALTH_SOURCE
+
+    def __init__(self, limits=Limits(warning=WARNING, critical=CRITICAL), min_health=70, horizon_days=30):
+        super().__init__(limits)
+        self.min_health = min_health
+        self.horizon_days = horizon_days
+
+    def measure(self, snapshot, now):
+        for device_id, health in snapshot.items():
+            failing = [attribute["name"] for attribute in health["attributes"] if attribute["failing"]]
+            trending = [
+                f"{attribute['name']} (~{attribute['days_to_threshold']:.0f} days)"
+                for attribute in health["attributes"]
+                if attribute["days_to_threshold"] is not None and attribute["days_to_threshold"] < self.horizon_days
+            ]
+            if health["predicted_failure"] or failing:
+                yield device_id, CRITICAL, f"{health['model']} ({device_id}) predicts failure: {health['reason']}"
+            elif health["health_percentage"] < self.min_health or trending:
+                detail = f"heading for threshold: {', '.join(trending)}" if trending else "wear is high"
+                yield device_id, WARNING, f"{health['model']} ({device_id}) at {health['health_percentage']}% health, {detail}"
+            else:
+                yield device_id, OK, f"{health['model']} ({device_id}) is healthy"
+
+
+class TemperatureRule(Rule):
+    name = "temperature"
+    source = HEALTH_SOURCE
+
+    def __init__(self, limits=Limits(warning=55, critical=65, hysteresis=3)):
+        super().__init__(limits)
+
+    def measure(self, snapshot, now):
+        for device_id, health in snapshot.items():
+            if health["temperature"] is not None:
+                yield device_id, health["temperature"], f"{health['model']} ({device_id}) is at {health['temperature']} °C"
+
+
+def default_rules():
+    return [PercentFullRule(), TimeToFullRule(), SmartRule(), TemperatureRule()]
+
+
+class _State:
+    __slots__ = ("level", "notified_at")
+
+    def __init__(self):
+        self.level = OK
+        self.notified_at = None
+
+
+class AlertEngine:
+    """Applies rules to snapshots and sends deduplicated, rate-limited alerts to sinks."""
+
+    def __init__(self, rules=None, sinks=(), repeat=REPEAT_INTERVAL, max_per_hour=MAX_PER_HOUR, clock=time.time):
+        self.rules = default_rules() if rules is None else list(rules)
+        self.sinks = list(sinks)
+        self.repeat = repeat
+        self.max_per_hour = max_per_hour
+        self.clock = clock
+        self.suppressed = 0  # Alerts dropped by the rate limit
+        self._states = {}  # (rule name, subject) -> _State
+        self._tokens = float(max_per_hour)
+        self._refilled_at = None
+        self._lock = threading.Lock()
+
+    def _take_token(self, now):
+        if self._refilled_at is not None:
+            self._tokens = min(self.max_per_hour, self._tokens + (now - self._refilled_at) * self.max_per_hour / 3600)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def evaluate(self, source, snapshot, now=None):
+        """Run every rule for `source` over `snapshot`; returns the alerts that were sent."""
+        now = self.clock() if now is None else now
+        sent = []
+        with self._lock:
+            for rule in self.rules:
+                if rule.source != source:
+                    continue
+                for subject, value, message in rule.measure(snapshot, now):
+                    state = self._states.setdefault((rule.name, subject), _State())
+                    level = rule.limits.level(value, state.level)
+                    changed = level != state.level
+                    repeating = level != OK and now - (state.notified_at or 0) >= self.repeat
+                    if not changed and not repeating:
+                        continue
+                    if not self._take_token(now):
+                        # Leave the state alone so the transition is retried on the next evaluation
+                        self.suppressed += 1
+                        log.warning("Alert rate limit reached; dropped %s for %s", rule.name, subject)
+                        continue
+                    state.level = level
+                    state.notified_at = now
+                    sent.append(Alert(rule.name, subject, level, message, value, now))
+        for alert in sent:
+            self._send(alert)
+        return sent
+
+    def _send(self, alert):
+        for sink in self.sinks:
+            try:
+                sink.send(alert)
+            except Exception as e:
+                # One broken sink (webhook down, log disk full) must not silence the others
+                log.warning("Alert sink %s failed: %s", type(sink).__name__, e)
+
+    def active(self):
+        """{(rule name, subject): severity} of every alert currently raised."""
+        with self._lock:
+            return {key: state.level for key, state in self._states.items() if state.level != OK}
+
+
+class StdoutSink:
+    def __init__(self, stream=None, as_json=False):
+        self.stream = stream or sys.stdout
+        self.as_json = as_json
+
+    def send(self, alert):
+        if self.as_json:
+            self.stream.write(json.dumps(alert.to_dict()) + "\n")
+        else:
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(alert.timestamp))
+            label = "RESOLVED" if alert.resolved else SEVERITY_NAMES[alert.severity].upper()
+            self.stream.write(f"{stamp} {label:<8} {alert.rule}: {alert.message}\n")
+        self.stream.flush()
+
+
+class LogFileSink:
+    """Appends one JSON line per alert."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alert):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(alert.to_dict()) + "\n")
+
+
+class WebhookSink:
+    """POSTs each alert as JSON, e.g. to a local automation endpoint."""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alert):
+        import urllib.request
+        request = urllib.request.Request(
+            self.url, data=json.dumps(alert.to_dict()).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class ToastSink:
+    """Desktop notification through the optional `plyer` package."""
+
+    def __init__(self, app_name="DiskInfo"):
+        try:
+            from plyer import notification
+        except ImportError as e:
+            raise RuntimeError("Toast alerts need the 'plyer' package (pip install plyer)") from e
+        self.notification = notification
+        self.app_name = app_name
+
+    def send(self, alert):
+        label = "Resolved" if alert.resolved else SEVERITY_NAMES[alert.severity].capitalize()
+        self.notification.notify(title=f"{self.app_name}: {label}", message=alert.message, app_name=self.app_name)
+
+
+class CallbackSink:
+    """Hands alerts to a function, e.g. one that queues them for the GUI thread."""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def send(self, alert):
+        self.callback(alert)
+
+
+class Scheduler(threading.Thread):
+    """Runs jobs periodically on one thread, each interval jittered by ±`jitter`."""
+
+    def __init__(self, jitter=JITTER, rng=random.random):
+        super().__init__(name="diskinfo-alerts", daemon=True)
+        self.jitter = jitter
+        self.rng = rng
+        self._jobs = []
+        self._seq = 0
+        self._halt = threading.Event()
+
+    def _jittered(self, interval):
+        return interval * (1 + self.jitter * (2 * self.rng() - 1))
+
+    def add(self, interval, job, delay=0):
+        """Run `job()` every ~`interval` seconds, first after `delay` plus up to `jitter` of an interval."""
+        self._seq += 1
+        first = time.monotonic() + delay + interval * self.jitter * self.rng()
+        heapq.heappush(self._jobs, (first, self._seq, interval, job))
+
+    def stop(self):
+        self._halt.set()
+
+    def run(self):
+        while self._jobs and not self._halt.is_set():
+            due, seq, interval, job = self._jobs[0]
+            if self._halt.wait(max(0.0, due - time.monotonic())):
+                return
+            heapq.heapreplace(self._jobs, (time.monotonic() + self._jittered(interval), seq, interval, job))
+            try:
+                job()
+            except Exception as e:
+                log.warning("Alert check %s failed: %s", getattr(job, "__name__", job), e)
+
+
+def volume_usage():
+    """{mountpoint: psutil usage} of every readable mounted volume."""
+    import psutil
+    usage = {}
+    for partition in psutil.disk_partitions():
+        try:
+            usage[partition.mountpoint] = psutil.disk_usage(partition.mountpoint)
+        except OSError as e:
+            log.debug("Skipping %s: %s", partition.mountpoint, e)
+    return usage
+
+
+class AlertMonitor:
+    """Polls usage and health on a jittered schedule and feeds them to an AlertEngine.
+
+    `cache`, `provider` and `history` are passed to collect_health, so the
+    GUI can share its DataCache and SMART history with the monitor.
+    """
+
+    def __init__(self, engine, cache=None, provider=None, history=None,
+                 usage_interval=USAGE_INTERVAL, health_interval=HEALTH_INTERVAL, jitter=JITTER):
+        if cache is None:
+            from .cache import DataCache
+            cache = DataCache()
+        self.engine = engine
+        self.cache = cache
+        self.provider = provider
+        self.history = history
+        self.usage_interval = usage_interval
+        self.health_interval = health_interval
+        self.jitter = jitter
+        self.scheduler = None
+
+    def check_usage(self):
+        return self.engine.evaluate(USAGE_SOURCE, volume_usage())
+
+    def check_health(self):
+        from .collector import collect_health
+        return self.engine.evaluate(HEALTH_SOURCE, collect_health(self.cache, self.provider, self.history))
+
+    def run_once(self):
+        return self.check_usage() + self.check_health()
+
+    def start(self, delay=0):
+        """Start polling in the background; `delay` postpones the first checks (e.g. past app startup)."""
+        self.scheduler = Scheduler(self.jitter)
+        self.scheduler.add(self.usage_interval, self.check_usage, delay)
+        self.scheduler.add(self.health_interval, self.check_health, delay)
+        self.scheduler.start()
+
+    def stop(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
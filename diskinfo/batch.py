@@ -0,0 +1,161 @@
+"""Benchmark many mountpoints in one batch.
+
+Jobs are grouped by the physical disk behind each mountpoint. Groups run in
+parallel (up to `max_parallel`), while partitions that share a disk run one
+after another so they don't compete for the same spindle or controller
+queue and skew each other's numbers.
+"""
+
+import logging
+import os
+import queue
+import sys
+import threading
+from dataclasses import dataclass, field, replace
+
+from .benchmark import DEFAULT_PROFILES, BenchmarkCancelled, run_benchmark
+from .topology import load_topology
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_PARALLEL = 4
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    mountpoint: str
+    device: str = None  # Block device or volume name, used to find the disk
+    disk: str = None  # Physical disk key; jobs with the same key never overlap
+
+
+@dataclass
+class BatchResult:
+    mountpoint: str
+    disk: str
+    results: list = field(default_factory=list)
+    error: str = None
+
+
+def physical_disk_key(mountpoint, device=None, topology=None):
+    """Best-effort identifier of the physical disk holding `mountpoint`.
+
+    Windows looks the volume up in the disk topology, Linux walks from the
+    partition's block device up to its parent in /sys/class/block. When
+    neither works the mountpoint itself is used, which keeps the job safe to
+    run but lets it overlap with its siblings.
+    """
+    try:
+        if sys.platform == "win32":
+            topology = topology or load_topology(include_smart=False)
+            disk = topology.disk_for_volume(mountpoint)
+            if disk is not None:
+                return disk.number
+        elif device and device.startswith("/dev/"):
+            return _sysfs_disk_key(device)
+    except Exception as e:
+        log.debug("Could not resolve physical disk for %s: %s", mountpoint, e)
+    return mountpoint
+
+
+def resolve_disks(jobs):
+    """Fill in each job's disk key, loading the topology at most once."""
+    topology = None
+    if sys.platform == "win32" and any(not job.disk for job in jobs):
+        try:
+            topology = load_topology(include_smart=False)
+        except Exception as e:
+            log.debug("Could not load disk topology: %s", e)
+    return [job if job.disk else replace(job, disk=physical_disk_key(job.mountpoint, job.device, topology))
+            for job in jobs]
+
+
+def _sysfs_disk_key(device):
+    name = os.path.basename(os.path.realpath(device))
+    sys_path = os.path.realpath(os.path.join("/sys/class/block", name))
+    if os.path.exists(os.path.join(sys_path, "partition")):
+        return os.path.basename(os.path.dirname(sys_path))
+    return name
+
+
+def plan_batches(jobs):
+    """Group jobs by disk, keeping the caller's order inside each group."""
+    groups = {}
+    for job in jobs:
+        groups.setdefault(job.disk, []).append(job)
+    return list(groups.values())
+
+
+class BatchBenchmark(threading.Thread):
+    """Run a list of BatchJob and stream events through a queue.
+
+    Events are tuples: ("progress", mountpoint, phase, done, total, mb_per_s),
+    ("result", BatchResult), then a final ("done", [BatchResult, ...]) or
+    ("cancelled", [BatchResult, ...]) with whatever finished.
+    """
+
+    def __init__(self, jobs, profiles=DEFAULT_PROFILES, max_parallel=DEFAULT_MAX_PARALLEL,
+                 resolve=resolve_disks, **options):
+        super().__init__(daemon=True)
+        self.jobs = list(jobs)
+        self.resolve = resolve
+        self.profiles = profiles
+        self.max_parallel = max(1, max_parallel)
+        self.options = options
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.results = []
+        self._results_lock = threading.Lock()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        # Resolving disks can mean WMI round trips, so do it here rather than on the caller's thread
+        self.jobs = self.resolve(self.jobs)
+        slots = threading.Semaphore(self.max_parallel)
+        runners = [
+            threading.Thread(target=self._run_group, args=(group, slots), daemon=True)
+            for group in plan_batches(self.jobs)
+        ]
+        for runner in runners:
+            runner.start()
+        for runner in runners:
+            runner.join()
+        kind = "cancelled" if self.cancel_event.is_set() else "done"
+        order = {job.mountpoint: index for index, job in enumerate(self.jobs)}
+        self.events.put((kind, sorted(self.results, key=lambda result: order[result.mountpoint])))
+
+    def _run_group(self, group, slots):
+        with slots:
+            for job in group:
+                if self.cancel_event.is_set():
+                    return
+                result = BatchResult(job.mountpoint, job.disk)
+                try:
+                    result.results = run_benchmark(
+                        job.mountpoint,
+                        self.profiles,
+                        progress=lambda *event, mountpoint=job.mountpoint:
+                            self.events.put(("progress", mountpoint) + event),
+                        cancel_event=self.cancel_event,
+                        **self.options
+                    )
+                except BenchmarkCancelled:
+                    return
+                except Exception as e:
+                    log.debug("Batch benchmark of %s failed: %s", job.mountpoint, e)
+                    result.error = str(e)
+                with self._results_lock:
+                    self.results.append(result)
+                self.events.put(("result", result))
+
+
+def rank(batch_results, profile, mode="read"):
+    """Successful batch results ordered fastest first by one profile/direction."""
+    def speed(batch_result):
+        for result in batch_result.results:
+            if result.profile == profile and result.mode == mode:
+                return result.mb_per_s
+        return 0.0
+    ranked = [result for result in batch_results if not result.error]
+    return sorted(ranked, key=speed, reverse=True)
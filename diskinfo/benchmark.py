@@ -0,0 +1,381 @@
+"""Disk benchmark engine with CrystalDiskMark-style profiles.
+
+The engine is a plain API: build a list of `BenchmarkProfile`s, call
+`run_benchmark(path, profiles)` and get `BenchmarkResult`s back. It never
+touches Tk; `BenchmarkWorker` wraps it in a thread that streams events
+through a queue for the GUI.
+"""
+
+import itertools
+import logging
+import os
+import queue
+import random
+import shutil
+import struct
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from .directio import (
+    drop_file_cache,
+    incompressible_payload,
+    open_buffered,
+    open_direct,
+    read_into,
+    write_from,
+)
+from .histogram import LatencyHistogram
+
+log = logging.getLogger(__name__)
+
+BENCHMARK_FILE_NAME = "benchmark_test_file"
+KB = 1024
+MB = 1024 * 1024
+
+# Python has no portable async file I/O, so queue depth is emulated with one
+# synchronous I/O thread per outstanding request. Cap the slot count so the
+# deep random profiles don't spawn hundreds of threads.
+MAX_IO_SLOTS = 64
+PROGRESS_INTERVAL = 0.1
+PREPARE_CHUNK = 4 * MB
+
+IO_DIRECT = "direct"
+IO_BUFFERED = "buffered"
+
+# How read passes avoid being served from the page cache when I/O is buffered
+CACHE_NONE = "none"
+CACHE_DROP = "drop"  # Evict the test file's pages before each read pass
+CACHE_OVERSIZE = "oversize"  # Make the test file larger than physical RAM
+
+# Named engine options shared by the GUI and the command line
+IO_PRESETS = {
+    "direct": {"direct": True, "fsync": True, "cache": CACHE_DROP},
+    "buffered": {"direct": False, "fsync": True, "cache": CACHE_DROP},
+    "oversize": {"direct": False, "fsync": True, "cache": CACHE_OVERSIZE},
+    "cached": {"direct": False, "fsync": False, "cache": CACHE_NONE},
+}
+
+
+class BenchmarkCancelled(Exception):
+    """Raised inside the benchmark when the user presses Cancel."""
+
+
+@dataclass(frozen=True)
+class BenchmarkProfile:
+    """One test pattern: access pattern, block size, queue depth and threads."""
+    name: str
+    sequential: bool
+    block_size: int
+    queue_depth: int = 1
+    threads: int = 1
+    file_size: int = 256 * MB
+    iterations: int = 1
+    duration: float = 5.0  # Upper bound per pass in seconds
+
+    @property
+    def io_slots(self):
+        """Number of I/O requests actually kept in flight."""
+        return max(1, min(self.queue_depth * self.threads, MAX_IO_SLOTS))
+
+
+DEFAULT_PROFILES = (
+    BenchmarkProfile("SEQ1M Q8T1", sequential=True, block_size=MB, queue_depth=8, threads=1),
+    BenchmarkProfile("SEQ1M Q1T1", sequential=True, block_size=MB, queue_depth=1, threads=1),
+    BenchmarkProfile("RND4K Q32T16", sequential=False, block_size=4 * KB, queue_depth=32, threads=16),
+    BenchmarkProfile("RND4K Q1T1", sequential=False, block_size=4 * KB, queue_depth=1, threads=1),
+)
+
+PROFILES = {profile.name: profile for profile in DEFAULT_PROFILES}
+
+
+def configure_profiles(profiles, file_size=None, iterations=None, duration=None):
+    """Return copies of `profiles` with the shared knobs overridden."""
+    overrides = {}
+    if file_size is not None:
+        overrides["file_size"] = file_size
+    if iterations is not None:
+        overrides["iterations"] = iterations
+    if duration is not None:
+        overrides["duration"] = duration
+    return [replace(profile, **overrides) for profile in profiles]
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    """Outcome of the best iteration of one profile in one direction."""
+    profile: str
+    mode: str  # "read" or "write"
+    bytes: int
+    ops: int
+    seconds: float
+    mb_per_s: float
+    iops: float
+    latency_us: dict  # "p50", "p90", "p99", "p99.9", "max", "mean" -> microseconds
+    io_mode: str = IO_BUFFERED  # How the numbers were produced, e.g. "direct, fsync"
+
+
+class BenchmarkEngine:
+    """Run a set of profiles against a test file on one mountpoint.
+
+    `progress(phase, done_bytes, total_bytes, mb_per_s)` is called from the
+    engine thread roughly every PROGRESS_INTERVAL seconds. Setting
+    `cancel_event` stops all I/O threads at their next operation and raises
+    BenchmarkCancelled. The test file is always removed.
+
+    By default the engine measures the device rather than the page cache:
+    I/O is unbuffered (`direct`), writes are fsynced inside the timed window
+    (`fsync`) and the file's cached pages are evicted before each read pass
+    (`cache`). When the file system refuses direct I/O the engine falls back
+    to buffered I/O, and every result's `io_mode` says what was really used.
+    """
+
+    def __init__(self, path, profiles=DEFAULT_PROFILES, progress=None, cancel_event=None,
+                 direct=True, fsync=True, cache=CACHE_DROP):
+        if not os.path.splitdrive(path)[1]:
+            path += os.sep  # "C:" alone means the current directory on C:, not its root
+        self.path = path
+        self.profiles = list(profiles)
+        self.progress = progress
+        self.cancel_event = cancel_event or threading.Event()
+        self.test_file = os.path.join(path, BENCHMARK_FILE_NAME)
+        self.direct = direct
+        self.fsync = fsync
+        self.cache = cache
+        self.cache_dropped = False
+        self.payload = None
+
+    @property
+    def io_mode(self):
+        """Human readable label of the I/O mode actually in effect."""
+        parts = [IO_DIRECT if self.direct else IO_BUFFERED]
+        if self.fsync:
+            parts.append("fsync")
+        if not self.direct:
+            if self.cache == CACHE_OVERSIZE:
+                parts.append("file > RAM")
+            elif self.cache_dropped:
+                parts.append("cache dropped")
+            else:
+                parts.append("cached")
+        return ", ".join(parts)
+
+    def run(self):
+        results = []
+        try:
+            if self.cache == CACHE_OVERSIZE:
+                self.profiles = [replace(profile, file_size=max(profile.file_size, _larger_than_ram()))
+                                 for profile in self.profiles]
+            file_size = max(profile.file_size for profile in self.profiles)
+            self.payload = incompressible_payload(max(
+                [PREPARE_CHUNK] + [profile.io_slots * profile.block_size for profile in self.profiles]
+            ))
+            self._prepare_file(file_size)
+            if self.direct:
+                self._probe_direct()
+            for profile in self.profiles:
+                for mode in ("read", "write"):
+                    results.append(self._run_profile(profile, mode))
+            return results
+        finally:
+            try:
+                os.remove(self.test_file)
+            except OSError:
+                pass
+
+    def _check_cancel(self):
+        if self.cancel_event.is_set():
+            raise BenchmarkCancelled()
+
+    def _report(self, phase, done, total, start_ns):
+        if self.progress is not None:
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+            speed = (done / MB) / elapsed if elapsed > 0 else 0.0
+            self.progress(phase, done, total, speed)
+
+    def _prepare_file(self, size):
+        """Lay out the test file up front so reads never hit a sparse hole."""
+        log.debug("Preparing %d byte test file at %s", size, self.test_file)
+        if shutil.disk_usage(self.path).free < size:
+            raise OSError(f"Not enough free space for a {size // MB} MB test file")
+        chunk = memoryview(self.payload)[:PREPARE_CHUNK]
+        start_ns = time.perf_counter_ns()
+        with open(self.test_file, "wb") as f:
+            written = 0
+            while written < size:
+                self._check_cancel()
+                struct.pack_into("<Q", chunk, 0, written)
+                written += f.write(chunk[:size - written])
+                self._report("prepare", written, size, start_ns)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _probe_direct(self):
+        try:
+            os.close(open_direct(self.test_file))
+        except OSError as e:
+            log.debug("Direct I/O unavailable on %s, using buffered I/O: %s", self.path, e)
+            self.direct = False
+
+    def _open(self):
+        return open_direct(self.test_file) if self.direct else open_buffered(self.test_file)
+
+    def _run_profile(self, profile, mode):
+        best = None
+        for iteration in range(profile.iterations):
+            log.debug("Running %s %s iteration %d", profile.name, mode, iteration + 1)
+            if mode == "read" and not self.direct and self.cache == CACHE_DROP:
+                self.cache_dropped = drop_file_cache(self.test_file)
+            result = self._run_pass(profile, mode)
+            if best is None or result.mb_per_s > best.mb_per_s:
+                best = result
+        return best
+
+    def _run_pass(self, profile, mode):
+        block = profile.block_size
+        blocks = max(1, profile.file_size // block)
+        phase = f"{profile.name} {mode}"
+        next_op = itertools.count()  # next() on a count is atomic under the GIL
+        stop = threading.Event()
+        done_ops = [0] * profile.io_slots
+        # One histogram per slot so recording needs no lock; merged afterwards
+        histograms = [LatencyHistogram() for _ in range(profile.io_slots)]
+        finished = [0] * profile.io_slots
+        remaining = [profile.io_slots]
+        remaining_lock = threading.Lock()
+        all_done = threading.Event()
+        errors = []
+        payload = memoryview(self.payload)
+
+        def io_slot(slot):
+            rng = random.Random(slot)
+            histogram = histograms[slot]
+            clock = time.perf_counter_ns
+            # Each slot owns one aligned block of the shared random payload,
+            # used as the write source or read target without copying.
+            buf = payload[slot * block:(slot + 1) * block]
+            fd = None
+            try:
+                fd = self._open()
+                while not stop.is_set() and not self.cancel_event.is_set():
+                    op = next(next_op)
+                    if op >= blocks:
+                        break
+                    index = op if profile.sequential else rng.randrange(blocks)
+                    offset = index * block
+                    if mode == "read":
+                        started = clock()
+                        read_into(fd, buf, offset)
+                    else:
+                        # Stamp the op number so no two written blocks are identical
+                        struct.pack_into("<Q", buf, 0, op)
+                        started = clock()
+                        write_from(fd, buf, offset)
+                    histogram.record(clock() - started)
+                    done_ops[slot] += 1
+            except OSError as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                if fd is not None:
+                    os.close(fd)
+                finished[slot] = time.perf_counter_ns()
+                with remaining_lock:
+                    remaining[0] -= 1
+                    if remaining[0] == 0:
+                        all_done.set()
+
+        workers = [threading.Thread(target=io_slot, args=(slot,), daemon=True)
+                   for slot in range(profile.io_slots)]
+        deadline_ns = int(profile.duration * 1e9)
+        start_ns = time.perf_counter_ns()
+        for worker in workers:
+            worker.start()
+        total = blocks * block
+        while not all_done.wait(PROGRESS_INTERVAL):
+            if time.perf_counter_ns() - start_ns >= deadline_ns:
+                stop.set()
+            self._report(phase, sum(done_ops) * block, total, start_ns)
+        for worker in workers:
+            worker.join()
+        end_ns = max(finished)
+
+        self._check_cancel()
+        if errors:
+            raise errors[0]
+
+        if mode == "write" and self.fsync:
+            # The flush is part of the write cost, so it stays inside the timing
+            fd = open_buffered(self.test_file)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            end_ns = time.perf_counter_ns()
+
+        ops = sum(done_ops)
+        latency = LatencyHistogram()
+        for histogram in histograms:
+            latency.merge(histogram)
+        elapsed = max(end_ns - start_ns, 1) / 1e9
+        return BenchmarkResult(
+            profile=profile.name,
+            mode=mode,
+            bytes=ops * block,
+            ops=ops,
+            seconds=elapsed,
+            mb_per_s=(ops * block / MB) / elapsed,
+            iops=ops / elapsed,
+            latency_us=latency.summary_us(),
+            io_mode=self.io_mode,
+        )
+
+
+def _larger_than_ram():
+    """Test file size that cannot fit in the page cache, rounded to 1 MB."""
+    import psutil
+    return -(-int(psutil.virtual_memory().total * 1.1) // MB) * MB
+
+
+def run_benchmark(path, profiles=DEFAULT_PROFILES, progress=None, cancel_event=None, **options):
+    """Benchmark `path` with `profiles` and return a list of BenchmarkResult.
+
+    `options` are passed to BenchmarkEngine (direct, fsync, cache).
+    """
+    return BenchmarkEngine(path, profiles, progress, cancel_event, **options).run()
+
+
+class BenchmarkWorker(threading.Thread):
+    """Run a benchmark off the Tk thread and stream events through a queue.
+
+    Events are tuples: ("progress", phase, done_bytes, total_bytes, mb_per_s),
+    ("done", results), ("cancelled",) or ("error", message).
+    """
+
+    def __init__(self, mountpoint, profiles=DEFAULT_PROFILES, **options):
+        super().__init__(daemon=True)
+        self.mountpoint = mountpoint
+        self.profiles = profiles
+        self.options = options
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            results = run_benchmark(
+                self.mountpoint,
+                self.profiles,
+                progress=lambda *event: self.events.put(("progress",) + event),
+                cancel_event=self.cancel_event,
+                **self.options
+            )
+        except BenchmarkCancelled:
+            self.events.put(("cancelled",))
+        except Exception as e:
+            log.debug("Benchmark error: %s", e)
+            self.events.put(("error", f"Benchmark failed: {e}"))
+        else:
+            self.events.put(("done", results))
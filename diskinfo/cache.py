@@ -0,0 +1,197 @@
+"""Central TTL cache for drive, health and partition data.
+
+Each data class has its own freshness window: usage numbers go stale in
+seconds, while topology, model strings and SMART status rarely change.
+Within `ttl` a value is served as-is. Between `ttl` and `max_stale` the
+stale value is still returned immediately while the cache's refresh
+thread reloads it (stale-while-revalidate). Past `max_stale`, or after an
+explicit invalidation, the caller waits for a fresh load.
+
+Refreshes run one after another on a single long-lived thread per cache,
+so a loader going through the per-thread WmiSession keeps reusing that
+thread's COM apartment and connections.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+log = logging.getLogger(__name__)
+
+USAGE = "usage"
+TOPOLOGY = "topology"
+SMART = "smart"
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: float
+    max_stale: float
+
+
+DEFAULT_POLICIES = {
+    USAGE: CachePolicy(ttl=5, max_stale=60),
+    TOPOLOGY: CachePolicy(ttl=300, max_stale=3600),
+    SMART: CachePolicy(ttl=600, max_stale=3600),
+}
+FALLBACK_POLICY = CachePolicy(ttl=30, max_stale=300)
+
+
+class _Entry:
+    __slots__ = ("value", "loaded_at", "refreshing")
+
+    def __init__(self, value, loaded_at):
+        self.value = value
+        self.loaded_at = loaded_at
+        self.refreshing = False
+
+
+def data_class(key):
+    """Keys are either a data class name or a tuple starting with one."""
+    return key[0] if isinstance(key, tuple) else key
+
+
+class DataCache:
+    """Thread-safe TTL cache keyed by data class (plus optional detail).
+
+    `listeners` are called as listener(key, value) from the refresh thread
+    whenever a background refresh lands with a changed value, so views can
+    update in place.
+    """
+
+    def __init__(self, policies=None, clock=time.monotonic):
+        self.policies = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+        self.clock = clock
+        self.listeners = []
+        self._entries = {}
+        self._lock = threading.Lock()
+        # Bumped by invalidate(), everything or per data class, so loads already in flight are discarded
+        self._generation = 0
+        self._class_generations = {}
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+        self._refreshes = queue.Queue()  # (key, loader, generation) for the refresh thread
+        self._refresher = None  # Started on the first stale hit
+
+    def _generation_of(self, key):
+        return self._generation, self._class_generations.get(data_class(key), 0)
+
+    def policy(self, key):
+        return self.policies.get(data_class(key), FALLBACK_POLICY)
+
+    def get(self, key, loader):
+        """Return the cached value for `key`, calling `loader()` when needed."""
+        policy = self.policy(key)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.loaded_at
+                if age < policy.ttl:
+                    self._stats["hits"] += 1
+                    return entry.value
+                if age < policy.max_stale:
+                    self._stats["stale_hits"] += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        self._refreshes.put((key, loader, self._generation_of(key)))
+                        if self._refresher is None:
+                            self._refresher = threading.Thread(
+                                target=self._run_refreshes, name="diskinfo-cache-refresh", daemon=True
+                            )
+                            self._refresher.start()
+                    return entry.value
+            self._stats["misses"] += 1
+            generation = self._generation_of(key)
+
+        value = loader()
+        with self._lock:
+            if generation == self._generation_of(key):
+                self._entries[key] = _Entry(value, self.clock())
+        return value
+
+    def peek(self, key):
+        """Cached value regardless of age, or None. Never loads."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = _Entry(value, self.clock())
+
+    def _run_refreshes(self):
+        while True:
+            self._refresh(*self._refreshes.get())
+
+    def _refresh(self, key, loader, generation):
+        try:
+            value = loader()
+        except Exception as e:
+            log.debug("Background refresh of %r failed: %s", key, e)
+            with self._lock:
+                self._stats["errors"] += 1
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            return
+        with self._lock:
+            if generation != self._generation_of(key):
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False  # Let the next stale hit start a refresh of its own
+                return
+            self._stats["refreshes"] += 1
+            previous = self._entries.get(key)
+            self._entries[key] = _Entry(value, self.clock())
+        if previous is not None and previous.value == value:
+            return  # Nothing to redraw; topology snapshots compare by signature, so this is cheap
+        for listener in list(self.listeners):
+            listener(key, value)
+
+    def invalidate(self, *classes):
+        """Forget entries of the given data classes, or everything when none are given."""
+        with self._lock:
+            if not classes:
+                self._generation += 1
+                self._entries.clear()
+                return
+            for cls in classes:
+                self._class_generations[cls] = self._class_generations.get(cls, 0) + 1
+            for key in [key for key in self._entries if data_class(key) in classes]:
+                del self._entries[key]
+
+    def stats(self):
+        """Hit/miss counters plus the number of cached entries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+class MountWatcher:
+    """Detect volumes being mounted or unmounted by diffing the mount table.
+
+    `changed()` is cheap (one psutil.disk_partitions call) and returns the
+    set of mountpoints that appeared or disappeared since the previous call.
+    """
+
+    def __init__(self, list_mounts=None):
+        self.list_mounts = list_mounts or _psutil_mounts
+        self._known = None
+
+    def changed(self):
+        current = self.list_mounts()
+        previous, self._known = self._known, current
+        if previous is None:
+            return set()
+        return previous ^ current
+
+
+def _psutil_mounts():
+    import psutil
+    return frozenset((part.device, part.mountpoint) for part in psutil.disk_partitions(all=False))
@@ -0,0 +1,624 @@
+"""Headless `diskinfo` command line.
+
+    python -m diskinfo info|health|partitions [--format json|ndjson|table]
+    python -m diskinfo health [--history PATH]
+    python -m diskinfo bench PATH [--profile NAME ...] [--size MB] [--mode MODE]
+    python -m diskinfo watch [--interval SECONDS] [--count N] [--disk NAME ...]
+    python -m diskinfo alerts [--sink stdout|log:PATH|webhook:URL|toast ...] [--once]
+    python -m diskinfo exporter [--listen HOST] [--port PORT] [--interval SECONDS]
+    python -m diskinfo space PATH [--index FILE] [--top N]
+    python -m diskinfo dupes PATH ... [--min-size BYTES] [--cache FILE]
+    python -m diskinfo agent [--listen HOST] [--port PORT] [--snapshot FILE]
+    python -m diskinfo fleet HOST[:PORT] ... [--transport http|wmi] [--sort fullest|health|slowest]
+    python -m diskinfo export volumes|health|attributes|partitions [--format ndjson|csv|columnar] [--hosts HOST ...]
+
+Uses the same collectors as the GUI but never imports Tk or PIL, so it
+starts quickly and runs on hosts without a display (cron, Ansible, SSH).
+Heavier modules are imported by the subcommand that needs them.
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+FORMATS = ("table", "json", "ndjson")
+BENCH_MODES = ("direct", "buffered", "oversize", "cached")  # Keys of benchmark.IO_PRESETS
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_UNHEALTHY = 2  # `health` found a disk predicting failure
+EXIT_INTERRUPTED = 130
+
+_MB = 1024 ** 2
+_GB = 1024 ** 3
+
+
+def _gb(value):
+    return f"{value / _GB:.2f} GB"
+
+
+def _mb(value):
+    return f"{value / _MB:.2f} MB"
+
+
+def _percent(value):
+    return f"{value}%"
+
+
+def _mb_s(value):
+    return f"{value:.2f}"
+
+
+def _us(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def _plain(value):
+    # JSON has no NaN; unmeasured samples become null
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class Output:
+    """Writes records as one JSON document, JSON lines or an aligned table.
+
+    `columns` is a list of (key, title, formatter) used for tables only;
+    JSON formats always carry the raw values.
+    """
+
+    def __init__(self, fmt, columns, stream=None):
+        self.fmt = fmt
+        self.columns = columns
+        self.stream = stream or sys.stdout
+
+    def rows(self, rows, document=None):
+        """Emit a complete result; `document` overrides what `json` prints."""
+        if self.fmt == "json":
+            json.dump(rows if document is None else document, self.stream, indent=2, default=_plain)
+            self.stream.write("\n")
+        elif self.fmt == "ndjson":
+            for row in rows:
+                self.line(row)
+        else:
+            self.table(rows)
+
+    def line(self, row):
+        self.stream.write(json.dumps({key: _plain(value) for key, value in row.items()}) + "\n")
+        self.stream.flush()
+
+    def table(self, rows):
+        cells = [[title for _, title, _ in self.columns]]
+        for row in rows:
+            cells.append([
+                "" if row.get(key) is None else (formatter or str)(row[key])
+                for key, _, formatter in self.columns
+            ])
+        widths = [max(len(line[index]) for line in cells) for index in range(len(self.columns))]
+        for line in cells:
+            self.stream.write("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() + "\n")
+        self.stream.flush()
+
+
+def _collect(kind):
+    from .cache import DataCache
+    from .collector import SOURCES
+    return SOURCES[kind](DataCache())
+
+
+def cmd_info(args):
+    drives = _collect("drives")
+    rows = [
+        {
+            "drive": drive,
+            "model": info["model"],
+            "interface": info["interface"],
+            "mountpoint": part["mountpoint"],
+            "used": part["used"],
+            "total": part["total"],
+            "percent": part["percent"],
+        }
+        for drive, info in drives.items()
+        for part in info["partitions"]
+    ]
+    Output(args.format, [
+        ("mountpoint", "Mountpoint", None),
+        ("model", "Model", None),
+        ("interface", "Interface", None),
+        ("used", "Used", _gb),
+        ("total", "Total", _gb),
+        ("percent", "% Used", _percent),
+    ]).rows(rows, document=drives)
+    return EXIT_OK
+
+
+def cmd_health(args):
+    if args.history:
+        from .cache import DataCache
+        from .collector import collect_health
+        from .smarthistory import SmartHistory
+        history = SmartHistory(args.history)
+        try:
+            health = collect_health(DataCache(), history=history)
+        finally:
+            history.close()
+    else:
+        health = _collect("health")
+    rows = [dict(device_id=device_id, **info) for device_id, info in health.items()]
+    Output(args.format, [
+        ("device_id", "Disk", None),
+        ("model", "Model", None),
+        ("status", "Status", None),
+        ("predicted_failure", "Predicted failure", lambda value: "yes" if value else "no"),
+        ("health_percentage", "Health", _percent),
+        ("temperature", "Temp °C", None),
+        ("reason", "Reason", None),
+    ]).rows(rows, document=health)
+    return EXIT_UNHEALTHY if any(row["predicted_failure"] for row in rows) else EXIT_OK
+
+
+def cmd_partitions(args):
+    disks = _collect("partitions")
+    rows = []
+    for disk in disks:
+        for part in disk["partitions"]:
+            rows.append({
+                "disk": disk["number"],
+                "model": disk["model"],
+                "partition": "Unallocated" if part["is_unallocated"] else part["label"],
+                "filesystem": part.get("filesystem"),
+                "start": part["start"],
+                "size": part["size"],
+                "used": part.get("used"),
+            })
+    Output(args.format, [
+        ("disk", "Disk", None),
+        ("partition", "Partition", None),
+        ("filesystem", "File System", None),
+        ("start", "Start", _gb),
+        ("size", "Capacity", _gb),
+        ("used", "Used", _gb),
+    ]).rows(rows, document=disks)
+    return EXIT_OK
+
+
+def cmd_bench(args):
+    from .benchmark import IO_PRESETS, MB, PROFILES, configure_profiles, run_benchmark
+
+    unknown = [name for name in args.profile if name not in PROFILES]
+    if unknown:
+        raise SystemExit(f"diskinfo: unknown profile(s): {', '.join(unknown)} "
+                         f"(choose from {', '.join(PROFILES)})")
+    profiles = configure_profiles(
+        [PROFILES[name] for name in args.profile] if args.profile else PROFILES.values(),
+        file_size=args.size * MB if args.size else None,
+        iterations=args.iterations,
+    )
+
+    def progress(phase, done, total, mb_per_s):
+        percent = 100 * done / total if total else 100
+        sys.stderr.write(f"\r{phase}: {percent:3.0f}% {mb_per_s:8.2f} MB/s ")
+        sys.stderr.flush()
+
+    results = run_benchmark(
+        args.path, profiles,
+        progress=progress if sys.stderr.isatty() else None,
+        **IO_PRESETS[args.mode]
+    )
+    if sys.stderr.isatty():
+        sys.stderr.write("\n")
+    rows = [
+        {
+            "path": args.path,
+            "profile": result.profile,
+            "mode": result.mode,
+            "io_mode": result.io_mode,
+            "mb_per_s": result.mb_per_s,
+            "iops": result.iops,
+            "p50_us": result.latency_us.get("p50"),
+            "p99_us": result.latency_us.get("p99"),
+            "p999_us": result.latency_us.get("p99.9"),
+            "max_us": result.latency_us.get("max"),
+        }
+        for result in results
+    ]
+    Output(args.format, [
+        ("profile", "Profile", None),
+        ("mode", "Mode", None),
+        ("mb_per_s", "MB/s", _mb_s),
+        ("iops", "IOPS", lambda value: f"{value:.0f}"),
+        ("p50_us", "p50 µs", _us),
+        ("p99_us", "p99 µs", _us),
+        ("p999_us", "p99.9 µs", _us),
+        ("max_us", "max µs", _us),
+        ("io_mode", "I/O mode", None),
+    ]).rows(rows)
+    return EXIT_OK
+
+
+def cmd_watch(args):
+    from .iomonitor import METRICS, IoMonitor
+
+    monitor = IoMonitor(interval=args.interval, capacity=1)
+    output = Output(args.format, [
+        ("disk", "Disk", None),
+        ("read_mb_s", "Read MB/s", _mb_s),
+        ("write_mb_s", "Write MB/s", _mb_s),
+        ("read_iops", "Read IOPS", lambda value: f"{value:.0f}"),
+        ("write_iops", "Write IOPS", lambda value: f"{value:.0f}"),
+        ("latency_ms", "Latency ms", lambda value: "-" if math.isnan(value) else f"{value:.2f}"),
+        ("busy_pct", "Busy %", lambda value: "-" if math.isnan(value) else f"{value:.0f}"),
+    ])
+    monitor.sample()
+    deadline = time.monotonic()
+    emitted = 0
+    while not args.count or emitted < args.count:
+        deadline += monitor.interval
+        time.sleep(max(0.0, deadline - time.monotonic()))
+        monitor.sample()
+        now = time.time()
+        rows = []
+        for disk in monitor.disks():
+            if args.disk and disk not in args.disk:
+                continue
+            latest = monitor.latest(disk)
+            rows.append(dict({"time": now, "disk": disk}, **{metric: latest[metric] for metric in METRICS}))
+        if args.format == "table":
+            output.table(rows)
+            sys.stdout.write("\n")
+        else:
+            # A stream never ends, so even `json` is written one sample per line
+            for row in rows:
+                output.line(row)
+        emitted += 1
+    return EXIT_OK
+
+
+def _sink(spec, fmt):
+    from .alerts import LogFileSink, StdoutSink, ToastSink, WebhookSink
+    kind, _, target = spec.partition(":")
+    if kind == "stdout":
+        return StdoutSink(as_json=fmt != "table")
+    if kind == "log" and target:
+        return LogFileSink(target)
+    if kind == "webhook" and target:
+        return WebhookSink(target)
+    if kind == "toast":
+        return ToastSink()
+    raise SystemExit(f"diskinfo: bad --sink {spec!r} (use stdout, log:PATH, webhook:URL or toast)")
+
+
+def cmd_alerts(args):
+    from .alerts import (
+        AlertEngine,
+        AlertMonitor,
+        Limits,
+        PercentFullRule,
+        SmartRule,
+        TemperatureRule,
+        TimeToFullRule,
+    )
+
+    history = None
+    if args.history:
+        from .smarthistory import SmartHistory
+        history = SmartHistory(args.history)
+    engine = AlertEngine(
+        rules=[
+            PercentFullRule(Limits(args.full_warning, args.full_critical, hysteresis=2)),
+            TimeToFullRule(),
+            SmartRule(),
+            TemperatureRule(Limits(args.temp_warning, args.temp_critical, hysteresis=3)),
+        ],
+        sinks=[_sink(spec, args.format) for spec in args.sink or ["stdout"]],
+    )
+    monitor = AlertMonitor(engine, history=history,
+                           usage_interval=args.usage_interval, health_interval=args.health_interval)
+    if args.once:
+        alerts = monitor.run_once()
+        return EXIT_UNHEALTHY if any(not alert.resolved for alert in alerts) else EXIT_OK
+    monitor.start()
+    try:
+        while monitor.scheduler.is_alive():
+            monitor.scheduler.join(1)
+    finally:
+        monitor.stop()
+    return EXIT_OK
+
+
+def cmd_space(args):
+    import os
+
+    from .spacescan import SpaceScanner
+
+    scanner = SpaceScanner(args.path, workers=args.workers, index=args.index)
+    scanner.run()
+    if scanner.index_error is not None:
+        sys.stderr.write(f"diskinfo space: ignoring {args.index}: {scanner.index_error}\n")
+    tree = scanner.tree
+    rows = [
+        {"path": tree.path(child), "size": size, "files": tree.total_files[child]}
+        for child, size in tree.largest_children(0, args.top)
+    ]
+    rows.append({"path": os.path.join(tree.root, "(files)"), "size": tree.own_size[0], "files": tree.files[0]})
+    rows.sort(key=lambda row: row["size"], reverse=True)
+    document = {
+        "root": tree.root,
+        "size": tree.total_size[0],
+        "files": tree.total_files[0],
+        "directories": len(tree),
+        "unreadable": tree.errors,
+        "reused": scanner.reused,
+        "seconds": scanner.finished_at - scanner.started_at,
+        "largest": rows,
+    }
+    Output(args.format, [
+        ("path", "Path", None),
+        ("size", "Size", _gb),
+        ("files", "Files", None),
+    ]).rows(rows, document=document)
+    return EXIT_OK
+
+
+def cmd_dupes(args):
+    from .duplicates import DigestCache, DuplicateFinder
+
+    cache = DigestCache(args.cache) if args.cache else None
+    try:
+        finder = DuplicateFinder(args.paths, min_size=args.min_size, workers=args.workers, cache=cache)
+        groups = finder.find()
+    finally:
+        if cache is not None:
+            cache.close()
+    rows = [
+        {"size": group.size, "copies": len(group.paths), "wasted": group.wasted,
+         "digest": group.digest, "paths": list(group.paths)}
+        for group in groups
+    ]
+    document = dict(finder.stats, wasted=sum(group.wasted for group in groups), groups=rows)
+    output = Output(args.format, [
+        ("wasted", "Wasted", _mb),
+        ("copies", "Copies", None),
+        ("path", "Path", None),
+    ])
+    if args.format == "table":
+        # One line per copy; the group's figures only on its first line
+        output.table([
+            {"wasted": row["wasted"], "copies": row["copies"], "path": path} if index == 0 else {"path": path}
+            for row in rows for index, path in enumerate(row["paths"])
+        ])
+    else:
+        output.rows(rows, document=document)
+    return EXIT_OK
+
+
+def cmd_exporter(args):
+    from .exporter import MetricsCollector, make_server
+
+    history = None
+    if args.history:
+        from .history import BenchmarkHistory
+        history = BenchmarkHistory(args.history)
+    collector = MetricsCollector(interval=args.interval, history=history)
+    collector.collect()  # The first scrape already has data
+    collector.start()
+    server = make_server(collector, args.listen, args.port)
+    sys.stderr.write(f"Serving metrics on http://{args.listen}:{server.server_address[1]}/metrics\n")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        collector.stop()
+    return EXIT_OK
+
+
+def cmd_agent(args):
+    from functools import partial
+
+    from .cache import DataCache
+    from .fleet import SnapshotAgent, local_snapshot, make_agent_server
+
+    if args.snapshot:
+        # A fixed report, e.g. for a stand-in agent in tests
+        with open(args.snapshot, encoding="utf-8") as f:
+            source = partial(dict, json.load(f))
+    else:
+        provider = history = None
+        if args.root:
+            from .linux import LinuxProvider
+            provider = LinuxProvider(args.root)
+        if args.history:
+            from .history import BenchmarkHistory
+            history = BenchmarkHistory(args.history)
+        source = partial(local_snapshot, DataCache(), provider, history)
+    agent = SnapshotAgent(source, interval=args.interval)
+    agent.refresh()
+    agent.start()
+    server = make_agent_server(agent, args.listen, args.port)
+    sys.stderr.write(f"Serving snapshots on http://{args.listen}:{server.server_address[1]}/snapshot\n")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        agent.stop()
+    return EXIT_OK
+
+
+def _fleet_hosts(args):
+    hosts = list(args.hosts)
+    if args.hosts_file:
+        with open(args.hosts_file, encoding="utf-8") as f:
+            hosts.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not hosts:
+        raise SystemExit("diskinfo: no hosts given")
+    return hosts
+
+
+def cmd_fleet(args):
+    from .fleet import Fleet, HttpTransport, WmiTransport, fleet_document
+
+    transport = WmiTransport() if args.transport == "wmi" else HttpTransport(port=args.port)
+    with Fleet(transport, _fleet_hosts(args), workers=args.workers, timeout=args.timeout) as fleet:
+        results = fleet.collect()
+    document = fleet_document(results, args.sort)
+    Output(args.format, [
+        ("host", "Host", None),
+        ("fullest_volume", "Fullest volume", None),
+        ("fullest_percent", "% Used", _percent),
+        ("worst_disk", "Worst disk", None),
+        ("worst_health", "Health", _percent),
+        ("predicted_failures", "Failing", None),
+        ("slowest_benchmark", "Slowest benchmark", None),
+        ("slowest_mb_per_s", "MB/s", _mb_s),
+        ("error", "Error", None),
+    ]).rows(document["hosts"], document=document)
+    if any(row["predicted_failures"] for row in document["hosts"]):
+        return EXIT_UNHEALTHY
+    return EXIT_OK if all(row["ok"] for row in document["hosts"]) else EXIT_ERROR
+
+
+def cmd_export(args):
+    from .export import PARTITIONS, RECORD_TYPES, export_records, local_records, open_output, report_records
+
+    failed = []
+    if args.hosts or args.hosts_file:
+        from .fleet import Fleet, HttpTransport, WmiTransport
+        if args.kind == PARTITIONS:
+            raise SystemExit("diskinfo export: fleet reports don't include partitions; export them per host")
+        transport = WmiTransport() if args.transport == "wmi" else HttpTransport(port=args.port)
+        with Fleet(transport, _fleet_hosts(args), workers=args.workers, timeout=args.timeout) as fleet:
+            results = fleet.collect()
+        failed = [result for result in results if result.error is not None]
+        records = report_records(args.kind, (result.report for result in results if result.error is None))
+    else:
+        records = local_records(args.kind)
+
+    if args.output:
+        with open_output(args.output, args.format) as stream:
+            rows = export_records(records, RECORD_TYPES[args.kind], stream, args.format)
+        sys.stderr.write(f"Wrote {rows} {args.kind} rows to {args.output}\n")
+    else:
+        stream = sys.stdout.buffer if args.format == "columnar" else sys.stdout
+        export_records(records, RECORD_TYPES[args.kind], stream, args.format)
+    for result in failed:
+        sys.stderr.write(f"diskinfo export: {result.host}: {result.error}\n")
+    return EXIT_ERROR if failed else EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="diskinfo", description="Drive, health and partition information.")
+    formats = argparse.ArgumentParser(add_help=False)
+    formats.add_argument("--format", "-f", choices=FORMATS, default="table", help="output format (default: table)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("info", parents=[formats], help="mounted drives and their usage").set_defaults(run=cmd_info)
+    health = commands.add_parser(
+        "health", parents=[formats],
+        help=f"SMART failure prediction; exits {EXIT_UNHEALTHY} if a disk predicts failure"
+    )
+    health.add_argument("--history", metavar="PATH",
+                        help="record readings in this SMART history database and report trends")
+    health.set_defaults(run=cmd_health)
+    commands.add_parser("partitions", parents=[formats], help="partition layout per disk").set_defaults(run=cmd_partitions)
+
+    bench = commands.add_parser("bench", parents=[formats], help="benchmark the drive holding PATH")
+    bench.add_argument("path", help="mountpoint or directory to benchmark")
+    bench.add_argument("--profile", "-p", action="append", default=[], help="profile name (repeatable; default: all)")
+    bench.add_argument("--size", type=int, help="test file size in MB")
+    bench.add_argument("--iterations", type=int, help="iterations per profile; the best one is reported")
+    bench.add_argument("--mode", choices=BENCH_MODES, default="direct", help="I/O mode (default: direct)")
+    bench.set_defaults(run=cmd_bench)
+
+    watch = commands.add_parser("watch", parents=[formats], help="live per-disk I/O rates")
+    watch.add_argument("--interval", "-i", type=float, default=1.0, help="seconds between samples (min 0.1)")
+    watch.add_argument("--count", "-n", type=int, default=0, help="stop after N samples (default: run until interrupted)")
+    watch.add_argument("--disk", "-d", action="append", default=[], help="only show this disk (repeatable)")
+    watch.set_defaults(run=cmd_watch)
+
+    alerts = commands.add_parser("alerts", parents=[formats], help="watch usage and health and raise alerts")
+    alerts.add_argument("--sink", "-s", action="append",
+                        help="stdout, log:PATH, webhook:URL or toast (repeatable; default: stdout)")
+    alerts.add_argument("--once", action="store_true",
+                        help=f"check once and exit; exits {EXIT_UNHEALTHY} if anything is alerting")
+    alerts.add_argument("--usage-interval", type=float, default=60, help="seconds between usage checks")
+    alerts.add_argument("--health-interval", type=float, default=600, help="seconds between SMART checks")
+    alerts.add_argument("--full-warning", type=float, default=85, help="%% full that warns")
+    alerts.add_argument("--full-critical", type=float, default=95, help="%% full that is critical")
+    alerts.add_argument("--temp-warning", type=float, default=55, help="drive °C that warns")
+    alerts.add_argument("--temp-critical", type=float, default=65, help="drive °C that is critical")
+    alerts.add_argument("--history", metavar="PATH", help="SMART history database, enables trend alerts")
+    alerts.set_defaults(run=cmd_alerts)
+
+    space = commands.add_parser("space", parents=[formats], help="largest directories under PATH")
+    space.add_argument("path", help="directory or mountpoint to scan")
+    space.add_argument("--index", metavar="FILE", help="scan index to reuse and update (rescans only changed folders)")
+    space.add_argument("--top", type=int, default=20, help="directories to list (default: 20)")
+    space.add_argument("--workers", type=int, help="scanner threads (default: CPU count, at most 8)")
+    space.set_defaults(run=cmd_space)
+
+    dupes = commands.add_parser("dupes", parents=[formats], help="duplicate files under one or more PATHs")
+    dupes.add_argument("paths", nargs="+", metavar="PATH", help="directory to search")
+    dupes.add_argument("--min-size", type=int, default=1, help="ignore files smaller than this many bytes")
+    dupes.add_argument("--cache", metavar="FILE", help="digest cache to reuse and update (skips unchanged files)")
+    dupes.add_argument("--workers", type=int, help="hashing processes (default: CPU count)")
+    dupes.set_defaults(run=cmd_dupes)
+
+    exporter = commands.add_parser("exporter", help="serve Prometheus metrics on /metrics")
+    exporter.add_argument("--listen", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    exporter.add_argument("--port", type=int, default=9818, help="port to listen on (default: 9818)")
+    exporter.add_argument("--interval", type=float, default=30, help="seconds between collections (default: 30)")
+    exporter.add_argument("--history", metavar="PATH", help="benchmark history database whose latest runs to export")
+    exporter.set_defaults(run=cmd_exporter)
+
+    agent = commands.add_parser("agent", help="serve this host's report to fleet mode over HTTP")
+    agent.add_argument("--listen", default="0.0.0.0", help="address to bind (default: all interfaces)")
+    agent.add_argument("--port", type=int, default=9819, help="port to listen on (default: 9819)")
+    agent.add_argument("--interval", type=float, default=30, help="seconds between collections (default: 30)")
+    agent.add_argument("--history", metavar="PATH", help="benchmark history database whose latest runs to report")
+    agent.add_argument("--root", help="read a Linux sysfs/procfs tree under this directory instead of /")
+    agent.add_argument("--snapshot", metavar="FILE", help="serve this fixed JSON report instead of collecting")
+    agent.set_defaults(run=cmd_agent)
+
+    fleet = commands.add_parser("fleet", parents=[formats], help="collect and merge reports from many hosts")
+    fleet.add_argument("hosts", nargs="*", help="host or host:port to ask")
+    fleet.add_argument("--hosts-file", help="file with one host per line")
+    fleet.add_argument("--transport", choices=("http", "wmi"), default="http",
+                       help="diskinfo agents over HTTP, or remote WMI (default: http)")
+    fleet.add_argument("--port", type=int, default=9819, help="agent port for hosts without one (default: 9819)")
+    fleet.add_argument("--workers", type=int, default=16, help="hosts asked at once (default: 16)")
+    fleet.add_argument("--timeout", type=float, default=10, help="seconds to wait for each host (default: 10)")
+    fleet.add_argument("--sort", choices=("fullest", "health", "slowest", "host"), default="fullest",
+                       help="order hosts by fullest volume, worst health or slowest benchmark")
+    fleet.set_defaults(run=cmd_fleet)
+
+    export = commands.add_parser("export", help="stream records as NDJSON, CSV or columnar, locally or fleet-wide")
+    export.add_argument("kind", choices=("volumes", "health", "attributes", "partitions"),
+                        help="one record per volume, disk, SMART attribute or partition")
+    export.add_argument("--format", "-f", choices=("ndjson", "csv", "columnar"), default="ndjson",
+                        help="output format (default: ndjson)")
+    export.add_argument("--output", "-o", metavar="FILE", help="write here instead of stdout")
+    export.add_argument("--hosts", nargs="+", default=[], metavar="HOST",
+                        help="collect from these hosts instead of this machine")
+    export.add_argument("--hosts-file", help="file with one host per line")
+    export.add_argument("--transport", choices=("http", "wmi"), default="http",
+                        help="diskinfo agents over HTTP, or remote WMI (default: http)")
+    export.add_argument("--port", type=int, default=9819, help="agent port for hosts without one (default: 9819)")
+    export.add_argument("--workers", type=int, default=16, help="hosts asked at once (default: 16)")
+    export.add_argument("--timeout", type=float, default=10, help="seconds to wait for each host (default: 10)")
+    export.set_defaults(run=cmd_export)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    except BrokenPipeError:
+        return EXIT_OK  # Output piped into `head` and similar
+    except Exception as e:
+        sys.stderr.write(f"diskinfo {args.command}: {e}\n")
+        return EXIT_ERROR
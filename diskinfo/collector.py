@@ -0,0 +1,251 @@
+"""Background data collection for the UI.
+
+All WMI, psutil and topology work runs on one `Collector` thread. Pages ask
+for a kind of snapshot with `request()`, and the finished snapshot comes
+back through the `events` queue as plain dicts and lists, so the UI thread
+never touches COM objects and never blocks on a slow query. Snapshots are
+rebuilt from the shared `DataCache`, which keeps repeat requests cheap.
+"""
+
+import logging
+import queue
+import sys
+import threading
+
+from .cache import SMART, TOPOLOGY, USAGE
+from .layout import FREE, LayoutCache, label
+from .smart import health_status
+from .smarthistory import disk_key
+from .topology import load_topology
+
+log = logging.getLogger(__name__)
+
+DRIVES = "drives"
+HEALTH = "health"
+PARTITIONS = "partitions"
+
+# Snapshot kinds to rebuild when a background cache refresh lands
+REFRESH_KINDS = {
+    USAGE: (DRIVES, PARTITIONS),
+    TOPOLOGY: (DRIVES, PARTITIONS),
+    SMART: (HEALTH,),
+}
+
+
+def _topology(cache, provider, smart=False):
+    """Disk topology; the SMART-enriched copy is cached separately with its own TTL."""
+    return cache.get(SMART if smart else TOPOLOGY,
+                     lambda: load_topology(provider, include_smart=smart))
+
+
+def _volume_usage(cache, mountpoint):
+    import psutil
+    return cache.get((USAGE, mountpoint), lambda: psutil.disk_usage(mountpoint))
+
+
+def _drive_usage():
+    """Usage of every mounted volume, grouped by drive letter."""
+    import psutil
+    drive_data = {}
+    for partition in psutil.disk_partitions():
+        try:
+            usage = psutil.disk_usage(partition.mountpoint)
+        except (PermissionError, FileNotFoundError) as e:
+            log.debug("Skipping %s: %s", partition.mountpoint, e)
+            continue
+        drive_letter = partition.mountpoint.rstrip("\\")
+        drive_data.setdefault(drive_letter, {
+            "model": partition.device,
+            "interface": "Storage Device",
+            "size": usage.total,
+            "partitions": [],
+        })["partitions"].append({
+            "mountpoint": partition.mountpoint,
+            "used": usage.used,
+            "total": usage.total,
+            "percent": usage.percent,
+        })
+    return drive_data
+
+
+def collect_drives(cache, provider=None):
+    """Mounted drives with usage, plus model and interface where the topology knows them."""
+    usage = cache.get(USAGE, _drive_usage)
+    try:
+        topology = _topology(cache, provider)
+    except Exception as e:
+        # Usage alone is still worth showing; the psutil device name stands in for the model
+        log.debug("Disk topology unavailable: %s", e)
+        topology = None
+
+    drives = {}
+    for letter, info in usage.items():
+        disk = topology.disk_for_volume(letter) if topology is not None else None
+        drives[letter] = {
+            "model": disk.model if disk is not None else info["model"],
+            "interface": disk.interface if disk is not None else info["interface"],
+            "size": info["size"],
+            "partitions": [dict(part) for part in info["partitions"]],
+        }
+    return drives
+
+
+def health_statuses(topology, history=None):
+    """smart.HealthStatus of every disk in `topology`, recording readings into `history` if given."""
+    statuses = []
+    for disk in topology.disks:
+        trends = {}
+        if history is not None and disk.smart is not None and disk.smart.attributes:
+            key = disk_key(disk)
+            try:
+                history.record(key, disk.smart.attributes, topology.collected_at)
+                trends = history.trends(key, disk.smart.attributes)
+            except Exception as e:
+                log.debug("SMART history unavailable: %s", e)
+        statuses.append(health_status(disk, trends))
+    return tuple(statuses)
+
+
+def collect_health(cache, provider=None, history=None):
+    """SMART status and attributes of every physical disk, keyed by DeviceID.
+
+    With a `history` (smarthistory.SmartHistory) each read is recorded and
+    every attribute carries its rate of change and projected days until it
+    reaches its threshold.
+    """
+    topology = _topology(cache, provider, smart=True)
+    return {status.device_id: status.to_dict() for status in health_statuses(topology, history)}
+
+
+_layouts = LayoutCache()
+
+
+def _extent(cache, extent):
+    if extent.kind == FREE:
+        return {"start": extent.start, "size": extent.size, "kind": FREE, "is_unallocated": True}
+    row = {
+        "start": extent.start,
+        "size": extent.size,
+        "kind": extent.kind,
+        "is_unallocated": False,
+        "label": label(extent),
+        "letter": None,
+        "filesystem": None,
+        "type": "",
+        "bootable": False,
+        "primary": True,
+        "used": None,
+        "capacity": None,  # Size of the file system, which may be smaller than the partition
+    }
+    partition = extent.partition
+    if partition is None:
+        return row
+    row.update(type=partition.type, bootable=partition.bootable, primary=partition.primary)
+    if partition.volumes:
+        volume = partition.volumes[0]
+        row.update(letter=volume.device_id, filesystem=volume.file_system,
+                   used=volume.size - volume.free_space, capacity=volume.size)
+        try:
+            usage = _volume_usage(cache, volume.device_id)
+        except OSError as e:
+            log.debug("Usage of %s unavailable, using the topology's: %s", volume.device_id, e)
+        else:
+            row.update(used=usage.used, capacity=usage.total)
+    return row
+
+
+def collect_partitions(cache, provider=None, layouts=None):
+    """Per-disk partition layout for the Disk Management view.
+
+    Each disk lists its extents in offset order (see diskinfo.layout):
+    partitions with or without a drive letter, reserved areas and
+    aligned free space. `layouts` is a LayoutCache; by default one shared
+    by every call, so only disks whose topology changed are laid out again.
+    """
+    layouts = layouts if layouts is not None else _layouts
+    disks = []
+    for layout in layouts.layouts(_topology(cache, provider)):
+        disks.append({
+            "number": layout.disk.number,
+            "model": layout.disk.model,
+            "size": layout.size,
+            "alignment": layout.alignment,
+            "partitions": [_extent(cache, extent) for extent in layout.extents],
+            "unallocated": layout.free,
+        })
+    return disks
+
+
+SOURCES = {
+    DRIVES: collect_drives,
+    HEALTH: collect_health,
+    PARTITIONS: collect_partitions,
+}
+
+
+class Collector(threading.Thread):
+    """Worker thread that builds UI snapshots on request.
+
+    Requests for a kind that is already queued are merged, so a burst of
+    page switches or cache refreshes costs one collection. Events are tuples
+    (kind, snapshot, error): `snapshot` is None when `error` is set.
+
+    On Windows the thread enters a single-threaded COM apartment before any
+    WMI call. `provider` is any TopologyProvider (or WmiProvider) to use
+    instead of the platform default, e.g. a LinuxProvider over a fake tree.
+    """
+
+    def __init__(self, cache, provider=None, sources=None):
+        super().__init__(name="diskinfo-collector", daemon=True)
+        self.cache = cache
+        self.provider = provider
+        self.sources = dict(SOURCES)
+        self.sources.update(sources or {})
+        self.events = queue.Queue()
+        self._requests = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        cache.listeners.append(self._on_refresh)
+
+    def request(self, *kinds):
+        """Queue a collection of each kind. Safe to call from any thread."""
+        with self._lock:
+            for kind in kinds:
+                if kind not in self._pending:
+                    self._pending.add(kind)
+                    self._requests.put(kind)
+
+    def stop(self):
+        self._requests.put(None)
+
+    def _on_refresh(self, key, value):
+        kind = key[0] if isinstance(key, tuple) else key
+        self.request(*REFRESH_KINDS.get(kind, ()))
+
+    def run(self):
+        com = _enter_apartment()
+        try:
+            while True:
+                kind = self._requests.get()
+                if kind is None:
+                    return
+                with self._lock:
+                    self._pending.discard(kind)
+                try:
+                    snapshot = self.sources[kind](self.cache, self.provider)
+                except Exception as e:
+                    log.debug("Collecting %s failed: %s", kind, e)
+                    self.events.put((kind, None, str(e)))
+                else:
+                    self.events.put((kind, snapshot, None))
+        finally:
+            if com is not None:
+                com.CoUninitialize()
+
+
+def _enter_apartment():
+    if sys.platform != "win32":
+        return None
+    import pythoncom
+    pythoncom.CoInitializeEx(pythoncom.COINIT_APARTMENTTHREADED)
+    return pythoncom
@@ -0,0 +1,131 @@
+"""Unbuffered file I/O helpers for accurate benchmarks.
+
+Direct I/O needs the user buffer, the file offset and the transfer size to
+be sector aligned. Buffers here come from anonymous mmaps, which are page
+aligned, and reads go straight into them instead of allocating a new bytes
+object per call.
+"""
+
+import mmap
+import os
+import sys
+
+ALIGNMENT = 4096  # Covers 512e and 4Kn sectors
+
+if sys.platform == "win32":
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateFileW.restype = wintypes.HANDLE
+    _kernel32.CreateFileW.argtypes = [
+        wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+        wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE,
+    ]
+    _kernel32.ReadFile.argtypes = [
+        wintypes.HANDLE, wintypes.LPVOID, wintypes.DWORD,
+        ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID,
+    ]
+
+    _GENERIC_READ = 0x80000000
+    _GENERIC_WRITE = 0x40000000
+    _FILE_SHARE_READ = 0x1
+    _FILE_SHARE_WRITE = 0x2
+    _OPEN_EXISTING = 3
+    _FILE_FLAG_NO_BUFFERING = 0x20000000
+    _FILE_FLAG_WRITE_THROUGH = 0x80000000
+    _INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+
+def alloc_aligned(size):
+    """Return a writable, page-aligned buffer of at least `size` bytes."""
+    size = max(ALIGNMENT, -(-size // ALIGNMENT) * ALIGNMENT)
+    return mmap.mmap(-1, size)
+
+
+def incompressible_payload(size):
+    """Aligned buffer of pseudo-random bytes, generated once and sliced per I/O."""
+    buf = alloc_aligned(size)
+    buf[:] = os.urandom(len(buf))
+    return buf
+
+
+def open_direct(path):
+    """Open an existing file for read/write bypassing the OS page cache.
+
+    Raises OSError when the platform or file system refuses unbuffered I/O
+    (tmpfs, some network shares), so callers can fall back to buffered mode.
+    """
+    if sys.platform == "win32":
+        handle = _kernel32.CreateFileW(
+            path,
+            _GENERIC_READ | _GENERIC_WRITE,
+            _FILE_SHARE_READ | _FILE_SHARE_WRITE,
+            None,
+            _OPEN_EXISTING,
+            _FILE_FLAG_NO_BUFFERING | _FILE_FLAG_WRITE_THROUGH,
+            None,
+        )
+        if handle == _INVALID_HANDLE_VALUE:
+            raise ctypes.WinError(ctypes.get_last_error())
+        return msvcrt.open_osfhandle(handle, os.O_RDWR | os.O_BINARY)
+
+    if hasattr(os, "O_DIRECT"):
+        return os.open(path, os.O_RDWR | os.O_DIRECT)
+
+    fd = os.open(path, os.O_RDWR)
+    try:
+        import fcntl
+        fcntl.fcntl(fd, fcntl.F_NOCACHE, 1)  # macOS equivalent of O_DIRECT
+    except (ImportError, AttributeError, OSError) as e:
+        os.close(fd)
+        raise OSError(f"Direct I/O is not supported on this platform: {e}")
+    return fd
+
+
+def open_buffered(path):
+    return os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+
+
+def read_into(fd, buf, offset):
+    """Read len(buf) bytes at `offset` directly into `buf`; returns bytes read."""
+    if hasattr(os, "preadv"):
+        return os.preadv(fd, [buf], offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    if sys.platform == "win32":
+        read = wintypes.DWORD()
+        address = (ctypes.c_char * len(buf)).from_buffer(buf)
+        if not _kernel32.ReadFile(msvcrt.get_osfhandle(fd), address, len(buf), ctypes.byref(read), None):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return read.value
+    return os.readv(fd, [buf])
+
+
+def write_from(fd, buf, offset):
+    """Write `buf` at `offset` without copying it; returns bytes written."""
+    if hasattr(os, "pwrite"):
+        return os.pwrite(fd, buf, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.write(fd, buf)
+
+
+def drop_file_cache(path):
+    """Flush `path` and evict its pages from the OS cache where possible.
+
+    Returns True when the eviction is supported on this platform.
+    """
+    if sys.platform == "win32":
+        # Opening a non-cached handle makes the cache manager flush and
+        # purge the file's cached pages.
+        os.close(open_direct(path))
+        return True
+    fd = open_buffered(path)
+    try:
+        os.fsync(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            return True
+        return False
+    finally:
+        os.close(fd)
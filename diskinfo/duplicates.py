@@ -0,0 +1,317 @@
+"""Duplicate file finder.
+
+Files are narrowed down in three stages, each only looking at what the
+previous one left:
+
+    1. size           files with a unique size can't have a duplicate
+    2. partial hash   BLAKE2b of the first and last 64 KB
+    3. full hash      streaming BLAKE2b of the whole file
+
+Files no bigger than the two 64 KB windows are fully covered by stage 2
+and skip stage 3. Hard links to the same inode count as one file. Hashing
+runs in a process pool with large buffered reads. Digests are cached in
+SQLite keyed by (device, inode, size, mtime), so files that haven't
+changed since the last run aren't read again.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import stat
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+
+log = logging.getLogger(__name__)
+
+DIGEST_CACHE_FILE_NAME = "diskinfo_digests.sqlite3"
+
+PARTIAL_BYTES = 64 * 1024  # Read from each end of the file in stage 2
+READ_BUFFER = 1024 * 1024
+BATCH_FILES = 64  # Files per pool task; small enough to spread work, big enough to amortise pickling
+DIGEST_SIZE = 32
+CANCEL_POLL = 0.2  # Seconds between cancel checks while waiting on the pool
+
+SIZE_STAGE = "size"
+PARTIAL_STAGE = "partial"
+FULL_STAGE = "full"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial BLOB,
+    full BLOB,
+    PRIMARY KEY (device, inode, size, mtime_ns)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True)
+class FileKey:
+    """Identity of one file's contents at one point in time, for the digest cache."""
+    device: int
+    inode: int
+    size: int
+    mtime_ns: int
+
+
+@dataclass(frozen=True)
+class DuplicateGroup:
+    size: int
+    digest: str
+    paths: tuple
+
+    @property
+    def wasted(self):
+        """Bytes freed by keeping one copy."""
+        return self.size * (len(self.paths) - 1)
+
+
+def partial_digest(path, size):
+    """BLAKE2b of the size and the first and last PARTIAL_BYTES (the whole file if it's smaller)."""
+    digest = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=DIGEST_SIZE)
+    with open(path, "rb") as f:
+        digest.update(f.read(PARTIAL_BYTES))
+        if size > PARTIAL_BYTES:
+            f.seek(max(PARTIAL_BYTES, size - PARTIAL_BYTES))
+            digest.update(f.read(PARTIAL_BYTES))
+    return digest.digest()
+
+
+def full_digest(path):
+    """Streaming BLAKE2b of the whole file, read through one reused buffer."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    buffer = bytearray(READ_BUFFER)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.digest()
+
+
+def _hash_batch(stage, files):
+    """Pool task: [(path, size)] -> [(path, digest or None)]; unreadable files get None."""
+    results = []
+    for path, size in files:
+        try:
+            results.append((path, partial_digest(path, size) if stage == PARTIAL_STAGE else full_digest(path)))
+        except OSError:
+            results.append((path, None))
+    return results
+
+
+class DigestCache:
+    """SQLite store of partial and full digests. Used from one thread at a time."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def get(self, key, stage):
+        column = "partial" if stage == PARTIAL_STAGE else "full"
+        row = self._conn.execute(
+            f"SELECT {column} FROM digests WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+            (key.device, key.inode, key.size, key.mtime_ns)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, stage, items):
+        """Store [(FileKey, digest)] for `stage`, keeping the other stage's digest."""
+        column = "partial" if stage == PARTIAL_STAGE else "full"
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO digests (device, inode, size, mtime_ns) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT DO NOTHING",
+                [(key.device, key.inode, key.size, key.mtime_ns) for key, _ in items]
+            )
+            self._conn.executemany(
+                f"UPDATE digests SET {column} = ? WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                [(digest, key.device, key.inode, key.size, key.mtime_ns) for key, digest in items]
+            )
+
+
+class DuplicateFinder:
+    """Finds duplicate files under `roots`.
+
+    `progress(stage, done, total)` is called from the thread running
+    find(); `cache` is an optional DigestCache. `cancel()` may be called
+    from any thread and makes find() stop early and return [].
+    """
+
+    def __init__(self, roots, min_size=1, workers=None, cache=None, progress=None):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.min_size = max(1, min_size)
+        self.workers = workers or os.cpu_count() or 2
+        self.cache = cache
+        self.progress = progress or (lambda stage, done, total: None)
+        self.stats = {"files": 0, "candidates": 0, "hashed": 0, "cached": 0, "unreadable": 0}
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _walk(self):
+        """[(path, stat_result)] per size seen more than once."""
+        first_by_size = {}  # Size -> the only file of that size so far
+        by_size = {}
+        pending = list(self.roots)
+        directories = 0
+        while pending and not self.cancelled:
+            directory = pending.pop()
+            directories += 1
+            try:
+                entries = os.scandir(directory)
+            except OSError as e:
+                log.debug("Skipping %s: %s", directory, e)
+                self.stats["unreadable"] += 1
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if stat.S_ISDIR(st.st_mode):
+                        pending.append(entry.path)
+                        continue
+                    if not stat.S_ISREG(st.st_mode) or st.st_size < self.min_size:
+                        continue
+                    self.stats["files"] += 1
+                    group = by_size.get(st.st_size)
+                    if group is not None:
+                        group.append((entry.path, st))
+                    elif st.st_size in first_by_size:
+                        by_size[st.st_size] = [first_by_size.pop(st.st_size), (entry.path, st)]
+                    else:
+                        first_by_size[st.st_size] = (entry.path, st)
+            if directories % 100 == 0:
+                self.progress(SIZE_STAGE, self.stats["files"], 0)
+        return list(by_size.values())
+
+    def _identify(self, groups):
+        """Groups of (path, FileKey), with hard links to one inode kept once."""
+        seen = set()
+        identified = []
+        for group in groups:
+            items = []
+            for path, st in group:
+                if not st.st_ino:
+                    # Windows scandir leaves the file index out of DirEntry.stat(); only candidates pay for it
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                if st.st_nlink > 1:
+                    if (st.st_dev, st.st_ino) in seen:
+                        continue
+                    seen.add((st.st_dev, st.st_ino))
+                items.append((path, FileKey(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)))
+            if len(items) > 1:
+                identified.append(items)
+        return identified
+
+    def _digests(self, pool, stage, items):
+        """{path: digest} for [(path, FileKey)], from the cache where possible and the pool otherwise."""
+        digests = {}
+        missing = []
+        for path, key in items:
+            cached = self.cache.get(key, stage) if self.cache is not None else None
+            if cached is not None:
+                digests[path] = cached
+                self.stats["cached"] += 1
+            else:
+                missing.append((path, key))
+
+        keys = dict(missing)
+        batches = ([(path, key.size) for path, key in missing[start:start + BATCH_FILES]]
+                   for start in range(0, len(missing), BATCH_FILES))
+        # Only a couple of batches per worker are queued at a time, so a cancel leaves little to wait for
+        in_flight = set()
+        fresh = []
+        done = len(digests)
+        while not self.cancelled:
+            while len(in_flight) < 2 * self.workers:
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                in_flight.add(pool.submit(_hash_batch, stage, batch))
+            if not in_flight:
+                break
+            finished, in_flight = wait(in_flight, timeout=CANCEL_POLL, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results = future.result()
+                for path, digest in results:
+                    if digest is None:
+                        self.stats["unreadable"] += 1
+                        continue
+                    digests[path] = digest
+                    fresh.append((keys[path], digest))
+                self.stats["hashed"] += len(results)
+                done += len(results)
+                self.progress(stage, done, len(items))
+        if self.cache is not None and fresh:
+            self.cache.put_many(stage, fresh)
+        return digests
+
+    @staticmethod
+    def _regroup(groups, digests):
+        """Split each group of (path, FileKey) by digest, dropping files left alone."""
+        regrouped = []
+        for group in groups:
+            by_digest = {}
+            for path, key in group:
+                if path in digests:
+                    by_digest.setdefault(digests[path], []).append((path, key))
+            regrouped.extend(items for items in by_digest.values() if len(items) > 1)
+        return regrouped
+
+    def find(self):
+        """DuplicateGroups, the most wasted space first."""
+        groups = self._identify(self._walk())
+        self.stats["candidates"] = sum(len(group) for group in groups)
+        self.progress(SIZE_STAGE, self.stats["files"], self.stats["files"])
+        if self.cancelled or not groups:
+            return []
+
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            items = [item for group in groups for item in group]
+            partial = self._digests(pool, PARTIAL_STAGE, items)
+            groups = self._regroup(groups, partial)
+            if self.cancelled:
+                return []
+
+            # Files within the two partial windows were read whole in stage 2
+            covered = [group for group in groups if group[0][1].size <= 2 * PARTIAL_BYTES]
+            remaining = [group for group in groups if group[0][1].size > 2 * PARTIAL_BYTES]
+            full = self._digests(pool, FULL_STAGE, [item for group in remaining for item in group])
+            if self.cancelled:
+                return []
+            confirmed = [(group, partial) for group in covered]
+            confirmed += [(group, full) for group in self._regroup(remaining, full)]
+        finally:
+            # After a cancel, drop queued batches and don't wait for the ones workers are still hashing
+            pool.shutdown(wait=not self.cancelled, cancel_futures=True)
+
+        found = [
+            DuplicateGroup(size=group[0][1].size, digest=digests[group[0][0]].hex(),
+                           paths=tuple(sorted(path for path, _ in group)))
+            for group, digests in confirmed
+        ]
+        found.sort(key=lambda group: group.wasted, reverse=True)
+        return found
@@ -0,0 +1,377 @@
+"""Structured export of drive, health and partition snapshots.
+
+Collector snapshots are nested dicts shaped for the UI. For export they
+are flattened into typed records, one dataclass per kind with a fixed
+field order:
+
+    volumes     one row per mounted volume (collect_drives)
+    health      one row per physical disk (collect_health)
+    attributes  one row per SMART attribute of each disk
+    partitions  one row per partition or unallocated gap (collect_partitions)
+
+Every record starts with `host` and `collected_at`, so records from many
+hosts can share one file. The `*_records` functions are generators and the
+writers emit each record as it arrives, so an export holds at most one
+record (NDJSON, CSV) or one row group (columnar) in memory no matter how
+many hosts and volumes it covers.
+
+The columnar format is a small self-describing file in the spirit of
+Parquet: rows are buffered into row groups of ROW_GROUP_ROWS, each stored
+column by column (typed little-endian arrays, a validity bitmap for
+nulls, dictionary-encoded strings), and a JSON footer at the end records
+the schema and where each row group starts. It is written front to back,
+so it can go to a pipe; `read_columnar` reads it back.
+"""
+
+import array
+import csv
+import json
+import struct
+import sys
+import time
+from dataclasses import astuple, dataclass, fields
+
+NDJSON = "ndjson"
+CSV = "csv"
+COLUMNAR = "columnar"
+FORMATS = (NDJSON, CSV, COLUMNAR)
+EXTENSIONS = {NDJSON: ".ndjson", CSV: ".csv", COLUMNAR: ".dcol"}
+
+COLUMNAR_MAGIC = b"DISKINFO-COLS\n"
+COLUMNAR_VERSION = 1
+ROW_GROUP_ROWS = 4096
+
+VOLUMES = "volumes"
+HEALTH = "health"
+ATTRIBUTES = "attributes"
+PARTITIONS = "partitions"
+
+
+@dataclass(frozen=True, slots=True)
+class VolumeRecord:
+    host: str
+    collected_at: float
+    drive: str
+    mountpoint: str
+    model: str
+    interface: str
+    total: int
+    used: int
+    percent: float
+
+
+@dataclass(frozen=True, slots=True)
+class HealthRecord:
+    host: str
+    collected_at: float
+    device_id: str
+    model: str
+    status: str
+    predicted_failure: bool
+    reason: str
+    health_percentage: int
+    temperature: int
+
+
+@dataclass(frozen=True, slots=True)
+class AttributeRecord:
+    host: str
+    collected_at: float
+    device_id: str
+    key: str
+    name: str
+    value: int
+    worst: int
+    threshold: int
+    raw: int
+    failing: bool
+    prefailure: bool
+    days_to_threshold: float
+
+
+@dataclass(frozen=True, slots=True)
+class PartitionRecord:
+    host: str
+    collected_at: float
+    disk: str
+    model: str
+    start: int
+    size: int
+    kind: str  # "partition", "reserved" or "free"
+    label: str
+    letter: str
+    filesystem: str
+    type: str
+    bootable: bool
+    primary: bool
+    used: int
+    capacity: int
+
+
+RECORD_TYPES = {
+    VOLUMES: VolumeRecord,
+    HEALTH: HealthRecord,
+    ATTRIBUTES: AttributeRecord,
+    PARTITIONS: PartitionRecord,
+}
+
+
+def volume_records(drives, host, collected_at):
+    for drive, info in drives.items():
+        for part in info["partitions"]:
+            yield VolumeRecord(host, collected_at, drive, part["mountpoint"], info["model"], info["interface"],
+                               part["total"], part["used"], float(part["percent"]))
+
+
+def health_records(health, host, collected_at):
+    for device_id, info in health.items():
+        yield HealthRecord(host, collected_at, device_id, info["model"], info["status"],
+                           info["predicted_failure"], info["reason"], info["health_percentage"],
+                           info["temperature"])
+
+
+def attribute_records(health, host, collected_at):
+    for device_id, info in health.items():
+        for attribute in info["attributes"]:
+            yield AttributeRecord(host, collected_at, device_id, attribute["key"], attribute["name"],
+                                  attribute["value"], attribute["worst"], attribute["threshold"],
+                                  attribute["raw"], attribute["failing"], attribute["prefailure"],
+                                  attribute.get("days_to_threshold"))
+
+
+def partition_records(disks, host, collected_at):
+    for disk in disks:
+        for part in disk["partitions"]:
+            yield PartitionRecord(host, collected_at, disk["number"], disk["model"], part["start"],
+                                  part["size"], part["kind"], part.get("label", "Unallocated"),
+                                  part.get("letter"), part.get("filesystem"), part.get("type"),
+                                  part.get("bootable"), part.get("primary"), part.get("used"),
+                                  part.get("capacity"))
+
+
+# Kind -> (snapshot key in a fleet report, record generator)
+REPORT_SOURCES = {
+    VOLUMES: ("drives", volume_records),
+    HEALTH: ("health", health_records),
+    ATTRIBUTES: ("health", attribute_records),
+    PARTITIONS: ("partitions", partition_records),
+}
+
+
+def report_records(kind, reports):
+    """Records of `kind` from fleet-style reports ({"host", "collected_at", "drives", "health", ...})."""
+    key, records = REPORT_SOURCES[kind]
+    for report in reports:
+        snapshot = report.get(key)
+        if snapshot is not None:
+            yield from records(snapshot, report["host"], report["collected_at"])
+
+
+def local_records(kind, cache=None, provider=None):
+    """Records of `kind` collected from this machine."""
+    import socket
+    from .cache import DataCache
+    from .collector import collect_drives, collect_health, collect_partitions
+    cache = cache if cache is not None else DataCache()
+    collect = {"drives": collect_drives, "health": collect_health, "partitions": collect_partitions}
+    key, records = REPORT_SOURCES[kind]
+    return records(collect[key](cache, provider), socket.gethostname(), time.time())
+
+
+class NdjsonWriter:
+    """One JSON object per line. `stream` is a text stream."""
+
+    def __init__(self, stream, record_type):
+        self.stream = stream
+        self.names = [field.name for field in fields(record_type)]
+        self.rows = 0
+
+    def write(self, record):
+        self.stream.write(json.dumps(dict(zip(self.names, astuple(record)))) + "\n")
+        self.rows += 1
+
+    def close(self):
+        self.stream.flush()
+
+
+class CsvWriter:
+    """A header line then one line per record; None becomes an empty cell.
+
+    Open `stream` with newline="" as the csv module expects.
+    """
+
+    def __init__(self, stream, record_type):
+        self.stream = stream
+        self._writer = csv.writer(stream)
+        self._writer.writerow([field.name for field in fields(record_type)])
+        self.rows = 0
+
+    def write(self, record):
+        self._writer.writerow(astuple(record))
+        self.rows += 1
+
+    def close(self):
+        self.stream.flush()
+
+
+_TYPE_NAMES = {int: "int", float: "float", bool: "bool", str: "str"}
+_TYPECODES = {"int": "q", "float": "d"}
+
+
+def _little_endian(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _bitmap(flags):
+    bits = bytearray((len(flags) + 7) // 8)
+    for index, flag in enumerate(flags):
+        if flag:
+            bits[index >> 3] |= 1 << (index & 7)
+    return bytes(bits)
+
+
+def _bits(data, count):
+    return [bool(data[index >> 3] & (1 << (index & 7))) for index in range(count)]
+
+
+def _encode_column(kind, values):
+    """Validity bitmap plus the packed non-null values of one column chunk."""
+    valid = _bitmap([value is not None for value in values])
+    if kind == "bool":
+        data = _bitmap([bool(value) for value in values])
+    elif kind == "str":
+        # Dictionary encoding: models, hosts and file systems repeat a lot
+        dictionary = {}
+        codes = array.array("I", (dictionary.setdefault(value, len(dictionary))
+                                  for value in values if value is not None))
+        encoded = [value.encode("utf-8", "surrogateescape") for value in dictionary]
+        data = (struct.pack("<I", len(encoded)) + _little_endian(array.array("I", map(len, encoded)))
+                + b"".join(encoded) + _little_endian(codes))
+    else:
+        data = _little_endian(array.array(_TYPECODES[kind], (value for value in values if value is not None)))
+    return valid + data
+
+
+def _unpack(typecode, data):
+    values = array.array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _decode_column(kind, payload, count):
+    valid_length = (count + 7) // 8
+    valid = _bits(payload[:valid_length], count)
+    data = payload[valid_length:]
+    if kind == "bool":
+        flags = _bits(data, count)
+        return [flag if ok else None for flag, ok in zip(flags, valid)]
+    if kind == "str":
+        (size,) = struct.unpack_from("<I", data)
+        offset = 4 + 4 * size
+        dictionary = []
+        for length in _unpack("I", data[4:offset]):
+            dictionary.append(data[offset:offset + length].decode("utf-8", "surrogateescape"))
+            offset += length
+        values = map(dictionary.__getitem__, _unpack("I", data[offset:]))
+    else:
+        values = iter(_unpack(_TYPECODES[kind], data))
+    return [next(values) if ok else None for ok in valid]
+
+
+class ColumnarWriter:
+    """Row groups of column chunks followed by a JSON footer. `stream` is a binary stream."""
+
+    def __init__(self, stream, record_type, row_group_rows=ROW_GROUP_ROWS):
+        self.stream = stream
+        self.record_type = record_type
+        self.columns = [(field.name, _TYPE_NAMES[field.type]) for field in fields(record_type)]
+        self.row_group_rows = row_group_rows
+        self.rows = 0
+        self._buffer = []
+        self._row_groups = []  # {"offset", "rows"} per group written
+        self._position = 0  # Counted rather than tell()'d, so pipes work
+        self._emit(COLUMNAR_MAGIC)
+
+    def _emit(self, data):
+        self.stream.write(data)
+        self._position += len(data)
+
+    def write(self, record):
+        self._buffer.append(astuple(record))
+        self.rows += 1
+        if len(self._buffer) >= self.row_group_rows:
+            self._flush_group()
+
+    def _flush_group(self):
+        rows, self._buffer = self._buffer, []
+        self._row_groups.append({"offset": self._position, "rows": len(rows)})
+        self._emit(struct.pack("<I", len(rows)))
+        for index, (_, kind) in enumerate(self.columns):
+            chunk = _encode_column(kind, [row[index] for row in rows])
+            self._emit(struct.pack("<Q", len(chunk)))
+            self._emit(chunk)
+
+    def close(self):
+        if self._buffer:
+            self._flush_group()
+        footer = json.dumps({
+            "version": COLUMNAR_VERSION,
+            "record": self.record_type.__name__,
+            "columns": self.columns,
+            "rows": self.rows,
+            "row_groups": self._row_groups,
+        }).encode("utf-8")
+        self._emit(footer)
+        self._emit(struct.pack("<I", len(footer)))
+        self._emit(COLUMNAR_MAGIC)
+        self.stream.flush()
+
+
+def read_columnar(stream):
+    """Yield each row of a columnar file as a dict; `stream` must be seekable binary.
+
+    Raises ValueError if the file isn't a complete columnar export.
+    """
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("not a columnar export")
+    stream.seek(-(len(COLUMNAR_MAGIC) + 4), 2)
+    (length,) = struct.unpack("<I", stream.read(4))
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("columnar export is truncated")
+    stream.seek(-(len(COLUMNAR_MAGIC) + 4 + length), 2)
+    footer = json.loads(stream.read(length))
+    if footer.get("version") != COLUMNAR_VERSION:
+        raise ValueError(f"columnar export has version {footer.get('version')}")
+    names = [name for name, _ in footer["columns"]]
+    for group in footer["row_groups"]:
+        stream.seek(group["offset"])
+        (count,) = struct.unpack("<I", stream.read(4))
+        columns = []
+        for _, kind in footer["columns"]:
+            (size,) = struct.unpack("<Q", stream.read(8))
+            columns.append(_decode_column(kind, stream.read(size), count))
+        for row in zip(*columns):
+            yield dict(zip(names, row))
+
+
+WRITERS = {NDJSON: NdjsonWriter, CSV: CsvWriter, COLUMNAR: ColumnarWriter}
+
+
+def open_output(path, fmt):
+    """File object for writing `fmt` to `path`, in the mode its writer expects."""
+    if fmt == COLUMNAR:
+        return open(path, "wb")
+    return open(path, "w", encoding="utf-8", newline="" if fmt == CSV else None)
+
+
+def export_records(records, record_type, stream, fmt):
+    """Stream `records` to `stream` as `fmt`; returns the number of rows written."""
+    writer = WRITERS[fmt](stream, record_type)
+    for record in records:
+        writer.write(record)
+    writer.close()
+    return writer.rows
@@ -0,0 +1,239 @@
+"""Prometheus / OpenMetrics exporter.
+
+`MetricsCollector` gathers drives, health and (optionally) the latest
+benchmark results on its own cadence and renders them into one
+pre-formatted text block. A scrape of `/metrics` writes that block plus a
+few lines of collector status, so it never triggers a WMI query and its
+cost doesn't depend on how slow collection is. The status lines are
+rendered per scrape, so a collection stuck in a hung WMI call still shows
+up as a growing `diskinfo_collector_running_seconds`.
+"""
+
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9818
+DEFAULT_INTERVAL = 30
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DRIVES_SOURCE = "drives"
+HEALTH_SOURCE = "health"
+BENCHMARK_SOURCE = "benchmark"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricFamily:
+    """One metric name with its HELP/TYPE header and samples."""
+
+    def __init__(self, name, help_text, kind="gauge"):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.samples = []
+
+    def add(self, value, **labels):
+        if value is not None:
+            self.samples.append((labels, value))
+        return self
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{_labels(labels)} {_number(value)}" for labels, value in self.samples)
+        return "\n".join(lines) + "\n"
+
+
+def drive_metrics(drives):
+    size = MetricFamily("diskinfo_volume_size_bytes", "Volume capacity.")
+    used = MetricFamily("diskinfo_volume_used_bytes", "Space used on the volume.")
+    ratio = MetricFamily("diskinfo_volume_used_ratio", "Fraction of the volume in use.")
+    for drive, info in drives.items():
+        for part in info["partitions"]:
+            labels = {"mountpoint": part["mountpoint"], "drive": drive,
+                      "model": info["model"], "interface": info["interface"]}
+            size.add(part["total"], **labels)
+            used.add(part["used"], **labels)
+            ratio.add(part["percent"] / 100, **labels)
+    return [size, used, ratio]
+
+
+def health_metrics(health):
+    failure = MetricFamily("diskinfo_disk_predicted_failure", "1 if SMART predicts the disk will fail.")
+    percentage = MetricFamily("diskinfo_disk_health_percent", "Estimated remaining disk life.")
+    temperature = MetricFamily("diskinfo_disk_temperature_celsius", "Disk temperature from SMART.")
+    raw = MetricFamily("diskinfo_smart_attribute_raw", "Raw SMART attribute value.")
+    failing = MetricFamily("diskinfo_smart_attribute_failing", "1 if the attribute is at or past its threshold.")
+    for device_id, info in health.items():
+        labels = {"device_id": device_id, "model": info["model"]}
+        failure.add(info["predicted_failure"], **labels)
+        percentage.add(info["health_percentage"], **labels)
+        temperature.add(info["temperature"], **labels)
+        for attribute in info["attributes"]:
+            attribute_labels = dict(labels, attribute=attribute["key"], name=attribute["name"])
+            raw.add(attribute["raw"], **attribute_labels)
+            failing.add(attribute["failing"], **attribute_labels)
+    return [failure, percentage, temperature, raw, failing]
+
+
+def benchmark_metrics(runs):
+    throughput = MetricFamily("diskinfo_benchmark_throughput_mb_per_second", "Throughput of the latest run.")
+    iops = MetricFamily("diskinfo_benchmark_iops", "I/O operations per second of the latest run.")
+    p99 = MetricFamily("diskinfo_benchmark_latency_p99_microseconds", "99th percentile latency of the latest run.")
+    timestamp = MetricFamily("diskinfo_benchmark_timestamp_seconds", "When the latest run finished.")
+    for run in runs:
+        labels = {"drive": run.drive, "profile": run.profile, "mode": run.mode, "io_mode": run.io_mode}
+        throughput.add(run.mb_per_s, **labels)
+        iops.add(run.iops, **labels)
+        p99.add(run.p99_us, **labels)
+        timestamp.add(run.timestamp, **labels)
+    return [throughput, iops, p99, timestamp]
+
+
+class _SourceStatus:
+    __slots__ = ("runs", "errors", "duration", "last_success", "started")
+
+    def __init__(self):
+        self.runs = 0
+        self.errors = 0
+        self.duration = None
+        self.last_success = None
+        self.started = None  # Set while a collection is in progress
+
+
+class MetricsCollector(threading.Thread):
+    """Refreshes the rendered metrics every `interval` seconds.
+
+    `history` is an optional history.BenchmarkHistory whose latest runs are
+    exported; `cache` and `provider` go to the collect_* functions. The
+    default cache never serves stale data, so every collection runs the
+    WMI/psutil queries on this thread and the duration, error and running
+    metrics time the real calls rather than a cache lookup.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, cache=None, provider=None, history=None, clock=time.monotonic):
+        super().__init__(name="diskinfo-exporter", daemon=True)
+        if cache is None:
+            from .cache import SMART, TOPOLOGY, USAGE, CachePolicy, DataCache
+            # No stale-while-revalidate: a background refresh would hide a hung or failing query
+            cache = DataCache(policies={kind: CachePolicy(ttl=0, max_stale=0) for kind in (USAGE, TOPOLOGY, SMART)})
+        self.interval = interval
+        self.cache = cache
+        self.provider = provider
+        self.history = history
+        self.clock = clock
+        self.sources = [(DRIVES_SOURCE, self._drives), (HEALTH_SOURCE, self._health)]
+        if history is not None:
+            self.sources.append((BENCHMARK_SOURCE, self._benchmarks))
+        self._status = {name: _SourceStatus() for name, _ in self.sources}
+        self._families = {}  # Source -> rendered text of its last good collection
+        self._body = ""
+        self._lock = threading.Lock()
+        self._halt = threading.Event()
+
+    def _drives(self):
+        from .collector import collect_drives
+        return drive_metrics(collect_drives(self.cache, self.provider))
+
+    def _health(self):
+        from .collector import collect_health
+        return health_metrics(collect_health(self.cache, self.provider))
+
+    def _benchmarks(self):
+        return benchmark_metrics([run for drive in self.history.drives() for run in self.history.latest(drive)])
+
+    def collect(self):
+        """Run every source once and re-render the cached body. A failed source keeps its last good metrics."""
+        for name, source in self.sources:
+            status = self._status[name]
+            status.started = self.clock()
+            try:
+                text = "".join(family.render() for family in source())
+            except Exception as e:
+                log.warning("Collecting %s metrics failed: %s", name, e)
+                status.errors += 1
+            else:
+                self._families[name] = text
+                status.last_success = time.time()
+            finally:
+                status.runs += 1
+                status.duration = self.clock() - status.started
+                status.started = None
+        body = "".join(self._families.get(name, "") for name, _ in self.sources)
+        with self._lock:
+            self._body = body
+
+    def stop(self):
+        self._halt.set()
+
+    def run(self):
+        while not self._halt.is_set():
+            started = self.clock()
+            self.collect()
+            self._halt.wait(max(0.0, self.interval - (self.clock() - started)))
+
+    def _status_text(self):
+        now = self.clock()
+        families = [
+            MetricFamily("diskinfo_collector_runs_total", "Collections attempted per source.", "counter"),
+            MetricFamily("diskinfo_collector_errors_total", "Collections that raised per source.", "counter"),
+            MetricFamily("diskinfo_collector_duration_seconds", "Duration of the last collection per source."),
+            MetricFamily("diskinfo_collector_last_success_timestamp_seconds", "When each source last succeeded."),
+            MetricFamily("diskinfo_collector_running_seconds",
+                         "How long the in-progress collection has been running; 0 when idle."),
+        ]
+        for name, status in self._status.items():
+            started = status.started
+            for family, value in zip(families, (
+                status.runs, status.errors, status.duration, status.last_success,
+                now - started if started is not None else 0,
+            )):
+                family.add(value, source=name)
+        return "".join(family.render() for family in families)
+
+    def render(self):
+        """Full /metrics response: the cached body plus a fixed handful of status lines."""
+        with self._lock:
+            body = self._body
+        return body + self._status_text()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    collector = None  # Set on the per-server subclass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404, "Only /metrics is served")
+            return
+        payload = self.collector.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(collector, host="127.0.0.1", port=DEFAULT_PORT):
+    """HTTP server answering /metrics from `collector`; call serve_forever() on it."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"collector": collector})
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,384 @@
+"""Fleet mode: collect drive data from many hosts at once.
+
+A `Transport` fetches one host's report, in the same shape on every
+transport:
+
+    {"host", "collected_at", "drives", "health", "benchmarks"}
+
+`drives` and `health` are the collector snapshots. `HttpTransport` asks a
+`diskinfo agent` over HTTP/1.1 and keeps one keep-alive connection per
+host between rounds. `WmiTransport` queries the host's WMI service
+directly through a WmiSession(host), which keeps its connections too.
+
+`Fleet` runs a round over a bounded thread pool with a per-host timeout
+and returns `HostReport`s. A hung host only costs its own worker: it is
+reported as timed out and the pool is replaced for everyone else. `summarize` and `sort_summaries` turn a round
+into one row per host: fullest volume, worst health and slowest
+benchmark. Stand-in agents for tests are just `make_agent_server` on
+local ports, fed from a fake topology or a fixed snapshot.
+"""
+
+import http.client
+import json
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+AGENT_PORT = 9819
+AGENT_PATH = "/snapshot"
+DEFAULT_WORKERS = 16
+DEFAULT_TIMEOUT = 10.0
+
+SORT_KEYS = {
+    # key: (summary field, reverse) - missing values always sort last
+    "fullest": ("fullest_percent", True),
+    "health": ("worst_health", False),
+    "slowest": ("slowest_mb_per_s", False),
+    "host": ("host", False),
+}
+
+
+def local_snapshot(cache=None, provider=None, history=None):
+    """This machine's report, as an agent serves it."""
+    from .cache import DataCache
+    from .collector import collect_drives, collect_health
+    cache = cache if cache is not None else DataCache()
+    benchmarks = []
+    if history is not None:
+        benchmarks = [asdict(run) for drive in history.drives() for run in history.latest(drive)]
+    return {
+        "host": socket.gethostname(),
+        "collected_at": time.time(),
+        "drives": collect_drives(cache, provider),
+        "health": collect_health(cache, provider),
+        "benchmarks": benchmarks,
+    }
+
+
+class SnapshotAgent(threading.Thread):
+    """Rebuilds the agent's JSON on its own cadence so requests never wait on WMI.
+
+    `source` is a callable returning the report dict; by default
+    local_snapshot() over a DataCache that lives as long as the agent.
+    """
+
+    def __init__(self, source=None, interval=30):
+        super().__init__(name="diskinfo-agent", daemon=True)
+        if source is None:
+            from .cache import DataCache
+            source = partial(local_snapshot, DataCache())
+        self.source = source
+        self.interval = interval
+        self.payload = None
+        self.error = None
+        self._halt = threading.Event()
+
+    def refresh(self):
+        try:
+            self.payload = json.dumps(self.source()).encode("utf-8")
+            self.error = None
+        except Exception as e:
+            log.warning("Agent collection failed: %s", e)
+            self.error = str(e)
+
+    def stop(self):
+        self._halt.set()
+
+    def run(self):
+        while not self._halt.wait(self.interval):
+            self.refresh()
+
+
+class _AgentHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so fleet polls reuse their connection
+    agent = None  # Set on the per-server subclass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != AGENT_PATH:
+            self.send_error(404, f"Only {AGENT_PATH} is served")
+            return
+        payload = self.agent.payload
+        if payload is None:
+            self.send_error(503, self.agent.error or "No snapshot yet")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_agent_server(agent, host="0.0.0.0", port=AGENT_PORT):
+    """HTTP server answering AGENT_PATH from `agent`; call serve_forever() on it."""
+    handler = type("AgentHandler", (_AgentHandler,), {"agent": agent})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+class Transport:
+    """Interface of anything that can fetch one host's report."""
+
+    def fetch(self, host, timeout):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def _split_host(host, default_port):
+    name, _, port = host.rpartition(":") if host.count(":") == 1 else (host, "", "")
+    return (name, int(port)) if port else (host, default_port)
+
+
+class HttpTransport(Transport):
+    """Fetches reports from `diskinfo agent`s, reusing one connection per host."""
+
+    def __init__(self, port=AGENT_PORT, path=AGENT_PATH):
+        self.port = port
+        self.path = path
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    def _connection(self, host, timeout):
+        with self._lock:
+            connection = self._connections.pop(host, None)
+        if connection is None:
+            name, port = _split_host(host, self.port)
+            connection = http.client.HTTPConnection(name, port, timeout=timeout)
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection
+
+    def fetch(self, host, timeout):
+        for attempt in range(2):
+            connection = self._connection(host, timeout)
+            try:
+                connection.request("GET", self.path)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The agent closed an idle keep-alive connection; one fresh retry
+                connection.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                connection.close()
+                raise
+            if response.status != 200:
+                connection.close()
+                raise OSError(f"HTTP {response.status} {response.reason}")
+            with self._lock:
+                self._connections[host] = connection
+            return json.loads(body)
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, {}
+        for connection in connections.values():
+            connection.close()
+
+
+def topology_drives(topology):
+    """collect_drives()-shaped snapshot from the volumes in a Topology (no local psutil)."""
+    drives = {}
+    for disk in topology.disks:
+        for partition in disk.partitions:
+            for volume in partition.volumes:
+                used = volume.size - volume.free_space
+                drives[volume.device_id] = {
+                    "model": disk.model,
+                    "interface": disk.interface,
+                    "size": volume.size,
+                    "partitions": [{
+                        "mountpoint": volume.device_id,
+                        "used": used,
+                        "total": volume.size,
+                        "percent": round(100 * used / volume.size, 1) if volume.size else 0.0,
+                    }],
+                }
+    return drives
+
+
+class WmiTransport(Transport):
+    """Queries each host's WMI service remotely; one WmiSession per host is kept for reuse.
+
+    WMI calls can't be cancelled, so the timeout is enforced by the Fleet:
+    a hung host is reported as timed out while its worker finishes alone.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _session(self, host):
+        from .wmi import WmiSession
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._sessions[host] = WmiSession(host)
+            return session
+
+    def fetch(self, host, timeout):
+        from .collector import health_statuses
+        from .topology import load_topology
+        # One remote load per round: drives and health both come from the SMART-enriched topology
+        topology = load_topology(self._session(host), include_smart=True)
+        return {
+            "host": host,
+            "collected_at": topology.collected_at,
+            "drives": topology_drives(topology),
+            "health": {status.device_id: status.to_dict() for status in health_statuses(topology)},
+            "benchmarks": [],
+        }
+
+
+@dataclass(frozen=True)
+class HostReport:
+    host: str
+    report: dict = None  # None when `error` is set
+    error: str = None
+    elapsed: float = 0.0
+
+
+class Fleet:
+    """Collects reports from `hosts` through `transport` on a bounded pool.
+
+    The pool and the transport's connections outlive a round, so
+    repeated rounds reuse both. Use as a context manager or call close().
+    """
+
+    def __init__(self, transport, hosts, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+        self.transport = transport
+        self.hosts = list(hosts)
+        self.timeout = timeout
+        self.workers = max(1, workers)
+        self._pool = self._new_pool()
+
+    def _new_pool(self):
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="diskinfo-fleet")
+
+    def _fetch(self, host, started_at):
+        started = started_at[host] = time.monotonic()
+        try:
+            report = self.transport.fetch(host, self.timeout)
+        except Exception as e:
+            return HostReport(host, error=str(e) or type(e).__name__, elapsed=time.monotonic() - started)
+        return HostReport(host, report=report, elapsed=time.monotonic() - started)
+
+    def _replace_pool(self, futures, started_at):
+        """Move hosts that haven't started yet to a fresh pool; the old one keeps only its hung workers."""
+        old, self._pool = self._pool, self._new_pool()
+        for host, future in futures.items():
+            if host not in started_at and future.cancel():
+                futures[host] = self._pool.submit(self._fetch, host, started_at)
+        old.shutdown(wait=False)
+
+    def collect(self):
+        """One round over every host, in host order.
+
+        Each host's clock starts when a worker picks it up, so a large
+        fleet on a small pool isn't failed by queueing alone. A host still
+        running `timeout` seconds after it started is reported as timed
+        out. Fetches can't be interrupted, so its worker is left to finish
+        alone and the pool is replaced: hosts still queued, and later
+        rounds, get a full set of workers.
+        """
+        started_at = {}  # Host -> when its fetch began, written by the worker
+        futures = {host: self._pool.submit(self._fetch, host, started_at) for host in self.hosts}
+        results = {}
+        while len(results) < len(futures):
+            now = time.monotonic()
+            expired = [host for host, started in list(started_at.items())
+                       if host not in results and not futures[host].done() and now - started >= self.timeout]
+            for host in expired:
+                results[host] = HostReport(host, error=f"timed out after {self.timeout:g} s",
+                                           elapsed=now - started_at[host])
+            if expired:
+                self._replace_pool(futures, started_at)
+            for host, future in futures.items():
+                if host not in results and future.done():
+                    results[host] = future.result()
+            pending = [future for host, future in futures.items() if host not in results]
+            if not pending:
+                break
+            deadlines = [started + self.timeout for host, started in list(started_at.items()) if host not in results]
+            wait(pending, timeout=max(0.0, min(deadlines, default=now + self.timeout) - now),
+                 return_when=FIRST_COMPLETED)
+        return [results[host] for host in futures]
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def summarize(result):
+    """One dashboard row per host from a HostReport."""
+    summary = {
+        "host": result.host,
+        "ok": result.error is None,
+        "error": result.error,
+        "elapsed": result.elapsed,
+        "volumes": 0,
+        "fullest_volume": None,
+        "fullest_percent": None,
+        "disks": 0,
+        "worst_disk": None,
+        "worst_health": None,
+        "predicted_failures": 0,
+        "slowest_benchmark": None,
+        "slowest_mb_per_s": None,
+    }
+    if result.report is None:
+        return summary
+    volumes = [part for info in result.report.get("drives", {}).values() for part in info["partitions"]]
+    summary["volumes"] = len(volumes)
+    if volumes:
+        fullest = max(volumes, key=lambda part: part["percent"])
+        summary.update(fullest_volume=fullest["mountpoint"], fullest_percent=fullest["percent"])
+    health = result.report.get("health", {})
+    summary["disks"] = len(health)
+    summary["predicted_failures"] = sum(1 for info in health.values() if info["predicted_failure"])
+    if health:
+        device_id, worst = min(health.items(), key=lambda item: item[1]["health_percentage"])
+        summary.update(worst_disk=f"{worst['model']} ({device_id})", worst_health=worst["health_percentage"])
+    runs = result.report.get("benchmarks", [])
+    if runs:
+        slowest = min(runs, key=lambda run: run["mb_per_s"])
+        summary.update(slowest_benchmark=f"{slowest['drive']} {slowest['profile']} {slowest['mode']}",
+                       slowest_mb_per_s=slowest["mb_per_s"])
+    return summary
+
+
+def sort_summaries(summaries, key="fullest"):
+    """Sort host rows by one of SORT_KEYS; hosts without the value (or unreachable) go last."""
+    field, reverse = SORT_KEYS[key]
+    present = [row for row in summaries if row[field] is not None]
+    missing = [row for row in summaries if row[field] is None]
+    return sorted(present, key=lambda row: row[field], reverse=reverse) + missing
+
+
+def fleet_document(results, key="fullest"):
+    """Fleet-wide JSON export: sorted summaries plus each host's full report."""
+    return {
+        "collected_at": time.time(),
+        "sort": key,
+        "hosts": sort_summaries([summarize(result) for result in results], key),
+        "reports": {result.host: result.report for result in results if result.report is not None},
+    }
@@ -0,0 +1,99 @@
+"""Fixed-memory, log-bucketed latency histogram.
+
+Values (nanoseconds) are bucketed HDR-style: exact below 2**SUB_BUCKET_BITS,
+then each power of two is split into 2**(SUB_BUCKET_BITS - 1) linear
+sub-buckets, so every recorded value is within 1/64 (~1.6%) of its bucket.
+Counts live in a single preallocated `array`, so recording never allocates
+and the memory use is fixed regardless of how many samples are taken.
+"""
+
+from array import array
+
+SUB_BUCKET_BITS = 7
+MAX_VALUE_BITS = 40  # ~18 minutes in nanoseconds; larger samples clamp
+
+_HALF = 1 << (SUB_BUCKET_BITS - 1)
+_LINEAR = 1 << SUB_BUCKET_BITS
+_MAX_SHIFT = MAX_VALUE_BITS - SUB_BUCKET_BITS
+BUCKET_COUNT = ((_MAX_SHIFT + 1) << (SUB_BUCKET_BITS - 1)) + _HALF
+
+REPORT_PERCENTILES = (50, 90, 99, 99.9)
+
+
+def bucket_index(value):
+    """Bucket holding `value`; values past the range land in the last bucket."""
+    if value < _LINEAR:
+        return max(0, value)
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    if shift > _MAX_SHIFT:
+        return BUCKET_COUNT - 1
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+
+def bucket_upper(index):
+    """Highest value that maps to bucket `index`."""
+    if index < _LINEAR:
+        return index
+    shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+    sub_bucket = index - (shift << (SUB_BUCKET_BITS - 1))
+    return ((sub_bucket + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Latency histogram in nanoseconds. Not thread safe: use one per thread and merge()."""
+
+    __slots__ = ("counts", "total", "min", "max", "sum")
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * BUCKET_COUNT))
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self.sum = 0
+
+    def record(self, value):
+        self.counts[bucket_index(value)] += 1
+        if self.total == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total += 1
+        self.sum += value
+
+    def merge(self, other):
+        """Add `other`'s samples into this histogram."""
+        if not other.total:
+            return self
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.min = other.min if self.total == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self.sum += other.sum
+        return self
+
+    def percentile(self, point):
+        """Value at percentile `point` (0-100), never above the recorded max."""
+        if not self.total:
+            return 0
+        target = max(1, -(-self.total * point // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(bucket_upper(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.total if self.total else 0.0
+
+    def summary_us(self, points=REPORT_PERCENTILES):
+        """Percentiles, max and mean in microseconds keyed "p50", "p99.9", "max"..."""
+        if not self.total:
+            return {}
+        result = {f"p{point:g}": self.percentile(point) / 1000 for point in points}
+        result["max"] = self.max / 1000
+        result["mean"] = self.mean() / 1000
+        return result
@@ -0,0 +1,173 @@
+"""Persistent benchmark history with per-drive trend and regression checks.
+
+Every benchmark result is appended to a small SQLite database. Lookups of
+"last N runs for drive X" go through an index on (drive, profile, mode,
+timestamp), so they stay fast as the history grows.
+"""
+
+import sqlite3
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+
+HISTORY_FILE_NAME = "diskinfo_history.sqlite3"
+
+BASELINE_WINDOW = 5  # Previous runs that make up the rolling baseline
+REGRESSION_THRESHOLD = 0.15  # 15% slower throughput or higher p99 is flagged
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS benchmark_runs (
+    id INTEGER PRIMARY KEY,
+    drive TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    io_mode TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    mb_per_s REAL NOT NULL,
+    iops REAL NOT NULL,
+    p50_us REAL,
+    p90_us REAL,
+    p99_us REAL,
+    p999_us REAL,
+    max_us REAL
+);
+CREATE INDEX IF NOT EXISTS benchmark_runs_drive
+    ON benchmark_runs (drive, profile, mode, timestamp DESC);
+"""
+
+_COLUMNS = "drive, profile, mode, io_mode, timestamp, mb_per_s, iops, p50_us, p90_us, p99_us, p999_us, max_us"
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryRecord:
+    drive: str
+    profile: str
+    mode: str
+    io_mode: str
+    timestamp: float
+    mb_per_s: float
+    iops: float
+    p50_us: float = None
+    p90_us: float = None
+    p99_us: float = None
+    p999_us: float = None
+    max_us: float = None
+
+
+@dataclass(frozen=True)
+class Regression:
+    """Latest run of a profile that fell behind its rolling baseline."""
+    record: HistoryRecord
+    metric: str  # "throughput" or "p99 latency"
+    baseline: float
+    change: float  # Fractional change against the baseline, signed
+
+
+class BenchmarkHistory:
+    """SQLite-backed store of benchmark runs. Safe to share between threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, drive, results, timestamp=None):
+        """Store a list of BenchmarkResult for `drive`; returns the stored records."""
+        timestamp = time.time() if timestamp is None else timestamp
+        records = [
+            HistoryRecord(
+                drive=drive,
+                profile=result.profile,
+                mode=result.mode,
+                io_mode=result.io_mode,
+                timestamp=timestamp,
+                mb_per_s=result.mb_per_s,
+                iops=result.iops,
+                p50_us=result.latency_us.get("p50"),
+                p90_us=result.latency_us.get("p90"),
+                p99_us=result.latency_us.get("p99"),
+                p999_us=result.latency_us.get("p99.9"),
+                max_us=result.latency_us.get("max"),
+            )
+            for result in results
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO benchmark_runs ({_COLUMNS}) VALUES ({', '.join('?' * 12)})",
+                [_record_row(record) for record in records]
+            )
+        return records
+
+    def last_runs(self, drive, limit=10, profile=None, mode=None):
+        """Most recent runs for `drive`, newest first, optionally for one profile/mode."""
+        query = f"SELECT {_COLUMNS} FROM benchmark_runs WHERE drive = ?"
+        params = [drive]
+        if profile is not None:
+            query += " AND profile = ?"
+            params.append(profile)
+        if mode is not None:
+            query += " AND mode = ?"
+            params.append(mode)
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [HistoryRecord(*row) for row in rows]
+
+    def drives(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT drive FROM benchmark_runs ORDER BY drive").fetchall()
+        return [row[0] for row in rows]
+
+    def latest(self, drive):
+        """Newest run of every profile/mode measured on `drive`."""
+        with self._lock:
+            keys = self._conn.execute(
+                "SELECT DISTINCT profile, mode FROM benchmark_runs WHERE drive = ? ORDER BY profile, mode", (drive,)
+            ).fetchall()
+        return [self.last_runs(drive, 1, profile, mode)[0] for profile, mode in keys]
+
+    def series(self, drive, profile, mode, limit=30):
+        """Oldest-to-newest runs of one profile/mode, ready for a trend chart."""
+        return list(reversed(self.last_runs(drive, limit, profile, mode)))
+
+    def regressions(self, drive, window=BASELINE_WINDOW, threshold=REGRESSION_THRESHOLD):
+        """Compare each profile/mode's latest run against the median of the runs before it.
+
+        Only runs with the same io_mode are compared, since cached and direct
+        numbers are not comparable.
+        """
+        with self._lock:
+            keys = self._conn.execute(
+                "SELECT DISTINCT profile, mode FROM benchmark_runs WHERE drive = ?", (drive,)
+            ).fetchall()
+
+        found = []
+        for profile, mode in keys:
+            runs = self.last_runs(drive, window + 1, profile, mode)
+            latest, previous = runs[0], [run for run in runs[1:] if run.io_mode == runs[0].io_mode]
+            if not previous:
+                continue
+            baseline = statistics.median(run.mb_per_s for run in previous)
+            if baseline and latest.mb_per_s < baseline * (1 - threshold):
+                found.append(Regression(latest, "throughput", baseline, latest.mb_per_s / baseline - 1))
+            p99s = [run.p99_us for run in previous if run.p99_us]
+            if p99s and latest.p99_us:
+                baseline = statistics.median(p99s)
+                if latest.p99_us > baseline * (1 + threshold):
+                    found.append(Regression(latest, "p99 latency", baseline, latest.p99_us / baseline - 1))
+        return found
+
+
+def _record_row(record):
+    return (
+        record.drive, record.profile, record.mode, record.io_mode, record.timestamp,
+        record.mb_per_s, record.iops, record.p50_us, record.p90_us, record.p99_us,
+        record.p999_us, record.max_us,
+    )
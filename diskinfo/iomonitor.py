@@ -0,0 +1,175 @@
+"""Live per-disk I/O rates from psutil's cumulative counters.
+
+A sampler thread reads `psutil.disk_io_counters(perdisk=True)` every
+`interval` seconds and turns the deltas into throughput, IOPS, average
+latency and busy time. Each metric of each disk lives in a fixed-size
+`RingBuffer` backed by array('d'), so memory stays constant however long
+the monitor runs.
+"""
+
+import logging
+import math
+import threading
+import time
+from array import array
+
+log = logging.getLogger(__name__)
+
+MIN_INTERVAL = 0.1
+DEFAULT_INTERVAL = 1.0
+DEFAULT_CAPACITY = 600  # Samples kept per metric: 10 minutes at 1 s, 1 minute at 100 ms
+
+READ_MB_S = "read_mb_s"
+WRITE_MB_S = "write_mb_s"
+READ_IOPS = "read_iops"
+WRITE_IOPS = "write_iops"
+LATENCY_MS = "latency_ms"
+BUSY_PCT = "busy_pct"
+METRICS = (READ_MB_S, WRITE_MB_S, READ_IOPS, WRITE_IOPS, LATENCY_MS, BUSY_PCT)
+
+_MB = 1024 * 1024
+NAN = math.nan
+
+
+class RingBuffer:
+    """Fixed-capacity float buffer that overwrites its oldest sample."""
+
+    __slots__ = ("_data", "_start", "_count")
+
+    def __init__(self, capacity):
+        self._data = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._count = 0
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        capacity = len(self._data)
+        if self._count < capacity:
+            self._data[(self._start + self._count) % capacity] = value
+            self._count += 1
+        else:
+            self._data[self._start] = value
+            self._start = (self._start + 1) % capacity
+
+    def last(self, default=NAN):
+        if not self._count:
+            return default
+        return self._data[(self._start + self._count - 1) % len(self._data)]
+
+    def values(self):
+        """Copy of the samples, oldest first."""
+        end = self._start + self._count
+        if end <= len(self._data):
+            return self._data[self._start:end]
+        return self._data[self._start:] + self._data[:end - len(self._data)]
+
+
+def rates(previous, current, seconds):
+    """Per-second rates between two psutil sdiskio readings.
+
+    Latency is the average time per completed request in the interval, or
+    NaN when nothing completed. Busy time is only reported by some
+    platforms (Linux, FreeBSD) and is NaN elsewhere.
+    """
+    reads = current.read_count - previous.read_count
+    writes = current.write_count - previous.write_count
+    read_bytes = current.read_bytes - previous.read_bytes
+    write_bytes = current.write_bytes - previous.write_bytes
+    if min(reads, writes, read_bytes, write_bytes) < 0 or seconds <= 0:
+        return None  # Counters were reset, e.g. the disk was re-attached
+
+    io_time = (current.read_time - previous.read_time) + (current.write_time - previous.write_time)
+    busy = NAN
+    if hasattr(current, "busy_time"):
+        busy = min(100.0, max(0.0, (current.busy_time - previous.busy_time) / (seconds * 1000) * 100))
+    return {
+        READ_MB_S: read_bytes / _MB / seconds,
+        WRITE_MB_S: write_bytes / _MB / seconds,
+        READ_IOPS: reads / seconds,
+        WRITE_IOPS: writes / seconds,
+        LATENCY_MS: io_time / (reads + writes) if reads + writes else NAN,
+        BUSY_PCT: busy,
+    }
+
+
+def _psutil_counters():
+    import psutil
+    return psutil.disk_io_counters(perdisk=True) or {}
+
+
+class IoMonitor(threading.Thread):
+    """Background sampler keeping a ring buffer per disk and metric."""
+
+    def __init__(self, interval=DEFAULT_INTERVAL, capacity=DEFAULT_CAPACITY,
+                 read_counters=_psutil_counters, clock=time.monotonic):
+        super().__init__(name="diskinfo-iomonitor", daemon=True)
+        self.interval = max(MIN_INTERVAL, interval)
+        self.capacity = capacity
+        self.read_counters = read_counters
+        self.clock = clock
+        self.samples = 0
+        self._history = {}
+        self._previous = None
+        self._lock = threading.Lock()
+        self._halt = threading.Event()
+
+    def set_interval(self, interval):
+        self.interval = max(MIN_INTERVAL, interval)
+
+    def stop(self):
+        self._halt.set()
+
+    def disks(self):
+        with self._lock:
+            return sorted(self._history)
+
+    def series(self, disk, metric):
+        """Samples of one metric, oldest first (an empty array for unknown disks)."""
+        with self._lock:
+            buffers = self._history.get(disk)
+            return buffers[metric].values() if buffers else array("d")
+
+    def latest(self, disk):
+        with self._lock:
+            buffers = self._history.get(disk)
+            return {metric: buffers[metric].last() for metric in METRICS} if buffers else {}
+
+    def sample(self):
+        """Take one reading and append the rates since the previous one."""
+        now = self.clock()
+        counters = self.read_counters()
+        previous, self._previous = self._previous, (now, counters)
+        if previous is None:
+            return
+        seconds = now - previous[0]
+        with self._lock:
+            for disk, current in counters.items():
+                before = previous[1].get(disk)
+                if before is None:
+                    continue
+                values = rates(before, current, seconds)
+                if values is None:
+                    continue
+                buffers = self._history.get(disk)
+                if buffers is None:
+                    buffers = self._history[disk] = {metric: RingBuffer(self.capacity) for metric in METRICS}
+                for metric in METRICS:
+                    buffers[metric].append(values[metric])
+            self.samples += 1
+
+    def run(self):
+        deadline = self.clock()
+        while not self._halt.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                log.debug("Reading disk I/O counters failed: %s", e)
+            # Schedule against a deadline so slow reads don't make the interval drift
+            deadline = max(deadline + self.interval, self.clock())
+            self._halt.wait(deadline - self.clock())
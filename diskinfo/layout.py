@@ -0,0 +1,160 @@
+"""Partition layout of a disk as a sorted list of extents.
+
+`build_layout` turns a topology PhysicalDisk into consecutive extents,
+each either a partition, a reserved area or free space. Partitions are
+placed by their own StartingOffset and Size, not by the size of the file
+system on them. They are sorted by offset whatever order the provider
+listed them in, and partitions without a drive letter (EFI system,
+recovery, OEM) are kept.
+
+Free space is what a new partition could actually use. Gaps are rounded
+inwards to the disk's alignment: 1 MiB, or the physical sector size if
+that is larger. Slack smaller than one alignment unit is left out. That
+covers the partition table in front of the first partition, the backup
+GPT at the end and rounding between partitions. Win32_DiskPartition
+doesn't list the Microsoft Reserved partition, which Windows puts right
+after the EFI system partition. A gap of up to 128 MiB between the EFI
+partition and the next one is therefore shown as reserved, not free.
+Every other gap is free space.
+
+`LayoutCache` keeps one layout per disk and rebuilds it only when the
+disk's topology signature changes.
+"""
+
+import threading
+from dataclasses import dataclass
+
+from .topology import PhysicalDisk
+
+PARTITION = "partition"
+RESERVED = "reserved"
+FREE = "free"
+
+DEFAULT_ALIGNMENT = 1024 * 1024  # What Windows and parted align new partitions to
+MSR_MAX = 128 * 1024 * 1024  # Largest Microsoft Reserved partition Windows creates
+GPT_BACKUP_SECTORS = 33  # Backup header and entries in the disk's last sectors
+
+
+@dataclass(frozen=True, slots=True)
+class Extent:
+    start: int
+    size: int
+    kind: str  # PARTITION, RESERVED or FREE
+    partition: object = None  # topology.Partition for PARTITION extents
+
+    @property
+    def end(self):
+        return self.start + self.size
+
+
+@dataclass(frozen=True, slots=True)
+class DiskLayout:
+    disk: PhysicalDisk
+    extents: tuple
+    size: int  # Disk size, or the end of the last partition if a provider under-reports it
+    alignment: int
+
+    @property
+    def free(self):
+        return sum(extent.size for extent in self.extents if extent.kind == FREE)
+
+    @property
+    def partitions(self):
+        return tuple(extent for extent in self.extents if extent.kind == PARTITION)
+
+
+def alignment(disk):
+    return max(DEFAULT_ALIGNMENT, disk.physical_sector_size, disk.sector_size)
+
+
+def _is_gpt(partitions):
+    return any(partition.type.upper().startswith("GPT") for partition in partitions)
+
+
+def _is_efi(partition):
+    return partition.type.upper() == "GPT: SYSTEM"
+
+
+def _gap(start, end, unit):
+    """The usable, aligned part of [start, end) as a FREE extent, if it holds at least one unit."""
+    aligned_start = -(-start // unit) * unit
+    aligned_end = end // unit * unit
+    if aligned_end - aligned_start < unit:
+        return None
+    return Extent(aligned_start, aligned_end - aligned_start, FREE)
+
+
+def build_layout(disk):
+    """DiskLayout of `disk`: its partitions in offset order with the free and reserved space between them."""
+    unit = alignment(disk)
+    partitions = sorted((partition for partition in disk.partitions if partition.size > 0),
+                        key=lambda partition: (partition.starting_offset, partition.index))
+    size = max([disk.size] + [partition.starting_offset + partition.size for partition in partitions])
+    gpt = _is_gpt(partitions)
+    # A partitioned disk keeps its partition table in front; nothing can start before the first unit
+    first_usable = unit if partitions else 0
+    last_usable = size - GPT_BACKUP_SECTORS * disk.sector_size if gpt else size
+
+    extents = []
+    cursor = 0
+    for partition in partitions:
+        start = max(partition.starting_offset, cursor)  # Overlapping entries are clipped, not drawn twice
+        end = max(start, partition.starting_offset + partition.size)
+        if start > cursor:
+            previous = extents[-1] if extents else None
+            if (previous is not None and previous.kind == PARTITION and _is_efi(previous.partition)
+                    and unit <= start - cursor <= MSR_MAX):
+                extents.append(Extent(cursor, start - cursor, RESERVED))
+            else:
+                gap = _gap(max(cursor, first_usable), start, unit)
+                if gap is not None:
+                    extents.append(gap)
+        if end > start:
+            extents.append(Extent(start, end - start, PARTITION, partition))
+        cursor = max(cursor, end)
+    gap = _gap(max(cursor, first_usable), last_usable, unit)
+    if gap is not None:
+        extents.append(gap)
+    return DiskLayout(disk=disk, extents=tuple(extents), size=size, alignment=unit)
+
+
+def label(extent):
+    """Display name of an extent: the drive letter or mountpoint where there is one."""
+    if extent.kind == FREE:
+        return "Unallocated"
+    if extent.kind == RESERVED:
+        return "Reserved"
+    partition = extent.partition
+    if partition.volumes:
+        return partition.volumes[0].device_id
+    if _is_efi(partition):
+        return "EFI System Partition"
+    return f"Partition {partition.index + 1}"
+
+
+class LayoutCache:
+    """Layouts of the disks in a topology, rebuilt only for disks whose signature changed."""
+
+    def __init__(self):
+        self._layouts = {}  # DeviceID -> DiskLayout
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, disk):
+        with self._lock:
+            layout = self._layouts.get(disk.device_id)
+        if layout is not None and layout.disk.signature == disk.signature:
+            return layout
+        layout = build_layout(disk)
+        with self._lock:
+            self._layouts[disk.device_id] = layout
+            self.builds += 1
+        return layout
+
+    def layouts(self, topology):
+        """One DiskLayout per disk of `topology`, in disk order; disks no longer present are forgotten."""
+        built = tuple(self.get(disk) for disk in topology.disks)
+        with self._lock:
+            for device_id in set(self._layouts) - set(topology.disks_by_id):
+                del self._layouts[device_id]
+        return built
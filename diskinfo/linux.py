@@ -0,0 +1,280 @@
+"""Disk topology on Linux from sysfs and procfs.
+
+`LinuxProvider` builds the same `Topology` as the WMI loader without
+spawning any process. /proc/partitions and /proc/self/mountinfo are each
+read once; per-disk attributes come from small files under /sys/block,
+each read with a single unbuffered read(). Every path is taken relative
+to `root`, so the provider can be pointed at a fake tree in a temporary
+directory:
+
+    root/proc/partitions
+    root/proc/self/mountinfo
+    root/sys/block/<disk>/{size,removable,device/model,device/serial,queue/*}
+    root/sys/block/<disk>/<partition>/{partition,start,size,holders/}
+    root/<mountpoint>  (statvfs'd for volume sizes)
+    root/dev/<disk>  (only opened for SMART)
+
+Device-mapper (LVM, LUKS) and md RAID devices aren't listed as disks.
+A file system mounted on one is shown as a volume of each partition or
+disk under it, found through the `holders` links in sysfs.
+
+SMART comes from ioctls on the device node, which need root (or
+CAP_SYS_RAWIO): HDIO_DRIVE_CMD SMART READ DATA/THRESHOLDS for ATA disks
+(libata translates it for SATA behind the SCSI layer) and the NVMe admin
+Get Log Page command for the SMART / Health Information log.
+"""
+
+import ctypes
+import logging
+import os
+import struct
+from dataclasses import replace
+
+from .smart import parse_ata_smart, parse_nvme_health_log, predicts_failure
+from .topology import Partition, PhysicalDisk, SmartStatus, TopologyProvider, Volume, index_topology
+
+log = logging.getLogger(__name__)
+
+SECTOR = 512  # sysfs reports start and size in 512-byte units whatever the device's sector size
+
+# Block devices that are never physical disks
+VIRTUAL_PREFIXES = ("loop", "ram", "zram", "fd", "sr", "nbd", "dm-", "md")
+
+HDIO_DRIVE_CMD = 0x031F
+ATA_SMART = 0xB0
+SMART_READ_DATA = 0xD0
+SMART_READ_THRESHOLDS = 0xD1
+NVME_IOCTL_ADMIN_CMD = 0xC0484E41  # _IOWR('N', 0x41, struct nvme_admin_cmd)
+NVME_GET_LOG_PAGE = 0x02
+NVME_SMART_LOG = 0x02
+NVME_ADMIN_CMD = struct.Struct("<BBHIIIQQII6III")  # struct nvme_admin_cmd, 72 bytes
+SMART_SECTOR = 512
+
+
+def _read(path, default=None):
+    """Contents of a small sysfs/procfs file, stripped, or `default` if it can't be read."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return default
+    try:
+        return os.read(fd, 65536).decode("utf-8", "replace").strip()
+    except OSError:
+        return default
+    finally:
+        os.close(fd)
+
+
+def _int(text, default=0):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_partitions(text):
+    """{name: "major:minor"} from the contents of /proc/partitions."""
+    devices = {}
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) == 4:
+            devices[fields[3]] = f"{fields[0]}:{fields[1]}"
+    return devices
+
+
+def _unescape(field):
+    # mountinfo escapes space, tab, newline and backslash as octal
+    return (field.replace("\\040", " ").replace("\\011", "\t")
+            .replace("\\012", "\n").replace("\\134", "\\"))
+
+
+def parse_mountinfo(text):
+    """{"major:minor": (mountpoint, fstype)} for the first mount of each device's root.
+
+    Bind mounts (whose root inside the file system isn't "/") are skipped,
+    so every device maps to the mountpoint a user would think of.
+    """
+    mounts = {}
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            separator = fields.index("-", 6)
+        except ValueError:
+            continue
+        device, root, mountpoint = fields[2], fields[3], _unescape(fields[4])
+        if root != "/" or device in mounts or len(fields) <= separator + 1:
+            continue
+        mounts[device] = (mountpoint, fields[separator + 1])
+    return mounts
+
+
+def _ata_smart_command(fd, feature, sector):
+    """One 512-byte SMART sector through HDIO_DRIVE_CMD (4-byte header, then the data)."""
+    import fcntl
+    buffer = bytearray([ATA_SMART, sector, feature, 1]) + bytearray(SMART_SECTOR)
+    fcntl.ioctl(fd, HDIO_DRIVE_CMD, buffer)
+    return bytes(buffer[4:])
+
+
+def read_ata_smart(device):
+    """SmartAttributes of an ATA disk, read with SMART READ DATA and READ THRESHOLDS."""
+    fd = os.open(device, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        data = _ata_smart_command(fd, SMART_READ_DATA, 0)
+        thresholds = _ata_smart_command(fd, SMART_READ_THRESHOLDS, 1)
+    finally:
+        os.close(fd)
+    return parse_ata_smart(data, thresholds)
+
+
+def read_nvme_health(device):
+    """SmartAttributes from an NVMe device's SMART / Health Information log page."""
+    import fcntl
+    log_page = ctypes.create_string_buffer(SMART_SECTOR)
+    dwords = SMART_SECTOR // 4 - 1  # NUMD is zero-based
+    command = bytearray(NVME_ADMIN_CMD.pack(
+        NVME_GET_LOG_PAGE, 0, 0, 0xFFFFFFFF, 0, 0, 0, ctypes.addressof(log_page), 0, SMART_SECTOR,
+        (dwords << 16) | NVME_SMART_LOG, 0, 0, 0, 0, 0, 0, 0,
+    ))
+    fd = os.open(device, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        fcntl.ioctl(fd, NVME_IOCTL_ADMIN_CMD, command)
+    finally:
+        os.close(fd)
+    return parse_nvme_health_log(log_page.raw)
+
+
+def _interface(sys_path, name):
+    if name.startswith("nvme"):
+        return "NVMe"
+    if name.startswith("mmcblk"):
+        return "MMC"
+    if name.startswith("vd"):
+        return "VirtIO"
+    real = os.path.realpath(sys_path)
+    if "/usb" in real:
+        return "USB"
+    if "/ata" in real:
+        return "SATA"
+    return "SCSI"
+
+
+class LinuxProvider(TopologyProvider):
+    """Topology from /sys/block, /proc/partitions and /proc/self/mountinfo."""
+
+    def __init__(self, root="/"):
+        self.root = root
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def load_topology(self, include_smart=True):
+        devices = parse_partitions(_read(self._path("proc", "partitions"), ""))
+        mounts = parse_mountinfo(_read(self._path("proc", "self", "mountinfo"), ""))
+        block = self._path("sys", "block")
+        try:
+            names = sorted(os.listdir(block))
+        except OSError as e:
+            raise OSError(f"Cannot list {block}: {e}") from e
+
+        disks = []
+        for name in names:
+            if name.startswith(VIRTUAL_PREFIXES):
+                continue
+            disk = self._load_disk(os.path.join(block, name), name, len(disks), devices, mounts)
+            if disk is not None and include_smart:
+                disk = replace(disk, smart=self._smart(name, disk.interface))
+            if disk is not None:
+                disks.append(disk)
+        return index_topology(disks)
+
+    def _smart(self, name, interface):
+        """SmartStatus from the device node, or None if it can't be read (no root, no SMART, USB bridge)."""
+        device = self._path("dev", name)
+        try:
+            if interface == "NVMe":
+                attributes = read_nvme_health(device)
+            elif interface in ("SATA", "SCSI"):
+                attributes = read_ata_smart(device)
+            else:
+                return None
+        except OSError as e:
+            log.debug("SMART unavailable for %s: %s", device, e)
+            return None
+        if not attributes:
+            return None
+        return SmartStatus(device, predicts_failure(attributes), None, attributes)
+
+    def _load_disk(self, sys_path, name, index, devices, mounts):
+        size = _int(_read(os.path.join(sys_path, "size"))) * SECTOR
+        if not size:
+            return None  # Empty card reader slots and the like
+        queue = os.path.join(sys_path, "queue")
+        rotational = _read(os.path.join(queue, "rotational")) == "1"
+        removable = _read(os.path.join(sys_path, "removable")) == "1"
+
+        partitions = []
+        for entry in sorted(os.listdir(sys_path)):
+            part_path = os.path.join(sys_path, entry)
+            number = _read(os.path.join(part_path, "partition"))
+            if number is None:
+                continue
+            partitions.append(self._partition(
+                name, entry, _int(number), part_path, devices, mounts, index,
+                start=_int(_read(os.path.join(part_path, "start"))) * SECTOR,
+                size=_int(_read(os.path.join(part_path, "size"))) * SECTOR,
+            ))
+
+        # A file system made directly on the whole disk shows up as one disk-sized partition
+        if not partitions and self._mounts(name, sys_path, devices, mounts):
+            partitions.append(self._partition(name, name, 1, sys_path, devices, mounts, index, start=0, size=size))
+
+        return PhysicalDisk(
+            device_id=f"/dev/{name}",
+            index=index,
+            model=(_read(os.path.join(sys_path, "device", "model")) or name).strip(),
+            interface=_interface(sys_path, name),
+            size=size,
+            status="OK",
+            serial=_read(os.path.join(sys_path, "device", "serial"), ""),
+            media_type="Removable media" if removable else ("HDD" if rotational else "SSD"),
+            partitions=tuple(sorted(partitions, key=lambda partition: partition.index)),
+            sector_size=_int(_read(os.path.join(queue, "logical_block_size")), SECTOR) or SECTOR,
+            physical_sector_size=_int(_read(os.path.join(queue, "physical_block_size"))),
+        )
+
+    def _mounts(self, name, sys_path, devices, mounts):
+        """(mountpoint, fstype) of block device `name`, or of the dm/md devices stacked on it."""
+        mount = mounts.get(devices.get(name) or _read(os.path.join(sys_path, "dev")))
+        if mount is not None:
+            return [mount]
+        try:
+            holders = sorted(os.listdir(os.path.join(sys_path, "holders")))
+        except OSError:
+            return []
+        found = []
+        for holder in holders:
+            found.extend(self._mounts(holder, self._path("sys", "block", holder), devices, mounts))
+        return found
+
+    def _partition(self, disk_name, name, number, sys_path, devices, mounts, disk_index, start, size):
+        volumes = []
+        for mountpoint, fstype in self._mounts(name, sys_path, devices, mounts):
+            total = free = 0
+            try:
+                stat = os.statvfs(self._path(mountpoint.lstrip("/")))
+                total, free = stat.f_blocks * stat.f_frsize, stat.f_bavail * stat.f_frsize
+            except OSError as e:
+                log.debug("statvfs(%s) failed: %s", mountpoint, e)
+            volumes.append(Volume(device_id=mountpoint, file_system=fstype, size=total, free_space=free))
+        return Partition(
+            device_id=f"/dev/{name}",
+            disk_index=disk_index,
+            index=number - 1,  # WMI numbers partitions from 0
+            starting_offset=start,
+            size=size,
+            type="",
+            bootable=False,
+            primary=True,  # sysfs doesn't say which MBR partitions are logical
+            volumes=tuple(volumes),
+        )
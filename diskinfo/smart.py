@@ -0,0 +1,318 @@
+"""SMART attribute decoding and trend math.
+
+Decodes the 512-byte ATA SMART data and threshold sectors (as returned by
+MSStorageDriver_FailurePredictData/Thresholds on Windows or the
+HDIO_DRIVE_CMD ioctl on Linux) and the 512-byte NVMe SMART / Health
+Information log page into `SmartAttribute`s, each comparable against its
+threshold. Windows reports NVMe health through MSFT_StorageReliabilityCounter
+instead, which `reliability_attributes` maps the same way. Everything here
+is pure; readers live with their providers.
+"""
+
+import struct
+from dataclasses import dataclass
+
+DOWN = "down"  # Normalized value falls toward the threshold (ATA style)
+UP = "up"  # Value rises toward the threshold (wear, error counts)
+
+ATA_ENTRY = struct.Struct("<BHBB6sx")  # id, flags, current, worst, raw (48-bit), reserved
+ATA_THRESHOLD_ENTRY = struct.Struct("<BB10x")  # id, threshold, reserved
+ATA_ENTRIES = 30
+ATA_PREFAILURE = 0x01  # Flag bit: a value at or below threshold predicts imminent failure
+
+ATA_NAMES = {
+    1: "Raw Read Error Rate",
+    3: "Spin-Up Time",
+    4: "Start/Stop Count",
+    5: "Reallocated Sectors",
+    7: "Seek Error Rate",
+    9: "Power-On Hours",
+    10: "Spin Retry Count",
+    12: "Power Cycle Count",
+    170: "Available Reserved Space",
+    171: "Program Fail Count",
+    172: "Erase Fail Count",
+    173: "Wear Leveling Count",
+    177: "Wear Leveling Count",
+    179: "Used Reserved Blocks",
+    181: "Program Fail Count",
+    182: "Erase Fail Count",
+    183: "Runtime Bad Blocks",
+    184: "End-to-End Errors",
+    187: "Reported Uncorrectable Errors",
+    188: "Command Timeouts",
+    190: "Airflow Temperature",
+    192: "Power-Off Retract Count",
+    193: "Load Cycle Count",
+    194: "Temperature",
+    196: "Reallocation Events",
+    197: "Current Pending Sectors",
+    198: "Offline Uncorrectable",
+    199: "UDMA CRC Errors",
+    231: "SSD Life Left",
+    233: "Media Wearout Indicator",
+    241: "Total LBAs Written",
+    242: "Total LBAs Read",
+}
+
+# Attributes worth showing on the Health page; the rest stay in exports
+KEY_ATTRIBUTES = (
+    "ata.5", "ata.9", "ata.177", "ata.190", "ata.194", "ata.196", "ata.197", "ata.198",
+    "ata.199", "ata.231", "ata.233",
+    "nvme.critical_warning", "nvme.temperature", "nvme.available_spare", "nvme.percentage_used",
+    "nvme.power_on_hours", "nvme.media_errors", "nvme.unsafe_shutdowns",
+    "storage.temperature", "storage.wear", "storage.power_on_hours",
+    "storage.read_errors_uncorrected", "storage.write_errors_uncorrected",
+)
+_TEMPERATURE_IDS = (190, 194)
+_WEAR_IDS = (177, 231, 233)  # Normalized value counts down from 100 as the flash wears
+
+
+@dataclass(frozen=True, slots=True)
+class SmartAttribute:
+    key: str  # "ata.<id>" or "nvme.<field>", stable across reads for the time series
+    name: str
+    value: float  # Normalized value (ATA) or the reported quantity (NVMe)
+    raw: float
+    threshold: float = None  # None when the device defines no limit
+    worst: float = None
+    direction: str = DOWN
+    prefailure: bool = False
+
+    @property
+    def failing(self):
+        if self.threshold is None:
+            return False
+        if self.direction == DOWN:
+            return self.threshold > 0 and self.value <= self.threshold
+        return self.value >= self.threshold
+
+
+def _ata_raw(attribute_id, raw):
+    value = int.from_bytes(raw, "little")
+    if attribute_id in _TEMPERATURE_IDS:
+        return value & 0xFF  # Upper bytes hold min/max on many drives
+    if attribute_id == 9:
+        return value & 0xFFFFFFFF  # Some vendors pack minutes/ms above the hour count
+    return value
+
+
+def parse_ata_smart(data, thresholds=None):
+    """SmartAttributes from the ATA SMART READ DATA (and READ THRESHOLDS) sectors."""
+    data = bytes(data)
+    limits = {}
+    if thresholds:
+        thresholds = bytes(thresholds)
+        for index in range(ATA_ENTRIES):
+            offset = 2 + index * ATA_THRESHOLD_ENTRY.size
+            if offset + ATA_THRESHOLD_ENTRY.size > len(thresholds):
+                break
+            attribute_id, limit = ATA_THRESHOLD_ENTRY.unpack_from(thresholds, offset)
+            if attribute_id:
+                limits[attribute_id] = limit
+
+    attributes = []
+    for index in range(ATA_ENTRIES):
+        offset = 2 + index * ATA_ENTRY.size
+        if offset + ATA_ENTRY.size > len(data):
+            break
+        attribute_id, flags, current, worst, raw = ATA_ENTRY.unpack_from(data, offset)
+        if not attribute_id:
+            continue
+        attributes.append(SmartAttribute(
+            key=f"ata.{attribute_id}",
+            name=ATA_NAMES.get(attribute_id, f"Attribute {attribute_id}"),
+            value=current,
+            raw=_ata_raw(attribute_id, raw),
+            threshold=limits.get(attribute_id),
+            worst=worst,
+            direction=DOWN,
+            prefailure=bool(flags & ATA_PREFAILURE),
+        ))
+    return tuple(attributes)
+
+
+def _u128(data, offset):
+    return int.from_bytes(data[offset:offset + 16], "little")
+
+
+def parse_nvme_health_log(data):
+    """SmartAttributes from the NVMe SMART / Health Information log page (LID 02h)."""
+    data = bytes(data)
+    if len(data) < 192:
+        return ()
+    spare, spare_threshold, used = data[3], data[4], data[5]
+    kelvin = int.from_bytes(data[1:3], "little")
+    counters = [
+        ("data_units_read", "Data Units Read", 32),
+        ("data_units_written", "Data Units Written", 48),
+        ("host_reads", "Host Read Commands", 64),
+        ("host_writes", "Host Write Commands", 80),
+        ("controller_busy_time", "Controller Busy Minutes", 96),
+        ("power_cycles", "Power Cycles", 112),
+        ("power_on_hours", "Power-On Hours", 128),
+        ("unsafe_shutdowns", "Unsafe Shutdowns", 144),
+        ("media_errors", "Media Errors", 160),
+        ("error_log_entries", "Error Log Entries", 176),
+    ]
+    attributes = [
+        SmartAttribute("nvme.critical_warning", "Critical Warning", data[0], data[0],
+                       threshold=1, direction=UP, prefailure=True),
+        SmartAttribute("nvme.temperature", "Temperature", kelvin - 273 if kelvin else 0, kelvin, direction=UP),
+        SmartAttribute("nvme.available_spare", "Available Spare", spare, spare,
+                       threshold=spare_threshold, direction=DOWN, prefailure=True),
+        SmartAttribute("nvme.percentage_used", "Percentage Used", used, used, threshold=100, direction=UP),
+    ]
+    for key, name, offset in counters:
+        count = _u128(data, offset)
+        attributes.append(SmartAttribute(f"nvme.{key}", name, count, count, direction=UP))
+    return tuple(attributes)
+
+
+def reliability_attributes(row):
+    """SmartAttributes from an MSFT_StorageReliabilityCounter row; unreported counters are left out."""
+    fields = [
+        ("temperature", "Temperature", "Temperature", None),
+        ("wear", "Wear", "Percentage Used", 100),
+        ("power_on_hours", "PowerOnHours", "Power-On Hours", None),
+        ("read_errors_uncorrected", "ReadErrorsUncorrected", "Uncorrected Read Errors", None),
+        ("write_errors_uncorrected", "WriteErrorsUncorrected", "Uncorrected Write Errors", None),
+    ]
+    attributes = []
+    for key, field, name, threshold in fields:
+        value = getattr(row, field)
+        if value is not None:
+            attributes.append(SmartAttribute(f"storage.{key}", name, int(value), int(value),
+                                             threshold=threshold, direction=UP))
+    return tuple(attributes)
+
+
+def predicts_failure(attributes):
+    """True when any pre-failure attribute has crossed its threshold."""
+    return any(attribute.failing and attribute.prefailure for attribute in attributes)
+
+
+def temperature(attributes):
+    """Drive temperature in °C, or None if no attribute reports it."""
+    for attribute in attributes:
+        if attribute.key in ("nvme.temperature", "storage.temperature"):
+            return attribute.value
+        if attribute.key in ("ata.194", "ata.190"):
+            return attribute.raw
+    return None
+
+
+def health_percentage(attributes, predicted_failure=False):
+    """Remaining life estimate: wear indicators where present, capped at 50 once failure is predicted."""
+    health = 100
+    for attribute in attributes:
+        if attribute.key in ("nvme.percentage_used", "storage.wear"):
+            health = min(health, max(0, 100 - attribute.value))
+        elif attribute.key in (f"ata.{attribute_id}" for attribute_id in _WEAR_IDS):
+            health = min(health, attribute.value)
+    if predicted_failure or predicts_failure(attributes):
+        health = min(health, 50)
+    return int(health)
+
+
+@dataclass(frozen=True, slots=True)
+class Trend:
+    raw_per_day: float
+    value_per_day: float
+    days_to_threshold: float = None  # None when the value isn't heading toward its threshold
+
+
+def _slope(points):
+    """Least-squares slope of (x, y) points; 0 when x doesn't vary."""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def trend(readings, attribute):
+    """Rate of change and projected time-to-threshold from (timestamp, value, raw) readings."""
+    if len(readings) < 2:
+        return None
+    days = [(timestamp / 86400, value, raw) for timestamp, value, raw in readings]
+    value_per_day = _slope([(day, value) for day, value, _ in days])
+    raw_per_day = _slope([(day, raw) for day, _, raw in days])
+
+    remaining = None
+    if attribute.threshold is not None and value_per_day:
+        gap = attribute.threshold - attribute.value
+        heading = value_per_day < 0 if attribute.direction == DOWN else value_per_day > 0
+        if heading and (gap < 0 if attribute.direction == DOWN else gap > 0):
+            remaining = gap / value_per_day
+    return Trend(raw_per_day, value_per_day, remaining)
+
+
+@dataclass(frozen=True, slots=True)
+class HealthStatus:
+    """Health summary of one physical disk."""
+    device_id: str
+    model: str
+    status: str
+    predicted_failure: bool = False
+    reason: str = "No issues detected"
+    health_percentage: int = 100
+    temperature: float = None
+    attributes: tuple = ()
+    trends: tuple = ()  # Trend or None per attribute, in the same order; empty without history
+
+    def to_dict(self):
+        """The plain-data form collectors, exporters and agents pass around."""
+        trends = self.trends or (None,) * len(self.attributes)
+        return {
+            "model": self.model,
+            "status": self.status,
+            "predicted_failure": self.predicted_failure,
+            "reason": self.reason,
+            "health_percentage": self.health_percentage,
+            "temperature": self.temperature,
+            "attributes": [_attribute_dict(attribute, trend) for attribute, trend in zip(self.attributes, trends)],
+        }
+
+
+def _attribute_dict(attribute, trend):
+    return {
+        "key": attribute.key,
+        "name": attribute.name,
+        "value": attribute.value,
+        "worst": attribute.worst,
+        "threshold": attribute.threshold,
+        "raw": attribute.raw,
+        "failing": attribute.failing,
+        "prefailure": attribute.prefailure,
+        "raw_per_day": trend.raw_per_day if trend is not None else None,
+        "value_per_day": trend.value_per_day if trend is not None else None,
+        "days_to_threshold": trend.days_to_threshold if trend is not None else None,
+    }
+
+
+def health_status(disk, trends=None):
+    """HealthStatus of a topology PhysicalDisk; `trends` maps attribute keys to Trends."""
+    if disk.smart is None:
+        return HealthStatus(disk.device_id, disk.model, disk.status)
+    attributes = disk.smart.attributes
+    failing = [attribute.name for attribute in attributes if attribute.failing]
+    if failing:
+        reason = f"At or past threshold: {', '.join(failing)}"
+    elif disk.smart.reason is not None:
+        reason = disk.smart.reason
+    else:
+        reason = "No issues detected" if attributes else "Unknown"
+    return HealthStatus(
+        device_id=disk.device_id,
+        model=disk.model,
+        status=disk.status,
+        predicted_failure=disk.smart.predict_failure,
+        reason=reason,
+        health_percentage=health_percentage(attributes, disk.smart.predict_failure),
+        temperature=temperature(attributes),
+        attributes=attributes,
+        trends=tuple(trends.get(attribute.key) for attribute in attributes) if trends else (),
+    )
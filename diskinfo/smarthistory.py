@@ -0,0 +1,114 @@
+"""Persistent SMART attribute time series.
+
+Every SMART read is offered to `SmartHistory.record`, but a reading is only
+written when the attribute changed or the last stored point is older than
+`KEEPALIVE`, so a drive that sits unchanged for a year costs a handful of
+rows per attribute rather than one per refresh. Rows live in a WITHOUT ROWID
+table keyed by (disk, attribute, timestamp), which is also the order the
+trend queries read them in.
+"""
+
+import sqlite3
+import threading
+import time
+
+from .smart import trend
+
+SMART_HISTORY_FILE_NAME = "diskinfo_smart.sqlite3"
+
+KEEPALIVE = 6 * 3600  # Store an unchanged reading at most this often
+TREND_WINDOW = 30 * 86400  # Readings that feed the rate of change
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS smart_readings (
+    disk TEXT NOT NULL,
+    attribute TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    value REAL NOT NULL,
+    raw REAL NOT NULL,
+    PRIMARY KEY (disk, attribute, timestamp)
+) WITHOUT ROWID;
+"""
+
+
+def disk_key(disk):
+    """Stable history key for a topology PhysicalDisk: model and serial survive re-enumeration, DeviceID doesn't."""
+    if disk.serial:
+        return f"{disk.model} {disk.serial}".strip()
+    return disk.device_id
+
+
+class SmartHistory:
+    """SQLite-backed SMART readings. Safe to share between threads.
+
+    The database is opened on first use, so creating one costs nothing at
+    startup and the connection is made on the collector thread.
+    """
+
+    def __init__(self, path, keepalive=KEEPALIVE):
+        self.path = path
+        self.keepalive = keepalive
+        self._lock = threading.Lock()
+        self._conn = None
+        self._last = {}  # (disk, attribute) -> (timestamp, value, raw) of the newest stored row
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _newest(self, conn, disk, attribute):
+        key = (disk, attribute)
+        if key not in self._last:
+            self._last[key] = conn.execute(
+                "SELECT timestamp, value, raw FROM smart_readings WHERE disk = ? AND attribute = ? "
+                "ORDER BY timestamp DESC LIMIT 1", key
+            ).fetchone()
+        return self._last[key]
+
+    def record(self, disk, attributes, timestamp=None):
+        """Store the SmartAttributes read from `disk` at `timestamp`; returns how many rows were written."""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            conn = self._connection()
+            rows = []
+            for attribute in attributes:
+                newest = self._newest(conn, disk, attribute.key)
+                if newest is not None:
+                    stored_at, value, raw = newest
+                    if timestamp <= stored_at:
+                        continue  # Same (cached) read offered again
+                    if (value, raw) == (attribute.value, attribute.raw) and timestamp - stored_at < self.keepalive:
+                        continue
+                rows.append((disk, attribute.key, timestamp, attribute.value, attribute.raw))
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO smart_readings VALUES (?, ?, ?, ?, ?)", rows)
+            for row in rows:
+                self._last[row[:2]] = row[2:]
+        return len(rows)
+
+    def readings(self, disk, attribute, since=None):
+        """Oldest-to-newest (timestamp, value, raw) for one attribute of `disk`."""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT timestamp, value, raw FROM smart_readings WHERE disk = ? AND attribute = ? "
+                "AND timestamp >= ? ORDER BY timestamp",
+                (disk, attribute, since or 0)
+            ).fetchall()
+
+    def trends(self, disk, attributes, window=TREND_WINDOW, now=None):
+        """{attribute key: smart.Trend} over the last `window` seconds; attributes with one point are left out."""
+        since = (time.time() if now is None else now) - window
+        found = {}
+        for attribute in attributes:
+            result = trend(self.readings(disk, attribute.key, since), attribute)
+            if result is not None:
+                found[attribute.key] = result
+        return found
@@ -0,0 +1,387 @@
+"""Parallel directory-tree space analysis with a persistent index.
+
+`SpaceScanner` walks a tree with `os.scandir` on a small work-stealing
+pool: each worker pushes the subdirectories it finds onto its own deque
+and pops from its tail, and an idle worker steals from the head of
+another's. Results go into a `ScanTree`, which stores directories column-wise in
+typed arrays (parent, first child, next sibling, sizes, counts, mtime).
+Files are only counted into their directory, so memory grows with the
+number of directories, not files.
+
+When a directory is finished its size is added to every ancestor's total.
+The tree can therefore be read (e.g. drawn as a treemap) at any moment
+during the scan and shows everything counted so far.
+
+A finished tree can be saved with `save_index` and passed to the next
+scan as `previous`. A directory whose mtime hasn't changed then reuses
+its saved file counts instead of being listed; only its subdirectories
+are stat()ed and descended. A directory's mtime changes when entries are
+added, removed or renamed, not when a file inside it grows, so a rescan
+can miss in-place growth. Run a full scan to be exact.
+"""
+
+import array
+import hashlib
+import json
+import os
+import stat
+import struct
+import sys
+import threading
+import time
+from collections import deque
+
+INDEX_MAGIC = b"DISKINFO-SCAN\n"
+INDEX_VERSION = 1
+_COLUMNS = (  # (attribute, typecode) in index file order
+    ("parent", "q"), ("first_child", "q"), ("next_sibling", "q"),
+    ("own_size", "Q"), ("total_size", "Q"), ("files", "Q"), ("total_files", "Q"),
+    ("mtime", "d"), ("done", "b"),
+)
+NONE = -1
+IDLE_WAIT = 0.005  # Seconds an idle worker sleeps before looking for work to steal again
+
+
+class ScanTree:
+    """Directories of one scan in parallel arrays; node 0 is `root`.
+
+    Writers hold `lock`. Readers may look at the arrays without it and
+    see a consistent-enough picture for display while a scan runs.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.scanned_at = None
+        self.errors = 0
+        self.lock = threading.Lock()
+        for name, typecode in _COLUMNS:
+            setattr(self, name, array.array(typecode))
+        self.names = []  # One str per directory
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self, parent, name, mtime):
+        """Append a directory below `parent` (NONE for the root); returns its node id."""
+        with self.lock:
+            node = len(self.parent)
+            self.parent.append(parent)
+            self.first_child.append(NONE)
+            self.next_sibling.append(self.first_child[parent] if parent != NONE else NONE)
+            if parent != NONE:
+                self.first_child[parent] = node
+            for column in (self.own_size, self.total_size, self.files, self.total_files):
+                column.append(0)
+            self.mtime.append(mtime)
+            self.done.append(0)
+            self.names.append(name)
+            return node
+
+    def complete(self, node, own_size, files):
+        """Record the files directly in `node` and add them to every ancestor's totals."""
+        with self.lock:
+            self.own_size[node] = own_size
+            self.files[node] = files
+            self.done[node] = 1
+            while node != NONE:
+                self.total_size[node] += own_size
+                self.total_files[node] += files
+                node = self.parent[node]
+
+    def children(self, node):
+        child = self.first_child[node]
+        while child != NONE:
+            yield child
+            child = self.next_sibling[child]
+
+    def path(self, node):
+        parts = []
+        while node > 0:
+            parts.append(self.names[node])
+            node = self.parent[node]
+        return os.path.join(self.root, *reversed(parts))
+
+    def largest_children(self, node, limit=None):
+        """(child, total size) of `node`'s subdirectories, biggest first."""
+        found = sorted(((child, self.total_size[child]) for child in self.children(node)),
+                       key=lambda item: item[1], reverse=True)
+        return found[:limit] if limit is not None else found
+
+    def find(self, path):
+        """Node id of a directory path inside the tree, or None."""
+        relative = os.path.relpath(path, self.root)
+        node = 0
+        if relative == os.curdir:
+            return node
+        for part in relative.split(os.sep):
+            node = next((child for child in self.children(node) if self.names[child] == part), None)
+            if node is None:
+                return None
+        return node
+
+
+def index_path(directory, root):
+    """Where the index of a scan of `root` is kept inside `directory`."""
+    digest = hashlib.blake2b(os.path.abspath(root).encode("utf-8", "surrogateescape"), digest_size=8).hexdigest()
+    return os.path.join(directory, f"diskinfo_scan_{digest}.idx")
+
+
+def save_index(tree, path):
+    """Write `tree` as a header plus raw arrays; replaces `path` atomically."""
+    header = json.dumps({
+        "version": INDEX_VERSION,
+        "root": tree.root,
+        "count": len(tree),
+        "scanned_at": tree.scanned_at,
+        "errors": tree.errors,
+        "byteorder": sys.byteorder,
+    }).encode("utf-8")
+    names = "\0".join(tree.names).encode("utf-8", "surrogateescape")
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(INDEX_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for name, _ in _COLUMNS:
+            getattr(tree, name).tofile(f)
+        f.write(struct.pack("<Q", len(names)))
+        f.write(names)
+    os.replace(temporary, path)
+
+
+def load_index(path):
+    """ScanTree saved by save_index; raises ValueError if the file isn't a usable index."""
+    with open(path, "rb") as f:
+        if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a scan index")
+        (length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(length))
+        if header.get("version") != INDEX_VERSION:
+            raise ValueError(f"{path} has index version {header.get('version')}")
+        tree = ScanTree(header["root"])
+        tree.scanned_at = header["scanned_at"]
+        tree.errors = header.get("errors", 0)
+        for name, _ in _COLUMNS:
+            column = getattr(tree, name)
+            column.fromfile(f, header["count"])
+            if header["byteorder"] != sys.byteorder:
+                column.byteswap()
+        (length,) = struct.unpack("<Q", f.read(8))
+        tree.names = f.read(length).decode("utf-8", "surrogateescape").split("\0") if header["count"] else []
+    if len(tree.names) != len(tree):
+        raise ValueError(f"{path} is truncated")
+    return tree
+
+
+def _is_junction(entry):
+    # Windows junctions look like directories but may point anywhere, even at an ancestor
+    is_junction = getattr(entry, "is_junction", None)  # Python 3.12+
+    return is_junction is not None and is_junction()
+
+
+class SpaceScanner:
+    """Scans `root` into `self.tree` on `workers` threads.
+
+    `previous` is an earlier ScanTree of the same root (see load_index)
+    whose unchanged directories are reused. Mount points below `root` are
+    not crossed unless `cross_devices` is set. `index` is a path the
+    finished tree is saved to. Unless `previous` is given, the tree saved
+    there by the last scan is loaded at the start of run(), off the
+    caller's thread, and reused; if it can't be, the scan is a full one
+    and `index_error` says why.
+    """
+
+    def __init__(self, root, workers=None, previous=None, cross_devices=False, index=None):
+        self.root = os.path.abspath(root)
+        # scandir/stat wait on the disk with the GIL released; past a few threads only cold or network volumes gain
+        self.workers = workers or min(8, os.cpu_count() or 4)
+        self.previous = previous if previous is not None and previous.root == self.root else None
+        self.cross_devices = cross_devices
+        self.index = index
+        self.index_error = None
+        self.tree = ScanTree(self.root)
+        self.reused = 0  # Directories taken from `previous` without listing them
+        self.started_at = None
+        self.finished_at = None
+        self.finished = threading.Event()
+        self._queues = [deque() for _ in range(self.workers)]
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._device = None
+
+    def start(self):
+        """Scan in the background; `finished` is set when done (or cancelled)."""
+        threading.Thread(target=self.run, name="diskinfo-space-scan", daemon=True).start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        self.started_at = time.monotonic()
+        try:
+            if self.previous is None and self.index is not None:
+                self.previous = self._load_previous()
+            st = os.stat(self.root)
+            self._device = st.st_dev
+            node = self.tree.add(NONE, "", st.st_mtime)
+            self._push(0, (node, self.root, 0 if self.previous is not None else None))
+            threads = [threading.Thread(target=self._work, args=(index,), daemon=True,
+                                        name=f"diskinfo-space-scan-{index}") for index in range(self.workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.tree.scanned_at = time.time()
+            if self.index is not None and not self.cancelled:
+                save_index(self.tree, self.index)
+        finally:
+            self.finished_at = time.monotonic()
+            self.finished.set()
+
+    def _load_previous(self):
+        if not os.path.exists(self.index):
+            return None
+        try:
+            previous = load_index(self.index)
+        except (OSError, ValueError) as e:
+            self.index_error = str(e)
+            return None
+        return previous if previous.root == self.root else None
+
+    def _push(self, worker, item):
+        with self._pending_lock:
+            self._pending += 1
+        self._queues[worker].append(item)
+
+    def _take(self, worker):
+        """Own newest item, else the oldest item of another worker; None once all work is done."""
+        while not self.cancelled:
+            try:
+                return self._queues[worker].pop()
+            except IndexError:
+                pass
+            for offset in range(1, self.workers):
+                try:
+                    return self._queues[(worker + offset) % self.workers].popleft()
+                except IndexError:
+                    continue
+            with self._pending_lock:
+                if not self._pending:
+                    return None
+            time.sleep(IDLE_WAIT)
+        return None
+
+    def _work(self, worker):
+        while True:
+            item = self._take(worker)
+            if item is None:
+                return
+            try:
+                self._scan(worker, *item)
+            finally:
+                with self._pending_lock:
+                    self._pending -= 1
+
+    def _other_device(self, st):
+        # Windows scandir reports st_dev as 0; there volumes can't be nested without junctions anyway
+        return not self.cross_devices and st.st_dev and self._device and st.st_dev != self._device
+
+    def _scan(self, worker, node, path, old):
+        previous = self.previous
+        if old is not None and previous.done[old] and previous.mtime[old] == self.tree.mtime[node]:
+            self._reuse(worker, node, path, old)
+            return
+
+        old_children = {}
+        if old is not None:
+            old_children = {previous.names[child]: child for child in previous.children(old)}
+        own_size = files = 0
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if stat.S_ISDIR(st.st_mode) and not _is_junction(entry):
+                            if self._other_device(st):
+                                continue
+                            child = self.tree.add(node, entry.name, st.st_mtime)
+                            self._push(worker, (child, entry.path, old_children.get(entry.name)))
+                        else:
+                            own_size += st.st_size
+                            files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            with self.tree.lock:
+                self.tree.errors += 1  # Unreadable directory; counted, not fatal
+        self.tree.complete(node, own_size, files)
+
+    def _reuse(self, worker, node, path, old):
+        previous = self.previous
+        with self._pending_lock:
+            self.reused += 1
+        for child in previous.children(old):
+            name = previous.names[child]
+            child_path = os.path.join(path, name)
+            try:
+                st = os.stat(child_path, follow_symlinks=False)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode) and not self._other_device(st):
+                self._push(worker, (self.tree.add(node, name, st.st_mtime), child_path, child))
+        self.tree.complete(node, previous.own_size[old], previous.files[old])
+
+
+def squarify(sizes, x, y, width, height):
+    """Squarified treemap layout: (index, x, y, w, h) per positive size, largest-first input works best."""
+    items = [(index, size) for index, size in enumerate(sizes) if size > 0]
+    total = sum(size for _, size in items)
+    if not items or width <= 0 or height <= 0:
+        return []
+    scale = width * height / total
+    items = [(index, size * scale) for index, size in items]
+
+    def worst(row, side):
+        areas = [area for _, area in row]
+        row_area = sum(areas)
+        return max(max(side * side * area / (row_area * row_area), row_area * row_area / (side * side * area))
+                   for area in areas)
+
+    rects = []
+    row = []
+    while items:
+        side = min(width, height)
+        candidate = row + [items[0]]
+        if not row or worst(candidate, side) <= worst(row, side):
+            row = candidate
+            items.pop(0)
+            continue
+        x, y, width, height = _lay_row(row, x, y, width, height, rects)
+        row = []
+    if row:
+        _lay_row(row, x, y, width, height, rects)
+    return rects
+
+
+def _lay_row(row, x, y, width, height, rects):
+    row_area = sum(area for _, area in row)
+    if width >= height:
+        # Column along the left edge
+        column_width = row_area / height
+        offset = y
+        for index, area in row:
+            rects.append((index, x, offset, column_width, area / column_width))
+            offset += area / column_width
+        return x + column_width, y, width - column_width, height
+    row_height = row_area / width
+    offset = x
+    for index, area in row:
+        rects.append((index, offset, y, area / row_height, row_height))
+        offset += area / row_height
+    return x, y + row_height, width, height - row_height
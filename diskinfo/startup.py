@@ -0,0 +1,44 @@
+"""Startup timing for the GUI.
+
+`StartupTimer` records named milestones (imports done, window built,
+first paint, first data) as milliseconds since the timer was created.
+When DISKINFO_STARTUP_LOG names a file, each launch appends its report
+there as one JSON line, so startup regressions can be compared across
+builds. Only the standard library is imported here, so creating the
+timer first does not skew what it measures.
+"""
+
+import json
+import os
+import time
+
+STARTUP_LOG_ENV = "DISKINFO_STARTUP_LOG"
+
+
+class StartupTimer:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.marks = {}
+
+    def mark(self, name):
+        """Record `name` the first time it is reached; later calls are ignored."""
+        if name not in self.marks:
+            self.marks[name] = (self.clock() - self.started) * 1000
+
+    def reached(self, *names):
+        return all(name in self.marks for name in names)
+
+    def report(self):
+        return ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.marks.items())
+
+    def save(self, path=None):
+        """Append the marks as a JSON line to `path` or $DISKINFO_STARTUP_LOG, if set."""
+        path = path or os.environ.get(STARTUP_LOG_ENV)
+        if not path:
+            return False
+        record = {"timestamp": time.time()}
+        record.update({name: round(ms, 1) for name, ms in self.marks.items()})
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        return True
@@ -0,0 +1,95 @@
+"""Sortable, filterable rows for large tables.
+
+`TableModel` keeps the full row list and a derived view. Sorting and
+filtering work on the row data only, so a widget showing the model just
+reads `len(model)` and `model[index]` for the rows currently on screen.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Column:
+    key: str
+    title: str
+    width: int = 120
+    format: object = str  # Cell value -> display text
+
+
+def _sort_value(value):
+    # Numbers sort before text and the two are never compared with each other
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value).lower())
+
+
+def contains(text):
+    """Case-insensitive substring filter; an empty string matches everything."""
+    text = (text or "").strip().lower()
+    if not text:
+        return None
+    return lambda value: text in str(value or "").lower()
+
+
+def equals(expected):
+    return None if expected is None else (lambda value: value == expected)
+
+
+def at_least(minimum):
+    return None if minimum is None else (lambda value: value is not None and value >= minimum)
+
+
+class TableModel:
+    """Rows (dicts keyed by column key) plus the current sort order and filters."""
+
+    def __init__(self, columns, rows=()):
+        self.columns = list(columns)
+        self.rows = list(rows)
+        self.sort_key = None
+        self.descending = False
+        self.filters = {}
+        self._view = None
+
+    def set_rows(self, rows):
+        self.rows = list(rows)
+        self._view = None
+
+    def sort(self, key, descending=None):
+        """Sort by column `key`; sorting by the same column again flips the direction."""
+        if descending is None:
+            descending = not self.descending if key == self.sort_key else False
+        self.sort_key, self.descending = key, descending
+        self._view = None
+
+    def set_filter(self, key, predicate):
+        """Keep only rows where predicate(row[key]) is true; None removes the filter."""
+        if predicate is None:
+            self.filters.pop(key, None)
+        else:
+            self.filters[key] = predicate
+        self._view = None
+
+    def values(self, key):
+        """Distinct values of one column across all rows, for filter menus."""
+        return sorted({row.get(key) for row in self.rows if row.get(key) is not None}, key=_sort_value)
+
+    @property
+    def view(self):
+        if self._view is None:
+            rows = self.rows
+            for key, predicate in self.filters.items():
+                rows = [row for row in rows if predicate(row.get(key))]
+            if self.sort_key is not None:
+                # Rows missing the value stay at the bottom in both directions
+                present = [row for row in rows if row.get(self.sort_key) is not None]
+                missing = [row for row in rows if row.get(self.sort_key) is None]
+                rows = sorted(present, key=lambda row: _sort_value(row.get(self.sort_key)),
+                              reverse=self.descending) + missing
+            self._view = list(rows)
+        return self._view
+
+    def __len__(self):
+        return len(self.view)
+
+    def __getitem__(self, index):
+        return self.view[index]
@@ -0,0 +1,389 @@
+"""Bulk disk topology loader.
+
+A `TopologyProvider` turns one platform's view of its disks into an
+immutable `Topology` snapshot. On Windows, `WmiTopologyProvider` issues a
+fixed number of WMI queries (disks, partitions, logical disks, both
+association classes and one SMART status pass) instead of one ASSOCIATORS
+OF round trip per disk and partition, and joins them in memory through
+dicts keyed by DeviceID. With SMART included it also reads the raw
+attribute and threshold tables and, for drives without them (NVMe), the
+storage reliability counters. On Linux, `diskinfo.linux.LinuxProvider` reads
+the same model from sysfs and procfs.
+
+The model is frozen, slotted dataclasses. Volumes, partitions, disks and
+the topology itself carry a `signature` hashed once when they are built,
+so comparing two snapshots, or finding the disks that changed between
+them, costs a few integer comparisons unless they are actually equal.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from .smart import parse_ata_smart, predicts_failure, reliability_attributes
+from .wmi import STORAGE, WMI, WmiProvider, get_provider
+
+log = logging.getLogger(__name__)
+
+DISK_QUERY = ("SELECT DeviceID, Index, Model, InterfaceType, Size, Status, SerialNumber, "
+              "PNPDeviceID, MediaType, BytesPerSector FROM Win32_DiskDrive")
+PARTITION_QUERY = ("SELECT DeviceID, DiskIndex, Index, StartingOffset, Size, Type, Bootable, "
+                   "PrimaryPartition FROM Win32_DiskPartition")
+LOGICAL_DISK_QUERY = ("SELECT DeviceID, FileSystem, Size, FreeSpace, VolumeName, DriveType "
+                      "FROM Win32_LogicalDisk")
+DISK_TO_PARTITION_QUERY = "SELECT Antecedent, Dependent FROM Win32_DiskDriveToDiskPartition"
+LOGICAL_TO_PARTITION_QUERY = "SELECT Antecedent, Dependent FROM Win32_LogicalDiskToPartition"
+SMART_STATUS_QUERY = "SELECT InstanceName, PredictFailure, Reason FROM MSStorageDriver_FailurePredictStatus"
+SMART_DATA_QUERY = "SELECT InstanceName, VendorSpecific FROM MSStorageDriver_FailurePredictData"
+SMART_THRESHOLDS_QUERY = "SELECT InstanceName, VendorSpecific FROM MSStorageDriver_FailurePredictThresholds"
+RELIABILITY_QUERY = ("SELECT DeviceId, Temperature, Wear, PowerOnHours, ReadErrorsUncorrected, "
+                     "WriteErrorsUncorrected FROM MSFT_StorageReliabilityCounter")
+
+_PATH_KEY = re.compile(r"""DeviceID=(?:"((?:[^"\\]|\\.)*)"|'([^']*)')""")
+
+
+def _sign(record):
+    """Store a hash of all of `record`'s init fields as its `signature`, once, at construction.
+
+    Children are hashed through their own stored signature, so signing a
+    disk costs one hash per partition rather than a walk of the subtree.
+    Signatures use Python's per-process str hashing, so they are only
+    comparable within one process.
+    """
+    object.__setattr__(record, "signature", hash(tuple(getattr(record, name) for name in record.__match_args__)))
+
+
+@dataclass(frozen=True, slots=True)
+class SmartStatus:
+    instance_name: str
+    predict_failure: bool
+    reason: object
+    attributes: tuple = ()  # smart.SmartAttribute, empty when the raw table couldn't be read
+
+
+@dataclass(frozen=True, slots=True)
+class Volume:
+    """A mounted logical disk such as "C:"."""
+    signature: int = field(init=False, repr=False)  # Compared first, so differing volumes compare in O(1)
+    device_id: str
+    file_system: str
+    size: int
+    free_space: int
+    volume_name: str = ""
+
+    __post_init__ = _sign
+
+    def __hash__(self):
+        return self.signature
+
+
+@dataclass(frozen=True, slots=True)
+class Partition:
+    signature: int = field(init=False, repr=False)
+    device_id: str
+    disk_index: int
+    index: int
+    starting_offset: int
+    size: int
+    type: str
+    bootable: bool
+    primary: bool
+    volumes: tuple = ()
+
+    __post_init__ = _sign
+
+    def __hash__(self):
+        return self.signature
+
+
+@dataclass(frozen=True, slots=True)
+class PhysicalDisk:
+    signature: int = field(init=False, repr=False)
+    device_id: str
+    index: int
+    model: str
+    interface: str
+    size: int
+    status: str
+    serial: str = ""
+    pnp_device_id: str = ""
+    media_type: str = ""
+    partitions: tuple = ()
+    smart: SmartStatus = None
+    sector_size: int = 512
+    physical_sector_size: int = 0  # 0 when the platform doesn't report it
+
+    __post_init__ = _sign
+
+    def __hash__(self):
+        return self.signature
+
+    @property
+    def number(self):
+        """Short name used by Disk Management, e.g. "PHYSICALDRIVE0" or "sda"."""
+        return re.split(r"[\\/]", self.device_id)[-1]
+
+
+def mountpoint_key(mountpoint):
+    """Volume lookup key: "C:", "C:\\" and "c:\\" are one volume, and so are "/mnt/data" and "/mnt/data/"."""
+    if len(mountpoint) >= 2 and mountpoint[1] == ":":
+        return mountpoint[:2].upper() + mountpoint[2:].rstrip("\\")
+    return mountpoint.rstrip("/") or mountpoint
+
+
+@dataclass(frozen=True, slots=True)
+class Topology:
+    """Immutable snapshot of disks, their partitions and mounted volumes.
+
+    Two topologies are equal when their disks are, whenever they were
+    collected; comparing unequal ones only compares their signatures.
+    """
+    signature: int = field(init=False, repr=False)
+    disks: tuple
+    collected_at: float = field(compare=False)
+    disks_by_id: MappingProxyType = field(compare=False, repr=False)
+    volumes_by_mountpoint: MappingProxyType = field(compare=False, repr=False)
+    disk_by_mountpoint: MappingProxyType = field(compare=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "signature", hash(self.disks))
+
+    def __hash__(self):
+        return self.signature
+
+    def disk(self, device_id):
+        return self.disks_by_id.get(device_id)
+
+    def volume(self, mountpoint):
+        return self.volumes_by_mountpoint.get(mountpoint_key(mountpoint))
+
+    def disk_for_volume(self, mountpoint):
+        return self.disk_by_mountpoint.get(mountpoint_key(mountpoint))
+
+    def changed_disks(self, previous):
+        """Disks that are new or differ from the same DeviceID in `previous` (a Topology or None)."""
+        if previous is None:
+            return self.disks
+        return tuple(disk for disk in self.disks if previous.disk(disk.device_id) != disk)
+
+
+def path_key(path):
+    """DeviceID from a WMI object path, as found in association Antecedent/Dependent."""
+    match = _PATH_KEY.search(path or "")
+    if not match:
+        return None
+    if match.group(1) is not None:
+        return re.sub(r"\\(.)", r"\1", match.group(1))
+    return match.group(2)
+
+
+def _int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _smart_key(name):
+    """Normalise an instance name or PNPDeviceID for the SMART join."""
+    name = (name or "").upper()
+    return name[:-2] if name.endswith("_0") else name
+
+
+def _by_instance(table, row):
+    """Entry of a {_smart_key(InstanceName): value} table that belongs to disk `row`."""
+    value = table.get(_smart_key(row.PNPDeviceID))
+    if value is None:
+        # Older drivers name the instance after the device path instead
+        value = next((value for key, value in table.items()
+                      if row.DeviceID and row.DeviceID.upper() in key), None)
+    return value
+
+
+def _smart_status(row, status_by_instance, data_by_instance, limits_by_instance, reliability_by_index):
+    status = _by_instance(status_by_instance, row)
+    data = _by_instance(data_by_instance, row)
+    if data is not None:
+        attributes = parse_ata_smart(data, _by_instance(limits_by_instance, row))
+    else:
+        counters = reliability_by_index.get(_int(row.Index, -1))
+        attributes = reliability_attributes(counters) if counters is not None else ()
+    if status is None:
+        if not attributes:
+            return None
+        return SmartStatus(row.PNPDeviceID or row.DeviceID, predicts_failure(attributes), None, attributes)
+    return SmartStatus(status.InstanceName, bool(status.PredictFailure), status.Reason, attributes)
+
+
+def build_topology(disks, partitions, logical_disks, disk_links, volume_links, smart=(),
+                   smart_data=(), smart_thresholds=(), reliability=()):
+    """Join raw WMI rows into a Topology. Pure function, no I/O.
+
+    `smart`, `smart_data` and `smart_thresholds` are MSStorageDriver_FailurePredict
+    Status/Data/Thresholds rows; `reliability` is MSFT_StorageReliabilityCounter
+    rows, used for disks that have no ATA attribute table.
+    """
+    volumes_by_id = {}
+    for row in logical_disks:
+        volumes_by_id[row.DeviceID] = Volume(
+            device_id=row.DeviceID,
+            file_system=row.FileSystem or "",
+            size=_int(row.Size),
+            free_space=_int(row.FreeSpace),
+            volume_name=row.VolumeName or "",
+        )
+
+    volumes_by_partition = {}
+    for link in volume_links:
+        partition_id, volume_id = path_key(link.Antecedent), path_key(link.Dependent)
+        if volume_id in volumes_by_id:
+            volumes_by_partition.setdefault(partition_id, []).append(volumes_by_id[volume_id])
+
+    partitions_by_disk = {}
+    disk_by_partition = {path_key(link.Dependent): path_key(link.Antecedent) for link in disk_links}
+    disk_id_by_index = {_int(row.Index, -1): row.DeviceID for row in disks}
+    for row in partitions:
+        disk_id = disk_by_partition.get(row.DeviceID) or disk_id_by_index.get(_int(row.DiskIndex, -1))
+        partitions_by_disk.setdefault(disk_id, []).append(Partition(
+            device_id=row.DeviceID,
+            disk_index=_int(row.DiskIndex, -1),
+            index=_int(row.Index),
+            starting_offset=_int(row.StartingOffset),
+            size=_int(row.Size),
+            type=row.Type or "",
+            bootable=bool(row.Bootable),
+            primary=bool(row.PrimaryPartition),
+            volumes=tuple(volumes_by_partition.get(row.DeviceID, ())),
+        ))
+
+    status_by_instance = {_smart_key(row.InstanceName): row for row in smart}
+    data_by_instance = {_smart_key(row.InstanceName): row.VendorSpecific
+                        for row in smart_data if row.VendorSpecific}
+    limits_by_instance = {_smart_key(row.InstanceName): row.VendorSpecific
+                          for row in smart_thresholds if row.VendorSpecific}
+    reliability_by_index = {_int(row.DeviceId, -1): row for row in reliability}
+
+    built = []
+    for row in disks:
+        built.append(PhysicalDisk(
+            device_id=row.DeviceID,
+            index=_int(row.Index, -1),
+            model=row.Model or "",
+            interface=row.InterfaceType or "",
+            size=_int(row.Size),
+            status=row.Status or "OK",
+            serial=(row.SerialNumber or "").strip(),
+            pnp_device_id=row.PNPDeviceID or "",
+            media_type=row.MediaType or "",
+            sector_size=_int(row.BytesPerSector, 512) or 512,
+            partitions=tuple(sorted(partitions_by_disk.get(row.DeviceID, ()), key=lambda p: p.index)),
+            smart=_smart_status(row, status_by_instance, data_by_instance, limits_by_instance,
+                                reliability_by_index),
+        ))
+    return index_topology(built, volumes_by_id)
+
+
+def index_topology(disks, volumes_by_id=None):
+    """Wrap fully built PhysicalDisk objects in a Topology with its lookup tables.
+
+    `volumes_by_id` may list volumes that sit on no known partition (network
+    or virtual drives); volumes found on the disks are added to it.
+    """
+    disks = sorted(disks, key=lambda disk: disk.index)
+    volumes = {mountpoint_key(device_id): volume for device_id, volume in (volumes_by_id or {}).items()}
+    disk_by_mountpoint = {}
+    for disk in disks:
+        for partition in disk.partitions:
+            for volume in partition.volumes:
+                volumes[mountpoint_key(volume.device_id)] = volume
+                disk_by_mountpoint[mountpoint_key(volume.device_id)] = disk
+
+    return Topology(
+        disks=tuple(disks),
+        collected_at=time.time(),
+        disks_by_id=MappingProxyType({disk.device_id: disk for disk in disks}),
+        volumes_by_mountpoint=MappingProxyType(volumes),
+        disk_by_mountpoint=MappingProxyType(disk_by_mountpoint),
+    )
+
+
+class TopologyProvider:
+    """Interface of anything that can describe the machine's disks."""
+
+    def load_topology(self, include_smart=True):
+        """Return a Topology; `include_smart` also fills in each PhysicalDisk.smart where possible."""
+        raise NotImplementedError
+
+
+class WmiTopologyProvider(TopologyProvider):
+    """Topology from WMI, with a fixed number of queries per load."""
+
+    def __init__(self, wmi=None):
+        self.wmi = wmi
+
+    def load_topology(self, include_smart=True):
+        wmi = self.wmi or get_provider()
+        smart = {}
+        if include_smart:
+            for name, query, namespace in (
+                ("smart", SMART_STATUS_QUERY, WMI),
+                ("smart_data", SMART_DATA_QUERY, WMI),
+                ("smart_thresholds", SMART_THRESHOLDS_QUERY, WMI),
+                ("reliability", RELIABILITY_QUERY, STORAGE),
+            ):
+                try:
+                    smart[name] = wmi.query(query, namespace)
+                except Exception as e:
+                    # Needs admin rights and a SMART-capable driver; topology is still useful without it
+                    log.debug("%s unavailable: %s", name, e)
+        return build_topology(
+            disks=wmi.query(DISK_QUERY),
+            partitions=wmi.query(PARTITION_QUERY),
+            logical_disks=wmi.query(LOGICAL_DISK_QUERY),
+            disk_links=wmi.query(DISK_TO_PARTITION_QUERY),
+            volume_links=wmi.query(LOGICAL_TO_PARTITION_QUERY),
+            **smart
+        )
+
+
+_default_provider = None
+_default_lock = threading.Lock()
+
+
+def get_topology_provider():
+    """Process-wide provider for this platform unless one was set explicitly."""
+    global _default_provider
+    with _default_lock:
+        if _default_provider is None:
+            if sys.platform == "win32":
+                _default_provider = WmiTopologyProvider()
+            elif sys.platform.startswith("linux"):
+                from .linux import LinuxProvider
+                _default_provider = LinuxProvider()
+            else:
+                raise OSError(f"No disk topology provider for {sys.platform}")
+        return _default_provider
+
+
+def set_topology_provider(provider):
+    """Install `provider` (e.g. a LinuxProvider over a fake sysfs tree) for every load_topology() call."""
+    global _default_provider
+    with _default_lock:
+        _default_provider = provider
+
+
+def load_topology(provider=None, include_smart=True):
+    """Collect the whole disk topology from `provider` or the platform default.
+
+    A WmiProvider (such as FakeWmiProvider) is accepted too and queried
+    through WmiTopologyProvider.
+    """
+    if provider is None:
+        provider = get_topology_provider()
+    elif isinstance(provider, WmiProvider):
+        provider = WmiTopologyProvider(provider)
+    return provider.load_topology(include_smart)
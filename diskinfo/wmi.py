@@ -0,0 +1,181 @@
+"""Shared WMI access for every data-collection path.
+
+`WmiSession` keeps one SWbemServices connection per namespace open for the
+life of the app and reconnects when a call fails. COM objects are bound to
+the apartment that created them, so connections are cached per thread.
+Query results are copied into plain `WmiRow` objects, which can be passed
+between threads and are what `FakeWmiProvider` returns on machines without
+WMI.
+"""
+
+import logging
+import re
+import sys
+import threading
+
+log = logging.getLogger(__name__)
+
+CIMV2 = "root\\cimv2"
+WMI = "root\\wmi"
+STORAGE = "root\\Microsoft\\Windows\\Storage"
+
+
+class WmiError(Exception):
+    """A WMI query could not be answered, even after reconnecting."""
+
+
+class WmiRow:
+    """Plain snapshot of one WMI object's properties, readable as attributes."""
+
+    def __init__(self, **properties):
+        self.__dict__.update(properties)
+
+    def __getattr__(self, name):
+        # WMI leaves unset properties as None rather than omitting them
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return None
+
+    def __repr__(self):
+        return f"WmiRow({self.__dict__!r})"
+
+
+class WmiProvider:
+    """Interface of anything that can answer WQL queries."""
+
+    def query(self, wql, namespace=CIMV2):
+        """Run `wql` in `namespace` and return a list of WmiRow."""
+        raise NotImplementedError
+
+
+class WmiSession(WmiProvider):
+    """Cached, self-healing connections to the local (or a remote) WMI service."""
+
+    def __init__(self, host="."):
+        self.host = host
+        self._local = threading.local()
+
+    def _services(self):
+        services = getattr(self._local, "services", None)
+        if services is None:
+            if threading.current_thread() is not threading.main_thread():
+                import pythoncom
+                pythoncom.CoInitialize()
+            services = self._local.services = {}
+        return services
+
+    def _connect(self, namespace):
+        services = self._services()
+        service = services.get(namespace)
+        if service is None:
+            import win32com.client
+            log.debug("Connecting to WMI %s on %s", namespace, self.host)
+            locator = getattr(self._local, "locator", None)
+            if locator is None:
+                locator = self._local.locator = win32com.client.Dispatch("WbemScripting.SWbemLocator")
+            service = services[namespace] = locator.ConnectServer(self.host, namespace)
+        return service
+
+    def reset(self, namespace=None):
+        """Drop this thread's cached connection(s) so the next query reconnects."""
+        services = self._services()
+        if namespace is None:
+            services.clear()
+            self._local.locator = None
+        else:
+            services.pop(namespace, None)
+
+    def query(self, wql, namespace=CIMV2):
+        for attempt in range(2):
+            try:
+                return [_to_row(obj) for obj in self._connect(namespace).ExecQuery(wql)]
+            except Exception as e:
+                log.debug("WMI query failed (attempt %d): %s: %s", attempt + 1, wql, e)
+                self.reset(namespace)
+                last_error = e
+        raise WmiError(f"{wql}: {last_error}")
+
+
+def _to_row(obj):
+    return WmiRow(**{prop.Name: prop.Value for prop in obj.Properties_})
+
+
+_SELECT = re.compile(
+    r"SELECT\s+(?P<columns>.+?)\s+FROM\s+(?P<table>\w+)"
+    r"(?:\s+WHERE\s+(?P<field>\w+)\s*=\s*'(?P<value>[^']*)')?\s*$",
+    re.IGNORECASE
+)
+_ASSOCIATORS = re.compile(
+    r"ASSOCIATORS\s+OF\s+\{(?P<table>\w+)\.(?P<key>\w+)='(?P<value>[^']*)'\}"
+    r"\s+WHERE\s+AssocClass\s*=\s*(?P<assoc>\w+)\s*$",
+    re.IGNORECASE
+)
+
+
+class FakeWmiProvider(WmiProvider):
+    """In-memory provider for tests and non-Windows development.
+
+    `tables` maps namespace -> class name -> list of property dicts.
+    Association classes are stored like any other class, with
+    "Antecedent" and "Dependent" holding the "Class.Key='Value'" paths WMI
+    uses. Supports `SELECT cols FROM Class [WHERE Prop = 'value']` and
+    `ASSOCIATORS OF {Class.Key='value'} WHERE AssocClass = Assoc`.
+    """
+
+    def __init__(self, tables=None):
+        self.tables = tables or {}
+        self.queries = []
+
+    def add(self, table, namespace=CIMV2, **properties):
+        self.tables.setdefault(namespace, {}).setdefault(table, []).append(properties)
+
+    def query(self, wql, namespace=CIMV2):
+        self.queries.append((namespace, wql))
+        tables = self.tables.get(namespace, {})
+        match = _SELECT.match(wql.strip())
+        if match:
+            rows = tables.get(match["table"], [])
+            if match["field"]:
+                rows = [row for row in rows if str(row.get(match["field"])) == match["value"]]
+            return [WmiRow(**row) for row in rows]
+
+        match = _ASSOCIATORS.match(wql.strip())
+        if match:
+            path = f"{match['table']}.{match['key']}='{match['value']}'"
+            found = []
+            for link in tables.get(match["assoc"], []):
+                if link["Antecedent"] == path:
+                    found.append(link["Dependent"])
+                elif link["Dependent"] == path:
+                    found.append(link["Antecedent"])
+            return [WmiRow(**row) for other in found for row in self._resolve(tables, other)]
+
+        raise WmiError(f"Unsupported query for FakeWmiProvider: {wql}")
+
+    def _resolve(self, tables, path):
+        table, _, rest = path.partition(".")
+        key, _, value = rest.partition("=")
+        value = value.strip("'")
+        return [row for row in tables.get(table, []) if str(row.get(key)) == value]
+
+
+_default_provider = None
+_default_lock = threading.Lock()
+
+
+def get_provider():
+    """Process-wide provider: a WmiSession on Windows unless one was set explicitly."""
+    global _default_provider
+    with _default_lock:
+        if _default_provider is None:
+            if sys.platform != "win32":
+                raise WmiError("WMI is only available on Windows")
+            _default_provider = WmiSession()
+        return _default_provider
+
+
+def set_provider(provider):
+    """Install `provider` (e.g. a FakeWmiProvider) for every caller of get_provider()."""
+    global _default_provider
+    with _default_lock:
+        _default_provider = provider